@@ -4,8 +4,56 @@ __version__ = "1.0.0"
 
 from ._development_card import DevelopmentCard
 from ._game import Game
-from ._player import Player
+from ._player import Player, PlayerEvent
 from ._resource import Resource
 from ._roll_yield import RollYield
+from ._action_type import ActionType
+from ._action_space import ActionSpace
+from ._turn_phase import TurnPhase
+from ._turn_machine import TurnMachine
+from ._event import EventType, GameEvent
+from ._delta import GameDelta, PlayerDelta
+from ._event_log import (
+    GameLogWriter,
+    LoggedGame,
+    SeekableGameLog,
+    read_game_log,
+    replay_game_log,
+)
+from ._instrumentation import (
+    enable_instrumentation,
+    disable_instrumentation,
+    is_instrumentation_enabled,
+    instrumented,
+    reset_stats,
+    stats,
+)
 
-__all__ = ["DevelopmentCard", "Game", "Player", "Resource", "RollYield", "board"]
+__all__ = [
+    "ActionSpace",
+    "ActionType",
+    "DevelopmentCard",
+    "EventType",
+    "Game",
+    "GameDelta",
+    "GameEvent",
+    "GameLogWriter",
+    "LoggedGame",
+    "Player",
+    "PlayerDelta",
+    "PlayerEvent",
+    "Resource",
+    "RollYield",
+    "SeekableGameLog",
+    "TurnMachine",
+    "TurnPhase",
+    "board",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "instrumented",
+    "is_instrumentation_enabled",
+    "read_game_log",
+    "replay_game_log",
+    "reset_stats",
+    "stats",
+]
@@ -0,0 +1,99 @@
+from typing import Dict, List, Tuple
+
+from ._action_type import ActionType
+from ._resource import Resource
+from .board._board_index import BoardIndex
+
+
+class ActionSpace:
+    """A fixed numbering of every action that can be taken in a game, as integers.
+
+    Each action type gets a contiguous range of integers, one for every possible argument of that action.
+    For example, there is one BUILD_SETTLEMENT action for every intersection on the board, numbered by the
+    intersection's index in the board index. The arguments of each action type are:
+
+    * BUILD_SETTLEMENT, BUILD_CITY: The index of the intersection
+    * BUILD_ROAD: The index of the path
+    * MOVE_ROBBER: The index of the hex
+    * STEAL: The index of the player to steal from
+    * CHOOSE_RESOURCE, DISCARD: The value of the resource
+    * TRADE: The value of the resource to give times the number of resources, plus the value of the resource to get
+    * Every other action type: Always 0
+
+    Args:
+        board_index: The index of the board the game is played on
+        num_players: The number of players in the game
+
+    Attributes:
+        size (int): The total number of actions
+        offsets (Dict[ActionType, int]): The first action of each action type
+        sizes (Dict[ActionType, int]): The number of actions of each action type
+    """
+
+    def __init__(self, board_index: BoardIndex, num_players: int):
+        num_resources = len(Resource)
+        self.sizes: Dict[ActionType, int] = {
+            ActionType.ROLL: 1,
+            ActionType.END_TURN: 1,
+            ActionType.BUILD_SETTLEMENT: len(board_index.intersection_coords),
+            ActionType.BUILD_CITY: len(board_index.intersection_coords),
+            ActionType.BUILD_ROAD: len(board_index.path_coords),
+            ActionType.BUILD_DEVELOPMENT_CARD: 1,
+            ActionType.PLAY_KNIGHT: 1,
+            ActionType.PLAY_ROAD_BUILDING: 1,
+            ActionType.PLAY_YEAR_OF_PLENTY: 1,
+            ActionType.PLAY_MONOPOLY: 1,
+            ActionType.CHOOSE_RESOURCE: num_resources,
+            ActionType.DISCARD: num_resources,
+            ActionType.MOVE_ROBBER: len(board_index.hex_coords),
+            ActionType.STEAL: num_players,
+            ActionType.TRADE: num_resources * num_resources,
+        }
+        self.offsets: Dict[ActionType, int] = {}
+        self._decoded: List[Tuple[ActionType, int]] = []
+        for action_type in ActionType:
+            self.offsets[action_type] = len(self._decoded)
+            self._decoded += [(action_type, i) for i in range(self.sizes[action_type])]
+        self.size = len(self._decoded)
+
+    def encode(self, action_type: ActionType, argument: int = 0) -> int:
+        """Get the integer for an action.
+
+        Args:
+            action_type: The type of action
+            argument: The argument of the action. Defaults to 0
+        Raises:
+            ValueError: If the argument is out of range for the action type
+        Returns:
+            The action as an integer
+        """
+        if argument < 0 or argument >= self.sizes[action_type]:
+            raise ValueError(
+                "Invalid argument %d for action type %s" % (argument, action_type)
+            )
+        return self.offsets[action_type] + argument
+
+    def encode_trade(self, give: Resource, get: Resource) -> int:
+        """Get the integer for trading a resource to the bank for another one.
+
+        Args:
+            give: The resource to give to the bank
+            get: The resource to get from the bank
+        Returns:
+            The action as an integer
+        """
+        return self.encode(ActionType.TRADE, give.value * len(Resource) + get.value)
+
+    def decode(self, action: int) -> Tuple[ActionType, int]:
+        """Get the action type and argument of an action.
+
+        Args:
+            action: The action as an integer
+        Raises:
+            ValueError: If the action is not in the action space
+        Returns:
+            The action type and the argument of the action
+        """
+        if action < 0 or action >= self.size:
+            raise ValueError("Action %d is not in the action space" % action)
+        return self._decoded[action]
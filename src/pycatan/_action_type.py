@@ -0,0 +1,36 @@
+from enum import Enum
+
+
+class ActionType(Enum):
+    """The different kinds of actions that can be taken in a turn."""
+
+    ROLL = 0
+    """Roll the dice"""
+    END_TURN = 1
+    """End the turn"""
+    BUILD_SETTLEMENT = 2
+    """Build a settlement on an intersection"""
+    BUILD_CITY = 3
+    """Upgrade a settlement on an intersection to a city"""
+    BUILD_ROAD = 4
+    """Build a road on a path"""
+    BUILD_DEVELOPMENT_CARD = 5
+    """Build a development card"""
+    PLAY_KNIGHT = 6
+    """Play a knight card"""
+    PLAY_ROAD_BUILDING = 7
+    """Play a road building card"""
+    PLAY_YEAR_OF_PLENTY = 8
+    """Play a year of plenty card"""
+    PLAY_MONOPOLY = 9
+    """Play a monopoly card"""
+    CHOOSE_RESOURCE = 10
+    """Choose a resource for a year of plenty or monopoly card"""
+    DISCARD = 11
+    """Discard a single resource after a 7 was rolled"""
+    MOVE_ROBBER = 12
+    """Move the robber to a hex"""
+    STEAL = 13
+    """Steal a random resource from a player"""
+    TRADE = 14
+    """Trade resources with the bank, using the best rate the player has"""
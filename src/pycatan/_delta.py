@@ -0,0 +1,240 @@
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+import struct
+
+from ._development_card import DevelopmentCard
+from ._resource import Resource
+from .board._building_type import BuildingType
+from .board._coords import Coords
+
+MAGIC = b"PCD"
+VERSION = 1
+
+# magic, version, version the delta starts from, version the delta ends at, number of intersections, paths and players,
+# which of the robber, deck size and awards are included
+_HEADER = struct.Struct("<3sBIIHHBB")
+# q, r, building
+_INTERSECTION = struct.Struct("<2bB")
+# q and r of the two intersections, building
+_PATH = struct.Struct("<4bB")
+_ROBBER = struct.Struct("<2b")
+_DECK_SIZE = struct.Struct("<B")
+# longest road owner, largest army owner
+_AWARDS = struct.Struct("<2B")
+# player, resources, development cards, played knights
+_PLAYER = struct.Struct("<B%dH%dBB" % (len(Resource), len(DevelopmentCard)))
+_NONE = 0xFF
+_HAS_ROBBER = 1
+_HAS_DECK_SIZE = 2
+_HAS_AWARDS = 4
+
+_RESOURCES = list(Resource)
+_DEVELOPMENT_CARDS = list(DevelopmentCard)
+_BUILDING_TYPES = list(BuildingType)
+
+
+class PlayerDelta(NamedTuple):
+    """The new state of a player whose hand has changed.
+
+    Attributes:
+        resources (Dict[Resource, int]): The resources in the player's hand
+        development_cards (Dict[DevelopmentCard, int]): The development cards in the player's hand
+        number_played_knights (int): The number of knights the player has played
+    """
+
+    resources: Dict[Resource, int]
+    development_cards: Dict[DevelopmentCard, int]
+    number_played_knights: int
+
+
+class GameDelta(NamedTuple):
+    """The changes made to a game between two versions, as returned by ``Game.get_delta()``.
+
+    Only what has changed is included, and every change is the new value rather than the difference, so
+    applying a delta that starts before the version of a game is still correct.
+
+    Attributes:
+        since_version (int): The version of the game the delta starts from
+        version (int): The version of the game the delta ends at
+        intersections (Dict[Coords, Tuple[int, BuildingType]]): The index of the owner and the type of every
+            intersection building that was added or changed
+        paths (Dict[FrozenSet[Coords], Tuple[int, BuildingType]]): The index of the owner and the type of every path
+            building that was added
+        robber (Coords): The new position of the robber, or None if it has not moved
+        players (Dict[int, PlayerDelta]): The new state of every player whose hand has changed, keyed by their index
+        deck_size (int): The number of cards left in the development card deck, or None if no card has been drawn
+        awards (Tuple[int, int]): The indices of the owners of the longest road and largest army (or None for no owner),
+            or None if they have not changed
+    """
+
+    since_version: int
+    version: int
+    intersections: Dict[Coords, Tuple[int, BuildingType]]
+    paths: Dict[FrozenSet[Coords], Tuple[int, BuildingType]]
+    robber: Optional[Coords]
+    players: Dict[int, PlayerDelta]
+    deck_size: Optional[int]
+    awards: Optional[Tuple[Optional[int], Optional[int]]]
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether nothing has changed."""
+        return not (
+            self.intersections
+            or self.paths
+            or self.players
+            or self.robber is not None
+            or self.deck_size is not None
+            or self.awards is not None
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize the delta to a compact binary format, i.e. to send it to a spectator.
+
+        Raises:
+            ValueError: If the delta cannot be serialized
+        Returns:
+            The serialized delta
+        """
+        flags = (
+            (_HAS_ROBBER if self.robber is not None else 0)
+            | (_HAS_DECK_SIZE if self.deck_size is not None else 0)
+            | (_HAS_AWARDS if self.awards is not None else 0)
+        )
+        try:
+            parts = [
+                _HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    self.since_version,
+                    self.version,
+                    len(self.intersections),
+                    len(self.paths),
+                    len(self.players),
+                    flags,
+                )
+            ]
+            for coords, building in self.intersections.items():
+                parts.append(
+                    _INTERSECTION.pack(coords.q, coords.r, _encode_building(*building))
+                )
+            for key, building in self.paths.items():
+                first, second = sorted(key, key=lambda c: (c.q, c.r))
+                parts.append(
+                    _PATH.pack(
+                        first.q,
+                        first.r,
+                        second.q,
+                        second.r,
+                        _encode_building(*building),
+                    )
+                )
+            if self.robber is not None:
+                parts.append(_ROBBER.pack(self.robber.q, self.robber.r))
+            if self.deck_size is not None:
+                parts.append(_DECK_SIZE.pack(self.deck_size))
+            if self.awards is not None:
+                parts.append(
+                    _AWARDS.pack(*[_NONE if a is None else a for a in self.awards])
+                )
+            for index, player in self.players.items():
+                parts.append(
+                    _PLAYER.pack(
+                        index,
+                        *[player.resources[r] for r in _RESOURCES],
+                        *[player.development_cards[d] for d in _DEVELOPMENT_CARDS],
+                        player.number_played_knights,
+                    )
+                )
+        except (struct.error, KeyError) as e:
+            raise ValueError("The delta cannot be serialized: %s" % e) from e
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0) -> "GameDelta":
+        """Create a delta from the bytes returned by ``to_bytes()``.
+
+        Args:
+            data: The serialized delta
+            offset: Where the delta starts in data. Defaults to 0
+        Raises:
+            ValueError: If the data is not a serialized delta
+        Returns:
+            The delta
+        """
+        try:
+            (
+                magic,
+                version,
+                since_version,
+                delta_version,
+                num_intersections,
+                num_paths,
+                num_players,
+                flags,
+            ) = _HEADER.unpack_from(data, offset)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(
+                    "The data is not a version %d serialized delta" % VERSION
+                )
+            offset += _HEADER.size
+            intersections = {}
+            for _ in range(num_intersections):
+                q, r, building = _INTERSECTION.unpack_from(data, offset)
+                offset += _INTERSECTION.size
+                intersections[Coords(q, r)] = _decode_building(building)
+            paths = {}
+            for _ in range(num_paths):
+                q1, r1, q2, r2, building = _PATH.unpack_from(data, offset)
+                offset += _PATH.size
+                paths[frozenset({Coords(q1, r1), Coords(q2, r2)})] = _decode_building(
+                    building
+                )
+            robber = None
+            if flags & _HAS_ROBBER:
+                robber = Coords(*_ROBBER.unpack_from(data, offset))
+                offset += _ROBBER.size
+            deck_size = None
+            if flags & _HAS_DECK_SIZE:
+                (deck_size,) = _DECK_SIZE.unpack_from(data, offset)
+                offset += _DECK_SIZE.size
+            awards = None
+            if flags & _HAS_AWARDS:
+                awards = tuple(
+                    None if a == _NONE else a for a in _AWARDS.unpack_from(data, offset)
+                )
+                offset += _AWARDS.size
+            players = {}
+            num_resources = len(_RESOURCES)
+            for _ in range(num_players):
+                values = _PLAYER.unpack_from(data, offset)
+                offset += _PLAYER.size
+                cards_start = 1 + num_resources
+                players[values[0]] = PlayerDelta(
+                    dict(zip(_RESOURCES, values[1:cards_start])),
+                    dict(zip(_DEVELOPMENT_CARDS, values[cards_start:-1])),
+                    values[-1],
+                )
+            if offset != len(data):
+                raise ValueError("The data is not the length of the delta it describes")
+        except (struct.error, IndexError) as e:
+            raise ValueError("The data is not a serialized delta: %s" % e) from e
+        return cls(
+            since_version,
+            delta_version,
+            intersections,
+            paths,
+            robber,
+            players,
+            deck_size,
+            awards,
+        )
+
+
+def _encode_building(owner: int, building_type: BuildingType) -> int:
+    return (owner + 1) << 2 | building_type.value
+
+
+def _decode_building(value: int) -> Tuple[int, BuildingType]:
+    if value == 0:
+        raise ValueError("A building in the delta has no owner")
+    return (value >> 2) - 1, _BUILDING_TYPES[value & 3]
@@ -0,0 +1,44 @@
+from enum import Enum
+from typing import NamedTuple, Tuple
+
+
+class EventType(Enum):
+    """A type of change to the state of a game, sent to the game's event listeners.
+
+    Players are given by their index in ``Game.players``, coordinates as their q and r values, resources as a
+    count of each resource in the order of ``Resource`` and development cards by their value.
+    """
+
+    BUILD_SETTLEMENT = 0
+    """A settlement was built. The arguments are (player, q, r, cost_resources)"""
+    BUILD_CITY = 1
+    """A settlement was upgraded to a city. The arguments are (player, q, r, cost_resources)"""
+    BUILD_ROAD = 2
+    """A road was built. The arguments are (player, q1, r1, q2, r2, cost_resources)"""
+    ROLL = 3
+    """The resources for a dice roll were given out. The arguments are (roll,)"""
+    MOVE_ROBBER = 4
+    """The robber was moved. The arguments are (q, r)"""
+    BUILD_DEVELOPMENT_CARD = 5
+    """A player took a development card from the deck. The arguments are (player, card)"""
+    PLAY_DEVELOPMENT_CARD = 6
+    """A player played a development card. The arguments are (player, card)"""
+    ADD_RESOURCES = 7
+    """Resources were added to a player's hand. The arguments are (player, lumber, brick, wool, grain, ore)"""
+    REMOVE_RESOURCES = 8
+    """Resources were removed from a player's hand. The arguments are (player, lumber, brick, wool, grain, ore)"""
+    TRANSFER_RESOURCES = 9
+    """Resources were moved from one player's hand to another's, i.e. stolen.
+    The arguments are (from player, to player, lumber, brick, wool, grain, ore)"""
+
+
+class GameEvent(NamedTuple):
+    """A change to the state of a game.
+
+    Attributes:
+        event_type (EventType): The type of change
+        args (Tuple[int, ...]): The details of the change, which depend on the event type (see ``EventType``)
+    """
+
+    event_type: EventType
+    args: Tuple[int, ...]
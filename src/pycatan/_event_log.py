@@ -0,0 +1,490 @@
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+import bisect
+import struct
+
+from ._event import EventType, GameEvent
+from ._game import Game
+
+# The length of the record's payload and the record's type
+_RECORD_HEADER = struct.Struct("<HB")
+# Record types that are not events
+_INDEX_END = 0xFA
+_INDEX = 0xFB
+_KEYFRAME = 0xFC
+_TURN = 0xFD
+_GAME_START = 0xFE
+_GAME_END = 0xFF
+# The turn number of a turn or keyframe record
+_TURN_NUMBER = struct.Struct("<H")
+# The offset of the start of a game, and the number of keyframes in it
+_INDEX_GAME = struct.Struct("<QH")
+# The turn and offset of a keyframe
+_INDEX_KEYFRAME = struct.Struct("<HQ")
+# The offset of the first index record
+_INDEX_FOOTER = struct.Struct("<Q4s")
+_INDEX_MAGIC = b"PCGI"
+
+_EVENT_ARGS: Dict[EventType, struct.Struct] = {
+    EventType.BUILD_SETTLEMENT: struct.Struct("<BbbB"),
+    EventType.BUILD_CITY: struct.Struct("<BbbB"),
+    EventType.BUILD_ROAD: struct.Struct("<BbbbbB"),
+    EventType.ROLL: struct.Struct("<B"),
+    EventType.MOVE_ROBBER: struct.Struct("<bb"),
+    EventType.BUILD_DEVELOPMENT_CARD: struct.Struct("<BB"),
+    EventType.PLAY_DEVELOPMENT_CARD: struct.Struct("<BB"),
+    EventType.ADD_RESOURCES: struct.Struct("<B5H"),
+    EventType.REMOVE_RESOURCES: struct.Struct("<B5H"),
+    EventType.TRANSFER_RESOURCES: struct.Struct("<BB5H"),
+}
+
+
+class GameLogWriter:
+    """Writes the events of games to a binary stream as they happen.
+
+    Each game in the log starts with a snapshot of the game (see ``Game.to_bytes()``), followed by its events
+    and an end marker, so many games can be written one after the other to the same stream.
+    Every record is prefixed with its length and type. The records are collected in memory
+    and written to the stream in blocks of about ``buffer_size`` bytes.
+
+    The start of each turn can be marked with ``start_turn()``. Every ``keyframe_interval`` turns,
+    another snapshot of the game (a keyframe) is written instead of the mark, and ``close()`` writes an index
+    of the keyframes at the end of the stream, so that SeekableGameLog can get the game at any turn by only
+    replaying the turns after the closest keyframe.
+
+    Example:
+        >>> with open("games.log", "wb") as f, GameLogWriter(f) as writer:
+        ...     writer.start_game(machine.game)
+        ...     while not machine.is_over:
+        ...         turn = machine.turn_number
+        ...         machine.step(agent.choose_action(machine))
+        ...         if machine.turn_number != turn:
+        ...             writer.start_turn(machine.turn_number)
+        ...     writer.end_game()
+
+    Args:
+        stream: The binary stream to write to, i.e. a file opened with "wb"
+        buffer_size: The number of bytes to collect before writing them to the stream. Defaults to 65536
+        keyframe_interval: The number of turns between keyframes, or None to not write keyframes. Defaults to 5
+        write_index: Whether to write the index of the games and keyframes when the writer is closed.
+            Defaults to True
+
+    Attributes:
+        stream (BinaryIO): The stream being written to
+        buffer_size (int): The number of bytes to collect before writing them to the stream
+        keyframe_interval (int): The number of turns between keyframes, or None
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        buffer_size: Optional[int] = 65536,
+        keyframe_interval: Optional[int] = 5,
+        write_index: Optional[bool] = True,
+    ):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.keyframe_interval = keyframe_interval
+        self._write_index = write_index
+        self._buffer = bytearray()
+        self._game: Optional[Game] = None
+        self._last_keyframe = 0
+        self._closed = False
+        # The offset of the start of every game written, and the turns and offsets of its keyframes
+        self._index: List[Tuple[int, List[Tuple[int, int]]]] = []
+        # The offset in the stream of the next record
+        try:
+            self._offset = stream.tell()
+        except (AttributeError, OSError):
+            self._offset = 0
+
+    def start_game(self, game: Game):
+        """Write a snapshot of a game, and then every change made to it until ``end_game()`` is called.
+
+        Args:
+            game: The game to log
+        Raises:
+            ValueError: If a game is already being logged, or the writer is closed
+        """
+        if self._closed:
+            raise ValueError("Cannot start a game after the writer is closed")
+        if self._game is not None:
+            raise ValueError("Cannot start a game before the last game has ended")
+        self._index.append((self._offset, []))
+        self._write(_GAME_START, game.to_bytes())
+        game.add_event_listener(self.write_event)
+        self._game = game
+        self._last_keyframe = 0
+
+    def start_turn(self, turn_number: int):
+        """Mark the start of a turn of the current game, and write a keyframe if it is time for one.
+
+        Args:
+            turn_number: The number of the turn that is starting, i.e. ``TurnMachine.turn_number``
+        Raises:
+            ValueError: If no game is being logged
+        """
+        if self._game is None:
+            raise ValueError("No game is being logged")
+        if (
+            self.keyframe_interval is not None
+            and turn_number - self._last_keyframe >= self.keyframe_interval
+        ):
+            self._index[-1][1].append((turn_number, self._offset))
+            self._write(
+                _KEYFRAME, _TURN_NUMBER.pack(turn_number) + self._game.to_bytes()
+            )
+            self._last_keyframe = turn_number
+        else:
+            self._write(_TURN, _TURN_NUMBER.pack(turn_number))
+
+    def end_game(self):
+        """Stop logging the current game.
+
+        Raises:
+            ValueError: If no game is being logged
+        """
+        if self._game is None:
+            raise ValueError("No game is being logged")
+        self._game.remove_event_listener(self.write_event)
+        self._game = None
+        self._write(_GAME_END, b"")
+
+    def write_event(self, event: GameEvent):
+        """Write an event of the current game. Called by the game for every change while it is being logged.
+
+        Args:
+            event: The event to write
+        """
+        self._write(
+            event.event_type.value, _EVENT_ARGS[event.event_type].pack(*event.args)
+        )
+
+    def _write(self, record_type: int, payload: bytes):
+        if len(payload) > 0xFFFF:
+            raise ValueError("A record of the log is too long")
+        self._buffer += _RECORD_HEADER.pack(len(payload), record_type)
+        self._buffer += payload
+        self._offset += _RECORD_HEADER.size + len(payload)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write all the collected records to the stream."""
+        if self._buffer:
+            self.stream.write(bytes(self._buffer))
+            del self._buffer[:]
+
+    def close(self):
+        """End the current game, if there is one, write the index and write all the collected records to the stream.
+
+        The stream itself is not closed. Closing a writer that is already closed does nothing.
+        """
+        if self._closed:
+            return
+        if self._game is not None:
+            self.end_game()
+        if self._write_index:
+            start = self._offset
+            for game_offset, keyframes in self._index:
+                self._write(
+                    _INDEX,
+                    _INDEX_GAME.pack(game_offset, len(keyframes))
+                    + b"".join(_INDEX_KEYFRAME.pack(*k) for k in keyframes),
+                )
+            self._write(_INDEX_END, _INDEX_FOOTER.pack(start, _INDEX_MAGIC))
+        self._closed = True
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _read_records(
+    stream: BinaryIO, chunk_size: int = 65536
+) -> Iterator[Tuple[int, bytes]]:
+    data = b""
+    pos = 0
+    at_end = False
+    while True:
+        start = pos + _RECORD_HEADER.size
+        if start <= len(data):
+            length, record_type = _RECORD_HEADER.unpack_from(data, pos)
+            end = start + length
+            if end <= len(data):
+                yield record_type, data[start:end]
+                pos = end
+                continue
+        if at_end:
+            if pos < len(data):
+                raise ValueError("The log ends in the middle of a record")
+            return
+        # Only keep the part of the last chunk that has not been read
+        chunk = stream.read(chunk_size)
+        at_end = not chunk
+        data = data[pos:] + chunk
+        pos = 0
+
+
+def _decode_event(record_type: int, payload: bytes) -> GameEvent:
+    try:
+        event_type = EventType(record_type)
+        return GameEvent(event_type, _EVENT_ARGS[event_type].unpack(payload))
+    except (ValueError, struct.error) as e:
+        raise ValueError("Invalid event record: %s" % e) from e
+
+
+class LoggedGame:
+    """A game read from a log written by GameLogWriter, as returned by ``read_game_log()``.
+
+    The events are read from the stream as they are used, so the events of a game can only be read once,
+    and must be read before moving on to the next game in the log.
+
+    Attributes:
+        snapshot (bytes): The game at the start of the log, as returned by ``Game.to_bytes()``
+    """
+
+    def __init__(self, snapshot: bytes, records: Iterator[Tuple[int, bytes]]):
+        self.snapshot = snapshot
+        self._records = records
+        self._read = False
+        self._ended = False
+
+    def events(self) -> Iterator[GameEvent]:
+        """Read the events of the game.
+
+        Raises:
+            ValueError: If the events have already been read, or the log is invalid
+        Returns:
+            The events, in the order they happened
+        """
+        if self._read:
+            raise ValueError("The events of a logged game can only be read once")
+        self._read = True
+        return self._iter_events()
+
+    def _iter_events(self) -> Iterator[GameEvent]:
+        # Check if the game has ended before every record, so that the events of the next game are never read
+        # after the rest of this game has been skipped
+        while not self._ended:
+            record = next(self._records, None)
+            if record is None:
+                # The log was cut off before the game ended, i.e. it is still being written
+                self._ended = True
+            elif record[0] == _GAME_END:
+                self._ended = True
+            elif record[0] == _GAME_START:
+                raise ValueError("A game starts before the last game has ended")
+            elif record[0] != _TURN and record[0] != _KEYFRAME:
+                yield _decode_event(*record)
+
+    def replay(self) -> Iterator[Tuple[Game, GameEvent]]:
+        """Replay the events onto a new game created from the snapshot.
+
+        The same game is returned with every event, after the event has been applied to it.
+
+        Raises:
+            ValueError: If the events have already been read, or the log is invalid
+        Returns:
+            The game and each event
+        """
+        game = Game.from_bytes(self.snapshot)
+        for event in self.events():
+            game.apply_event(event)
+            yield game, event
+
+    def _skip(self):
+        if not self._ended:
+            for _ in self._iter_events():
+                pass
+
+
+def read_game_log(stream: BinaryIO) -> Iterator[LoggedGame]:
+    """Read the games in a log written by GameLogWriter.
+
+    The log is read from the stream a block at a time, so logs that do not fit in memory can be read.
+    The events of a game that are not read before moving on to the next game are skipped.
+
+    Args:
+        stream: The binary stream to read from, i.e. a file opened with "rb"
+    Raises:
+        ValueError: If the log is invalid
+    Returns:
+        The games in the log, in the order they were written
+    """
+    records = _read_records(stream)
+    for record_type, payload in records:
+        if record_type == _INDEX or record_type == _INDEX_END:
+            continue
+        if record_type != _GAME_START:
+            raise ValueError("Expected the start of a game in the log")
+        game = LoggedGame(payload, records)
+        yield game
+        game._skip()
+
+
+def replay_game_log(stream: BinaryIO) -> Iterator[Game]:
+    """Replay every game in a log written by GameLogWriter.
+
+    Args:
+        stream: The binary stream to read from, i.e. a file opened with "rb"
+    Raises:
+        ValueError: If the log is invalid
+    Returns:
+        Each game in the log, in the state it was in when it stopped being logged
+    """
+    for logged in read_game_log(stream):
+        game = Game.from_bytes(logged.snapshot)
+        for event in logged.events():
+            game.apply_event(event)
+        yield game
+
+
+class SeekableGameLog:
+    """Gets the games in a log written by GameLogWriter at any of their turns, without replaying the whole game.
+
+    Uses the index at the end of the log to find the keyframe closest before the turn, and only replays the events
+    after it. If the log has no index, i.e. the writer was not closed, the log is scanned once to build it.
+    The stream must be seekable. The index is read, or the log scanned, when the SeekableGameLog is created, and the
+    events of a game are only read when the game is requested.
+
+    Args:
+        stream: The binary stream to read from, i.e. a file opened with "rb"
+    Raises:
+        ValueError: If the log is invalid
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        games = self._read_index()
+        if games is None:
+            games = self._scan()
+        self._game_offsets = [offset for offset, _ in games]
+        self._keyframe_turns = [[t for t, _ in keyframes] for _, keyframes in games]
+        self._keyframe_offsets = [[o for _, o in keyframes] for _, keyframes in games]
+
+    def __len__(self) -> int:
+        return len(self._game_offsets)
+
+    def _read_index(self) -> Optional[List[Tuple[int, List[Tuple[int, int]]]]]:
+        stream = self.stream
+        size = stream.seek(0, 2)
+        footer_size = _RECORD_HEADER.size + _INDEX_FOOTER.size
+        if size < footer_size:
+            return None
+        stream.seek(size - footer_size)
+        footer = stream.read(footer_size)
+        length, record_type = _RECORD_HEADER.unpack_from(footer)
+        start, magic = _INDEX_FOOTER.unpack_from(footer, _RECORD_HEADER.size)
+        if (
+            record_type != _INDEX_END
+            or length != _INDEX_FOOTER.size
+            or magic != _INDEX_MAGIC
+        ):
+            return None
+        if start > size - footer_size:
+            return None
+        stream.seek(start)
+        index = stream.read(size - footer_size - start)
+        games = []
+        pos = 0
+        try:
+            while pos < len(index):
+                length, record_type = _RECORD_HEADER.unpack_from(index, pos)
+                pos += _RECORD_HEADER.size
+                if record_type != _INDEX:
+                    return None
+                offset, num_keyframes = _INDEX_GAME.unpack_from(index, pos)
+                games.append(
+                    (
+                        offset,
+                        [
+                            _INDEX_KEYFRAME.unpack_from(
+                                index,
+                                pos + _INDEX_GAME.size + i * _INDEX_KEYFRAME.size,
+                            )
+                            for i in range(num_keyframes)
+                        ],
+                    )
+                )
+                pos += length
+        except struct.error:
+            return None
+        # The index only covers the games of one writer, so if the log was appended to or joined with another log,
+        # scan it instead
+        if pos != len(index) or (games and games[0][0] != 0):
+            return None
+        return games
+
+    def _scan(self) -> List[Tuple[int, List[Tuple[int, int]]]]:
+        # Only read the record headers and the turn numbers of the keyframes, and skip everything else
+        stream = self.stream
+        offset = stream.seek(0)
+        games = []
+        while True:
+            header = stream.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return games
+            length, record_type = _RECORD_HEADER.unpack(header)
+            if record_type == _GAME_START:
+                games.append((offset, []))
+            elif record_type == _KEYFRAME and games:
+                (turn,) = _TURN_NUMBER.unpack(stream.read(_TURN_NUMBER.size))
+                games[-1][1].append((turn, offset))
+            offset += _RECORD_HEADER.size + length
+            stream.seek(offset)
+
+    def get_keyframe_turns(self, game_number: int) -> List[int]:
+        """Get the turns of a game that have a keyframe.
+
+        Args:
+            game_number: The index of the game in the log
+        Returns:
+            The turns with a keyframe, in order
+        """
+        return list(self._keyframe_turns[game_number])
+
+    def get_game(self, game_number: int, turn_number: Optional[int] = None) -> Game:
+        """Get a game in the log as it was at the start of a turn.
+
+        Args:
+            game_number: The index of the game in the log
+            turn_number: The turn to get the game at, which must have been marked with ``GameLogWriter.start_turn()``.
+                If None, get the game when it started being logged. Defaults to None
+        Raises:
+            ValueError: If the turn is not in the game, or the log is invalid
+        Returns:
+            A new game, in the state it was in at the start of the turn
+        """
+        offset = self._game_offsets[game_number]
+        if turn_number is not None:
+            i = bisect.bisect_right(self._keyframe_turns[game_number], turn_number)
+            if i > 0:
+                offset = self._keyframe_offsets[game_number][i - 1]
+        self.stream.seek(offset)
+        # Most turns are only a few records, so read in small blocks
+        records = _read_records(self.stream, chunk_size=4096)
+        record_type, payload = next(records, (None, None))
+        if record_type == _GAME_START:
+            game = Game.from_bytes(payload)
+            if turn_number is None:
+                return game
+        elif record_type == _KEYFRAME:
+            (turn,) = _TURN_NUMBER.unpack_from(payload)
+            snapshot_start = _TURN_NUMBER.size
+            game = Game.from_bytes(payload[snapshot_start:])
+            if turn == turn_number:
+                return game
+        else:
+            raise ValueError("The index does not point to the start of a game")
+        for record_type, payload in records:
+            if record_type == _TURN or record_type == _KEYFRAME:
+                if _TURN_NUMBER.unpack_from(payload)[0] == turn_number:
+                    return game
+            elif record_type == _GAME_START or record_type == _GAME_END:
+                break
+            else:
+                game.apply_event(_decode_event(record_type, payload))
+        raise ValueError("Turn %d is not in game %d" % (turn_number, game_number))
@@ -1,4 +1,4 @@
-from typing import Dict, Set, Optional
+from typing import Callable, Dict, List, Set, Optional
 from random import shuffle
 
 from ._player import Player
@@ -8,6 +8,11 @@ from ._roll_yield import RollYield
 from .errors import NotEnoughResourcesError
 from .board._building_type import BuildingType
 from ._development_card import DevelopmentCard
+from ._delta import GameDelta, PlayerDelta
+from ._event import EventType, GameEvent
+from .board._building import IntersectionBuilding, PathBuilding
+from ._resource import Resource
+from ._serialization import game_to_bytes, game_from_bytes
 
 
 class Game:
@@ -24,6 +29,9 @@ class Game:
                 have a road of at least 5 length
             largest_army_owner (Player): The player how has the largest army, or None if no players have played at least 3 knight cards
             development_card_deck (List[DevelopmentCard]): The deck of development cards
+
+    Every change made through the game's methods increases the version of the board (see ``version``), so
+    the changes since a version can be found with ``get_delta()``.
     """
 
     def __init__(self, board: Board, num_players: Optional[int] = 4):
@@ -39,6 +47,12 @@ class Game:
             + 2 * [DevelopmentCard.MONOPOLY]
         )
 
+        self._listeners: List[Callable[[GameEvent], None]] = []
+        # The version at which each player's hand, the deck and the awards last changed
+        self._player_versions: Dict[Player, int] = {}
+        self._deck_version = 0
+        self._awards_version = 0
+
         shuffle(self.development_card_deck)
 
     def build_settlement(
@@ -75,6 +89,15 @@ class Game:
         # Remove the resources
         if cost_resources:
             player.remove_resources(BuildingType.SETTLEMENT.get_required_resources())
+            self._player_versions[player] = self._next_version()
+        if self._listeners:
+            self._emit(
+                EventType.BUILD_SETTLEMENT,
+                self.players.index(player),
+                coords.q,
+                coords.r,
+                int(cost_resources),
+            )
 
     def build_road(
         self,
@@ -114,6 +137,7 @@ class Game:
         # Remove the resources
         if cost_resources:
             player.remove_resources(BuildingType.ROAD.get_required_resources())
+            self._player_versions[player] = self._next_version()
 
         # Check if the player gets longest road
         road_length = self.board.calculate_player_longest_road(player)
@@ -122,7 +146,20 @@ class Game:
             or road_length
             > self.board.calculate_player_longest_road(self.longest_road_owner)
         ):
+            if self.longest_road_owner is not player:
+                self._awards_version = self._next_version()
             self.longest_road_owner = player
+        if self._listeners:
+            first, second = sorted(path_coords, key=lambda c: (c.q, c.r))
+            self._emit(
+                EventType.BUILD_ROAD,
+                self.players.index(player),
+                first.q,
+                first.r,
+                second.q,
+                second.r,
+                int(cost_resources),
+            )
 
     def upgrade_settlement_to_city(
         self, player: Player, coords: Coords, cost_resources: Optional[bool] = True
@@ -151,6 +188,15 @@ class Game:
 
         if cost_resources:
             player.remove_resources(BuildingType.CITY.get_required_resources())
+            self._player_versions[player] = self._next_version()
+        if self._listeners:
+            self._emit(
+                EventType.BUILD_CITY,
+                self.players.index(player),
+                coords.q,
+                coords.r,
+                int(cost_resources),
+            )
 
     def add_yield_for_roll(self, roll: int):
         """Add the resources to the player's hands for the dice roll given.
@@ -158,7 +204,9 @@ class Game:
         Args:
             roll: The number that was rolled
         """
-        self.add_yield(self.board.get_yield_for_roll(roll))
+        self._add_yield(self.board.get_yield_for_roll(roll))
+        if self._listeners:
+            self._emit(EventType.ROLL, roll)
 
     def add_yield(self, roll_yield: Dict[Player, RollYield]):
         """Add the yield provided to the player's hands.
@@ -167,8 +215,19 @@ class Game:
             roll_yield: The yield provided by Board.get_yield_for_roll. A dictionary of RollYields mapped by
                 the player who gets that yield
         """
+        self._add_yield(roll_yield)
+        if self._listeners:
+            for p, y in roll_yield.items():
+                self._emit(
+                    EventType.ADD_RESOURCES,
+                    self.players.index(p),
+                    *_get_resource_counts(y.total_yield),
+                )
+
+    def _add_yield(self, roll_yield: Dict[Player, RollYield]):
         for p, y in roll_yield.items():
             p.add_resources(y.total_yield)
+            self._player_versions[p] = self._next_version()
 
     def move_robber(self, coords: Coords):
         """Move the robber to the coords specified.
@@ -181,7 +240,9 @@ class Game:
         if not self.board.is_valid_hex_coords(coords):
             raise ValueError("coords is no a valid hex coordinate")
 
-        self.board.robber = coords
+        self.board.move_robber(coords)
+        if self._listeners:
+            self._emit(EventType.MOVE_ROBBER, coords.q, coords.r)
 
     def build_development_card(self, player: Player) -> DevelopmentCard:
         """Build a development card and place it in the player's hand.
@@ -201,6 +262,11 @@ class Game:
         card = self.development_card_deck.pop(0)
         player.development_cards[card] += 1
         player.remove_resources(DevelopmentCard.get_required_resources())
+        self._deck_version = self._player_versions[player] = self._next_version()
+        if self._listeners:
+            self._emit(
+                EventType.BUILD_DEVELOPMENT_CARD, self.players.index(player), card.value
+            )
         return card
 
     def play_development_card(self, player: Player, card: DevelopmentCard):
@@ -223,7 +289,299 @@ class Game:
                 or self.largest_army_owner.number_played_knights
                 < player.number_played_knights
             ):
+                if self.largest_army_owner is not player:
+                    self._awards_version = self._next_version()
                 self.largest_army_owner = player
+        self._player_versions[player] = self._next_version()
+        if self._listeners:
+            self._emit(
+                EventType.PLAY_DEVELOPMENT_CARD, self.players.index(player), card.value
+            )
+
+    def add_resources(self, player: Player, resources: Dict[Resource, int]):
+        """Add resources to a player's hand, i.e. from a year of plenty card or the bank.
+
+        Use this instead of ``Player.add_resources`` so that the change is sent to the event listeners.
+
+        Args:
+            player: The player to give the resources to
+            resources: The resources to add
+        """
+        player.add_resources(resources)
+        self._player_versions[player] = self._next_version()
+        if self._listeners:
+            self._emit(
+                EventType.ADD_RESOURCES,
+                self.players.index(player),
+                *_get_resource_counts(resources),
+            )
+
+    def remove_resources(self, player: Player, resources: Dict[Resource, int]):
+        """Remove resources from a player's hand, i.e. when they discard or trade with the bank.
+
+        Use this instead of ``Player.remove_resources`` so that the change is sent to the event listeners.
+
+        Args:
+            player: The player to take the resources from
+            resources: The resources to remove
+        Raises:
+            NotEnoughResourcesError: If the player does not have the resources
+        """
+        player.remove_resources(resources)
+        self._player_versions[player] = self._next_version()
+        if self._listeners:
+            self._emit(
+                EventType.REMOVE_RESOURCES,
+                self.players.index(player),
+                *_get_resource_counts(resources),
+            )
+
+    def transfer_resources(
+        self, from_player: Player, to_player: Player, resources: Dict[Resource, int]
+    ):
+        """Move resources from one player's hand to another's, i.e. when a resource is stolen.
+
+        Args:
+            from_player: The player who loses the resources
+            to_player: The player who gets the resources
+            resources: The resources to move
+        Raises:
+            NotEnoughResourcesError: If from_player does not have the resources
+        """
+        from_player.remove_resources(resources)
+        to_player.add_resources(resources)
+        self._player_versions[from_player] = self._next_version()
+        self._player_versions[to_player] = self.board.version
+        if self._listeners:
+            self._emit(
+                EventType.TRANSFER_RESOURCES,
+                self.players.index(from_player),
+                self.players.index(to_player),
+                *_get_resource_counts(resources),
+            )
+
+    def add_event_listener(self, listener: Callable[[GameEvent], None]):
+        """Call a function with every change made to this game from now on.
+
+        Every method of Game that changes the game sends a GameEvent to the listeners after the change is made.
+        Changes made by changing the board or players directly, instead of through the game, are not sent.
+
+        Args:
+            listener: The function to call with each GameEvent
+        """
+        self._listeners.append(listener)
+
+    def remove_event_listener(self, listener: Callable[[GameEvent], None]):
+        """Stop calling a function that was added with ``add_event_listener``.
+
+        Args:
+            listener: The function to stop calling
+        Raises:
+            ValueError: If the function is not a listener of this game
+        """
+        self._listeners.remove(listener)
+
+    @property
+    def version(self) -> int:
+        """The version of the game, which increases with every change made through the game's methods.
+
+        This is the version of the board, which is also increased by the changes made to the players' hands and the
+        development card deck.
+        """
+        return self.board.version
+
+    def _next_version(self) -> int:
+        self.board.version += 1
+        return self.board.version
+
+    def _set_version(self, version: int):
+        # Mark everything as changed at the version, i.e. after loading a game whose history is unknown
+        self.board._reset_tracking(version)
+        self._player_versions = {p: version for p in self.players}
+        self._deck_version = version
+        self._awards_version = version
+
+    def get_delta(self, since_version: int) -> GameDelta:
+        """Get the changes made to this game since a version, i.e. to send only what has changed to a spectator.
+
+        Uses the versions at which each part of the game last changed, so only the changed parts are visited.
+        Changes made directly to the board or players, instead of through the game's methods, are not included.
+
+        Args:
+            since_version: The version to get the changes since, i.e. the ``version`` of the spectator's copy
+        Returns:
+            The changes
+        """
+        board = self.board
+        players = {p: i for i, p in enumerate(self.players)}
+        intersections = {}
+        for coords in board.get_changed_intersections(since_version):
+            building = board.intersections[coords].building
+            intersections[coords] = (players[building.owner], building.building_type)
+        paths = {}
+        for key in board.get_changed_paths(since_version):
+            building = board.paths[key].building
+            paths[key] = (players[building.owner], building.building_type)
+        changed_players = {}
+        for player, version in self._player_versions.items():
+            if version > since_version:
+                changed_players[players[player]] = PlayerDelta(
+                    dict(player.resources),
+                    dict(player.development_cards),
+                    player.number_played_knights,
+                )
+        return GameDelta(
+            since_version,
+            board.version,
+            intersections,
+            paths,
+            board.robber if board.has_robber_moved(since_version) else None,
+            changed_players,
+            (
+                len(self.development_card_deck)
+                if self._deck_version > since_version
+                else None
+            ),
+            (
+                (
+                    players.get(self.longest_road_owner),
+                    players.get(self.largest_army_owner),
+                )
+                if self._awards_version > since_version
+                else None
+            ),
+        )
+
+    def apply_delta(self, delta: GameDelta):
+        """Make the changes in a delta from another copy of this game, i.e. to keep a spectator's copy up to date.
+
+        The version of this game becomes the version the delta ends at.
+
+        Args:
+            delta: The changes, as returned by ``get_delta()``
+        Raises:
+            ValueError: If the delta starts after the version of this game, so some changes would be missing
+        """
+        if delta.since_version > self.version:
+            raise ValueError(
+                "The delta starts at version %d, after this game's version %d"
+                % (delta.since_version, self.version)
+            )
+        board = self.board
+        version = delta.version
+        for coords, (owner, building_type) in delta.intersections.items():
+            player = self.players[owner]
+            board.intersections[coords].building = IntersectionBuilding(
+                player, building_type, coords
+            )
+            board._intersection_versions[coords] = version
+            board._building_version = version
+            for harbor in board.harbors.values():
+                if coords in harbor.path_coords:
+                    player.connected_harbors.add(harbor)
+        for key, (owner, building_type) in delta.paths.items():
+            board.paths[key].building = PathBuilding(
+                self.players[owner], building_type, set(key)
+            )
+            board._path_versions[key] = version
+            board._building_version = version
+        if delta.intersections or delta.paths:
+            # The buildings were changed directly, so the road networks are built again when needed
+            board._road_networks.clear()
+        if delta.robber is not None:
+            board._robber_from = board.robber
+            board.robber = delta.robber
+            board._robber_version = version
+        for index, player_delta in delta.players.items():
+            player = self.players[index]
+            player.resources = dict(player_delta.resources)
+            player.development_cards = dict(player_delta.development_cards)
+            player.number_played_knights = player_delta.number_played_knights
+            self._player_versions[player] = version
+        if delta.deck_size is not None:
+            # Cards are drawn from the top of the deck
+            drawn = len(self.development_card_deck) - delta.deck_size
+            if drawn < 0:
+                raise ValueError("The development card deck cannot grow")
+            del self.development_card_deck[:drawn]
+            self._deck_version = version
+        if delta.awards is not None:
+            longest_road, largest_army = delta.awards
+            self.longest_road_owner = (
+                None if longest_road is None else self.players[longest_road]
+            )
+            self.largest_army_owner = (
+                None if largest_army is None else self.players[largest_army]
+            )
+            self._awards_version = version
+        board.version = max(board.version, version)
+
+    def _emit(self, event_type: EventType, *args: int):
+        event = GameEvent(event_type, args)
+        for listener in self._listeners:
+            listener(event)
+
+    def apply_event(self, event: GameEvent):
+        """Make the change described by an event, i.e. to replay the events of another game.
+
+        The game should be in the same state as the game that sent the event was before the event.
+        Buildings are not checked to be connected, since they were when the event was sent.
+
+        Args:
+            event: The event to apply
+        Raises:
+            ValueError: If the event cannot be applied to this game, i.e. the development card at the top of the deck
+                is not the one in the event
+        """
+        event_type, args = event
+        if event_type is EventType.BUILD_SETTLEMENT:
+            player, q, r, cost_resources = args
+            self.build_settlement(
+                self.players[player],
+                Coords(q, r),
+                cost_resources=bool(cost_resources),
+                ensure_connected=False,
+            )
+        elif event_type is EventType.BUILD_CITY:
+            player, q, r, cost_resources = args
+            self.upgrade_settlement_to_city(
+                self.players[player], Coords(q, r), cost_resources=bool(cost_resources)
+            )
+        elif event_type is EventType.BUILD_ROAD:
+            player, q1, r1, q2, r2, cost_resources = args
+            self.build_road(
+                self.players[player],
+                {Coords(q1, r1), Coords(q2, r2)},
+                cost_resources=bool(cost_resources),
+                ensure_connected=False,
+            )
+        elif event_type is EventType.ROLL:
+            self.add_yield_for_roll(args[0])
+        elif event_type is EventType.MOVE_ROBBER:
+            self.move_robber(Coords(*args))
+        elif event_type is EventType.BUILD_DEVELOPMENT_CARD:
+            player, card = args
+            if (
+                not self.development_card_deck
+                or self.development_card_deck[0].value != card
+            ):
+                raise ValueError(
+                    "The development card deck does not match the game the event is from"
+                )
+            self.build_development_card(self.players[player])
+        elif event_type is EventType.PLAY_DEVELOPMENT_CARD:
+            player, card = args
+            self.play_development_card(self.players[player], DevelopmentCard(card))
+        elif event_type is EventType.ADD_RESOURCES:
+            self.add_resources(self.players[args[0]], _get_resources(args[1:]))
+        elif event_type is EventType.REMOVE_RESOURCES:
+            self.remove_resources(self.players[args[0]], _get_resources(args[1:]))
+        elif event_type is EventType.TRANSFER_RESOURCES:
+            self.transfer_resources(
+                self.players[args[0]], self.players[args[1]], _get_resources(args[2:])
+            )
+        else:
+            raise ValueError("Unknown event type %s" % event_type)
 
     def get_victory_points(self, player: Player):
         """Get the number of victory points the player has.
@@ -251,3 +609,66 @@ class Game:
             victory_points += 2
 
         return victory_points + player.development_cards[DevelopmentCard.VICTORY_POINT]
+
+    def copy(self) -> "Game":
+        """Get a copy of this game that can be changed without changing this game.
+
+        Only the state that changes while playing is copied, so this is much faster than ``copy.deepcopy``.
+        The players of the copy are in the same order as the players of this game.
+
+        Returns:
+            The copy
+        """
+        game = Game.__new__(Game)
+        game.players = [p.copy() for p in self.players]
+        player_map = dict(zip(self.players, game.players))
+        game.board = self.board.copy(player_map)
+        game.longest_road_owner = player_map.get(self.longest_road_owner)
+        game.largest_army_owner = player_map.get(self.largest_army_owner)
+        game.development_card_deck = list(self.development_card_deck)
+        # The listeners are watching this game, not the copy
+        game._listeners = []
+        game._player_versions = {
+            player_map[p]: v for p, v in self._player_versions.items()
+        }
+        game._deck_version = self._deck_version
+        game._awards_version = self._awards_version
+        return game
+
+    def to_bytes(self) -> bytes:
+        """Serialize this game to a compact binary format.
+
+        The hexes, harbors, robber, buildings, players' hands, development cards, played knights, development card
+        deck, the owners of the longest road and largest army and the version of the game are packed with ``struct``
+        in a fixed layout, with the intersections and paths in the order of ``BoardIndex``. A game on the standard
+        board is a few hundred bytes.
+
+        Raises:
+            ValueError: If the game cannot be serialized, i.e. a building is owned by a player who is not in the game
+        Returns:
+            The serialized game
+        """
+        return game_to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Game":
+        """Create a game from the bytes returned by ``to_bytes()``.
+
+        The board of the game is always a ``Board``, even if the serialized game used a subclass such as ``BeginnerBoard``.
+
+        Args:
+            data: The serialized game
+        Raises:
+            ValueError: If the data is not a serialized game
+        Returns:
+            The game
+        """
+        return game_from_bytes(cls, data)
+
+
+def _get_resource_counts(resources: Dict[Resource, int]) -> List[int]:
+    return [resources.get(r, 0) for r in Resource]
+
+
+def _get_resources(counts) -> Dict[Resource, int]:
+    return {r: n for r, n in zip(Resource, counts) if n > 0}
@@ -0,0 +1,128 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+import functools
+import time
+import types
+
+from ._game import Game
+from ._player import Player
+from .board._board import Board
+
+_INSTRUMENTED_CLASSES = [Board, Game, Player]
+
+# The original method of each instrumented method, while instrumentation is enabled
+_originals: Dict[str, tuple] = {}
+# [calls, cumulative time, exceptions] for every method that has been instrumented
+_records: Dict[str, List] = {}
+
+
+def _get_public_methods(cls):
+    return [
+        (name, value)
+        for name, value in vars(cls).items()
+        if not name.startswith("_") and isinstance(value, types.FunctionType)
+    ]
+
+
+def _wrap(func, record: List):
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            record[2] += 1
+            raise
+        finally:
+            record[0] += 1
+            record[1] += perf_counter() - start
+
+    return wrapper
+
+
+def is_instrumentation_enabled() -> bool:
+    """Check whether the calls to Board, Game and Player are being counted.
+
+    Returns:
+        Whether instrumentation is enabled
+    """
+    return len(_originals) > 0
+
+
+def enable_instrumentation():
+    """Start counting the calls, time and raised exceptions of the public methods of Board, Game and Player.
+
+    The methods are replaced by wrappers that update the counters, and put back by
+    ``disable_instrumentation()``, so nothing is measured (or slowed down) while instrumentation is disabled.
+    The time of a method includes the time of the methods it calls.
+    Enabling instrumentation when it is already enabled does nothing.
+    """
+    if is_instrumentation_enabled():
+        return
+    for cls in _INSTRUMENTED_CLASSES:
+        for name, func in _get_public_methods(cls):
+            key = "%s.%s" % (cls.__name__, name)
+            record = _records.setdefault(key, [0, 0.0, 0])
+            _originals[key] = (cls, name, func)
+            setattr(cls, name, _wrap(func, record))
+
+
+def disable_instrumentation():
+    """Stop counting, and put the original methods back. The counters are kept."""
+    for cls, name, func in _originals.values():
+        setattr(cls, name, func)
+    _originals.clear()
+
+
+def reset_stats():
+    """Set all the counters back to 0."""
+    for record in _records.values():
+        record[0] = 0
+        record[1] = 0.0
+        record[2] = 0
+
+
+def stats() -> Dict[str, Dict]:
+    """Get a snapshot of the counters.
+
+    Returns:
+        For every method that has been called while instrumentation was enabled, i.e. "Board.get_yield_for_roll",
+        a dictionary with the number of calls ("calls"), the cumulative time in seconds ("time") and the number of
+        exceptions raised ("exceptions")
+    """
+    return {
+        key: {"calls": calls, "time": total, "exceptions": exceptions}
+        for key, (calls, total, exceptions) in _records.items()
+        if calls > 0
+    }
+
+
+@contextmanager
+def instrumented() -> Iterator[Dict[str, Dict]]:
+    """Count the calls to Board, Game and Player inside a with block.
+
+    Enables instrumentation for the block, and disables it again afterwards unless it was already enabled.
+    Yields a dictionary that is filled in with the counters of just the calls made inside the block when it exits,
+    in the same format as ``stats()``. The global counters keep counting as usual.
+
+    Example:
+        >>> with pycatan.instrumented() as block_stats:
+        ...     game.board.get_yield_for_roll(6)
+        >>> block_stats["Board.get_yield_for_roll"]["calls"]
+        1
+    """
+    was_enabled = is_instrumentation_enabled()
+    start = stats()
+    result: Dict[str, Dict] = {}
+    enable_instrumentation()
+    try:
+        yield result
+    finally:
+        if not was_enabled:
+            disable_instrumentation()
+        for key, end in stats().items():
+            before = start.get(key, {"calls": 0, "time": 0.0, "exceptions": 0})
+            if end["calls"] > before["calls"]:
+                result[key] = {k: end[k] - before[k] for k in end}
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 import random
 
 from ._resource import Resource
@@ -13,8 +13,14 @@ class Player:
             resources (Dict[Resource, int]): How many of each resource this player has
             development_cards (Dict[DevelopmentCard, int]): How many of each development card this player has
             connected_harbors (Set[Harbor]): The harbors this player is connected to. Used to determine the valid trades
+
+    Listeners added with ``add_event_listener()`` are sent a PlayerEvent every time resources are added to or
+    removed from the player's hand through the player's methods.
     """
 
+    # Only a tuple of the player's own listeners once one is added, so players without listeners do not pay for them
+    _listeners: Tuple[Callable, ...] = ()
+
     def __init__(self):
         self.resources: Dict[Resource, int] = {res: 0 for res in Resource}
         self.development_cards = {d: 0 for d in DevelopmentCard}
@@ -51,6 +57,8 @@ class Player:
 
         for res, num in resources.items():
             self.resources[res] -= num
+        if self._listeners:
+            self._emit({res: -num for res, num in resources.items()})
 
     def add_resources(self, resources: Dict[Resource, int]):
         """Add some resources to this player's hand.
@@ -60,6 +68,35 @@ class Player:
         """
         for res, num in resources.items():
             self.resources[res] += num
+        if self._listeners:
+            self._emit(dict(resources))
+
+    def add_event_listener(self, listener: Callable):
+        """Call a function with every change made to this player's resources through its methods from now on.
+
+        Copies of the player do not keep the listeners.
+
+        Args:
+            listener: The function to call with each PlayerEvent
+        """
+        self._listeners = self._listeners + (listener,)
+
+    def remove_event_listener(self, listener: Callable):
+        """Stop calling a function that was added with ``add_event_listener``.
+
+        Args:
+            listener: The function to stop calling
+        Raises:
+            ValueError: If the function is not a listener of this player
+        """
+        listeners = list(self._listeners)
+        listeners.remove(listener)
+        self._listeners = tuple(listeners)
+
+    def _emit(self, resources: Dict[Resource, int]):
+        event = PlayerEvent(self, resources)
+        for listener in self._listeners:
+            listener(event)
 
     def get_possible_trades(self) -> List[Dict[Resource, int]]:
         """Get a list of the possible trades for this player.
@@ -129,3 +166,31 @@ class Player:
             if len(resources) > 0
             else None
         )
+
+    def copy(self) -> "Player":
+        """Get a copy of this player that can be changed without changing this player.
+
+        The harbors are shared, since they never change.
+
+        Returns:
+            The copy
+        """
+        player = Player.__new__(Player)
+        player.resources = dict(self.resources)
+        player.development_cards = dict(self.development_cards)
+        player.connected_harbors = set(self.connected_harbors)
+        player.number_played_knights = self.number_played_knights
+        return player
+
+
+class PlayerEvent(NamedTuple):
+    """A change to the resources in a player's hand, sent to the player's event listeners.
+
+    Attributes:
+        player (Player): The player whose hand changed
+        resources (Dict[Resource, int]): How many of each resource were added to the hand, negative for the
+            resources that were removed
+    """
+
+    player: Player
+    resources: Dict[Resource, int]
@@ -0,0 +1,449 @@
+from typing import Dict, FrozenSet, List, Optional
+import random
+import struct
+
+from ._development_card import DevelopmentCard
+from ._player import Player
+from ._resource import Resource
+from ._turn_phase import TurnPhase
+from .board._board import Board
+from .board._board_index import BoardIndex, _path_key
+from .board._building import IntersectionBuilding, PathBuilding
+from .board._building_type import BuildingType
+from .board._coords import Coords
+from .board._harbor import Harbor
+from .board._hex import Hex
+from .board._hex_type import HexType
+from .board._intersection import Intersection
+from .board._path import Path
+
+MAGIC = b"PCG"
+VERSION = 1
+
+# magic, version, number of hexes, harbors, players and cards in the deck, the version of the game (see Game.version)
+_HEADER = struct.Struct("<3s5BI")
+# q, r, hex type, token number (0 for none)
+_HEX = struct.Struct("<2b2B")
+# q and r of the two intersections, resource (_NONE for a generic harbor)
+_HARBOR = struct.Struct("<4bB")
+# robber hex, longest road owner, largest army owner
+_ROBBER_AND_AWARDS = struct.Struct("<3B")
+# resources, development cards, played knights, connected harbors as a bit mask
+_PLAYER = struct.Struct("<%dH%dBBI" % (len(Resource), len(DevelopmentCard)))
+_NONE = 0xFF
+
+_RESOURCES = list(Resource)
+_DEVELOPMENT_CARDS = list(DevelopmentCard)
+_HEX_TYPES = list(HexType)
+_BUILDING_TYPES = list(BuildingType)
+
+# The board index of every layout that has been serialized, keyed by the coordinates of the hexes
+_indices: Dict[FrozenSet[Coords], BoardIndex] = {}
+
+
+def _get_index(hex_coords) -> BoardIndex:
+    key = frozenset(hex_coords)
+    index = _indices.get(key)
+    if index is None:
+        # Only the layout is used, so an empty board with the same hexes is enough
+        board = Board.__new__(Board)
+        board.hexes = {c: None for c in key}
+        board.intersections = {
+            c + offset: None for c in key for offset in Hex.CONNECTED_CORNER_OFFSETS
+        }
+        board.paths = {
+            frozenset([c, c + offset]): None
+            for c in board.intersections
+            for offset in Intersection.CONNECTED_CORNER_OFFSETS
+            if c + offset in board.intersections
+        }
+        index = _indices[key] = BoardIndex(board)
+    return index
+
+
+def _encode_building(building, players: Dict[Player, int]) -> int:
+    # 0 for no building, otherwise the owner's number in the high bits and the building type in the low bits
+    if building is None:
+        return 0
+    if building.owner not in players:
+        raise ValueError("A building is owned by a player who is not in the game")
+    return (players[building.owner] + 1) << 2 | building.building_type.value
+
+
+def game_to_bytes(game) -> bytes:
+    """Serialize a game to bytes. See ``Game.to_bytes()``.
+
+    Args:
+        game: The game to serialize
+    Raises:
+        ValueError: If the game cannot be represented in the format, i.e. if a building is owned by a player
+            who is not in the game
+    Returns:
+        The serialized game
+    """
+    board = game.board
+    index = _get_index(board.hexes)
+    players = {p: i for i, p in enumerate(game.players)}
+    harbor_keys = sorted(board.harbors, key=_path_key)
+    harbor_bits = {board.harbors[k]: 1 << i for i, k in enumerate(harbor_keys)}
+    try:
+        parts = [
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(index.hex_coords),
+                len(harbor_keys),
+                len(game.players),
+                len(game.development_card_deck),
+                game.board.version,
+            ),
+        ]
+        for coords in index.hex_coords:
+            h = board.hexes[coords]
+            parts.append(
+                _HEX.pack(
+                    coords.q,
+                    coords.r,
+                    h.hex_type.value,
+                    0 if h.token_number is None else h.token_number,
+                )
+            )
+        for key in harbor_keys:
+            first, second = sorted(key, key=lambda c: (c.q, c.r))
+            resource = board.harbors[key].resource
+            parts.append(
+                _HARBOR.pack(
+                    first.q,
+                    first.r,
+                    second.q,
+                    second.r,
+                    _NONE if resource is None else resource.value,
+                )
+            )
+        parts.append(
+            _ROBBER_AND_AWARDS.pack(
+                index.hex_indices[board.robber],
+                players.get(game.longest_road_owner, _NONE),
+                players.get(game.largest_army_owner, _NONE),
+            )
+        )
+        parts.append(
+            bytes(
+                _encode_building(board.intersections[c].building, players)
+                for c in index.intersection_coords
+            )
+        )
+        parts.append(
+            bytes(
+                _encode_building(board.paths[c].building, players)
+                for c in index.path_coords
+            )
+        )
+        for player in game.players:
+            mask = 0
+            for harbor in player.connected_harbors:
+                mask |= harbor_bits[harbor]
+            parts.append(
+                _PLAYER.pack(
+                    *[player.resources[r] for r in _RESOURCES],
+                    *[player.development_cards[d] for d in _DEVELOPMENT_CARDS],
+                    player.number_played_knights,
+                    mask,
+                )
+            )
+        parts.append(bytes(card.value for card in game.development_card_deck))
+    except (struct.error, KeyError) as e:
+        raise ValueError("The game cannot be serialized: %s" % e) from e
+    return b"".join(parts)
+
+
+def _decode_building(value: int, players: List[Player], building_class, coords):
+    if value == 0:
+        return None
+    return building_class(players[(value >> 2) - 1], _BUILDING_TYPES[value & 3], coords)
+
+
+def game_from_bytes(cls, data: bytes):
+    """Build a game from the bytes returned by ``game_to_bytes``. See ``Game.from_bytes()``.
+
+    Args:
+        cls: The class of the game to create
+        data: The serialized game
+    Raises:
+        ValueError: If the data is not a serialized game
+    Returns:
+        The game
+    """
+    try:
+        (
+            magic,
+            version,
+            num_hexes,
+            num_harbors,
+            num_players,
+            deck_size,
+            game_version,
+        ) = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("The data is not a version %d serialized game" % VERSION)
+        offset = _HEADER.size
+        hexes = []
+        for _ in range(num_hexes):
+            q, r, hex_type, token = _HEX.unpack_from(data, offset)
+            offset += _HEX.size
+            hexes.append(Hex(Coords(q, r), _HEX_TYPES[hex_type], token or None))
+        harbors = []
+        for _ in range(num_harbors):
+            q1, r1, q2, r2, resource = _HARBOR.unpack_from(data, offset)
+            offset += _HARBOR.size
+            harbors.append(
+                Harbor(
+                    {Coords(q1, r1), Coords(q2, r2)},
+                    None if resource == _NONE else _RESOURCES[resource],
+                )
+            )
+        index = _get_index(h.coords for h in hexes)
+        robber, longest_road, largest_army = _ROBBER_AND_AWARDS.unpack_from(
+            data, offset
+        )
+        offset += _ROBBER_AND_AWARDS.size
+
+        players = [Player() for _ in range(num_players)]
+        board = Board.__new__(Board)
+        board.hexes = {h.coords: h for h in hexes}
+        board.harbors = {frozenset(h.path_coords): h for h in harbors}
+        board.robber = index.hex_coords[robber]
+        end = offset + len(index.intersection_coords)
+        board.intersections = {
+            c: Intersection(
+                c, _decode_building(value, players, IntersectionBuilding, c)
+            )
+            for c, value in zip(index.intersection_coords, data[offset:end])
+        }
+        offset = end
+        end = offset + len(index.path_coords)
+        board.paths = {}
+        for key, value in zip(index.path_coords, data[offset:end]):
+            path_coords = set(key)
+            board.paths[key] = Path(
+                path_coords, _decode_building(value, players, PathBuilding, path_coords)
+            )
+        offset = end
+
+        harbor_list = [board.harbors[k] for k in sorted(board.harbors, key=_path_key)]
+        num_resources = len(_RESOURCES)
+        for player in players:
+            values = _PLAYER.unpack_from(data, offset)
+            offset += _PLAYER.size
+            player.resources = dict(zip(_RESOURCES, values[:num_resources]))
+            player.development_cards = dict(
+                zip(_DEVELOPMENT_CARDS, values[num_resources:-2])
+            )
+            player.number_played_knights = values[-2]
+            player.connected_harbors = {
+                h for i, h in enumerate(harbor_list) if values[-1] >> i & 1
+            }
+
+        end = offset + deck_size
+        if len(data) != end:
+            raise ValueError("The data is not the length of the game it describes")
+        game = cls.__new__(cls)
+        game.board = board
+        game.players = players
+        game.longest_road_owner = _get_player(players, longest_road)
+        game.largest_army_owner = _get_player(players, largest_army)
+        game._listeners = []
+        game.development_card_deck = [_DEVELOPMENT_CARDS[v] for v in data[offset:end]]
+        game._set_version(game_version)
+    except (struct.error, IndexError, KeyError) as e:
+        raise ValueError("The data is not a serialized game: %s" % e) from e
+    return game
+
+
+def _get_player(players: List[Player], value: int) -> Optional[Player]:
+    return None if value == _NONE else players[value]
+
+
+MACHINE_MAGIC = b"PCM"
+MACHINE_VERSION = 1
+
+# magic, version, victory points to win (_NO_LIMIT for none), max turns (_NO_LIMIT for none), phase, phase after
+# the robber, turn number, current player, last roll (0 for none), winner, setup step, last settlement (_NO_LIMIT for
+# none), free roads, free resources, whether a card was played, number of discards and steal candidates, size of the game
+_MACHINE = struct.Struct("<3sBIIBBIBBBBIBBBBBI")
+# bought development cards
+_BOUGHT_CARDS = struct.Struct("<%dB" % len(DevelopmentCard))
+# settlements, cities and roads of a player
+_PIECES = struct.Struct("<3B")
+# player, resources left to discard
+_DISCARD = struct.Struct("<BB")
+# The Mersenne Twister state of the random generator: version, 624 words and the position, and the next gaussian
+_RNG = struct.Struct("<B625I?d")
+_NO_LIMIT = 0xFFFFFFFF
+
+_PHASES = list(TurnPhase)
+
+
+def _encode_limit(value: Optional[int]) -> int:
+    return _NO_LIMIT if value is None else value
+
+
+def _decode_limit(value: int) -> Optional[int]:
+    return None if value == _NO_LIMIT else value
+
+
+def machine_to_bytes(machine) -> bytes:
+    """Serialize a turn machine and its game to bytes. See ``TurnMachine.to_bytes()``.
+
+    Args:
+        machine: The machine to serialize
+    Raises:
+        ValueError: If the machine cannot be represented in the format
+    Returns:
+        The serialized machine
+    """
+    game = machine.game
+    game_data = game_to_bytes(game)
+    version, state, gauss = machine._rng.getstate()
+    winner = machine.winner
+    try:
+        parts = [
+            _MACHINE.pack(
+                MACHINE_MAGIC,
+                MACHINE_VERSION,
+                _encode_limit(machine.victory_points_to_win),
+                _encode_limit(machine.max_turns),
+                machine.phase.value,
+                machine._robber_return_phase.value,
+                machine.turn_number,
+                machine.current_player_index,
+                machine.last_roll or 0,
+                _NONE if winner is None else game.players.index(winner),
+                machine._setup_step,
+                _encode_limit(machine._last_settlement),
+                machine._free_roads,
+                machine._free_resources,
+                machine._played_card,
+                len(machine._discards),
+                len(machine._steal_candidates),
+                len(game_data),
+            ),
+            _BOUGHT_CARDS.pack(*[machine._bought_cards[d] for d in _DEVELOPMENT_CARDS]),
+        ]
+        for i in range(len(game.players)):
+            parts.append(
+                _PIECES.pack(
+                    machine._num_settlements[i],
+                    machine._num_cities[i],
+                    machine._num_roads[i],
+                )
+            )
+        for player, count in machine._discards:
+            parts.append(_DISCARD.pack(player, count))
+        parts.append(bytes(machine._steal_candidates))
+        parts.append(_RNG.pack(version, *state, gauss is not None, gauss or 0.0))
+    except (struct.error, ValueError) as e:
+        raise ValueError("The turn machine cannot be serialized: %s" % e) from e
+    parts.append(game_data)
+    return b"".join(parts)
+
+
+def machine_from_bytes(cls, game_class, data: bytes):
+    """Build a turn machine from the bytes returned by ``machine_to_bytes``. See ``TurnMachine.from_bytes()``.
+
+    Args:
+        cls: The class of the machine to create
+        game_class: The class of the machine's game
+        data: The serialized machine
+    Raises:
+        ValueError: If the data is not a serialized turn machine
+    Returns:
+        The machine
+    """
+    try:
+        (
+            magic,
+            version,
+            victory_points_to_win,
+            max_turns,
+            phase,
+            robber_return_phase,
+            turn_number,
+            current_player,
+            last_roll,
+            winner,
+            setup_step,
+            last_settlement,
+            free_roads,
+            free_resources,
+            played_card,
+            num_discards,
+            num_steal_candidates,
+            game_size,
+        ) = _MACHINE.unpack_from(data, 0)
+        if magic != MACHINE_MAGIC or version != MACHINE_VERSION:
+            raise ValueError(
+                "The data is not a version %d serialized turn machine" % MACHINE_VERSION
+            )
+        offset = _MACHINE.size
+        bought_cards = _BOUGHT_CARDS.unpack_from(data, offset)
+        offset += _BOUGHT_CARDS.size
+        if len(data) < game_size:
+            raise ValueError("The data is shorter than the game it contains")
+        game_start = len(data) - game_size
+        game = game_from_bytes(game_class, data[game_start:])
+        num_players = len(game.players)
+        pieces = []
+        for _ in range(num_players):
+            pieces.append(_PIECES.unpack_from(data, offset))
+            offset += _PIECES.size
+        discards = []
+        for _ in range(num_discards):
+            discards.append(list(_DISCARD.unpack_from(data, offset)))
+            offset += _DISCARD.size
+        end = offset + num_steal_candidates
+        steal_candidates = list(data[offset:end])
+        offset = end
+        rng_values = _RNG.unpack_from(data, offset)
+        offset += _RNG.size
+        if offset != game_start:
+            raise ValueError("The data is not the length of the machine it describes")
+        machine = cls.__new__(cls)
+        machine.game = game
+        machine.victory_points_to_win = _decode_limit(victory_points_to_win)
+        machine.max_turns = _decode_limit(max_turns)
+        # The cached index of the layout is the same as an index of the board itself
+        machine._set_board_index(_get_index(game.board.hexes))
+        machine._rng = random.Random()
+        machine._rng.setstate(
+            (
+                rng_values[0],
+                tuple(rng_values[1:-2]),
+                rng_values[-1] if rng_values[-2] else None,
+            )
+        )
+        machine._num_settlements = [p[0] for p in pieces]
+        machine._num_cities = [p[1] for p in pieces]
+        machine._num_roads = [p[2] for p in pieces]
+        machine._setup_order = list(range(num_players)) + list(
+            reversed(range(num_players))
+        )
+        machine._setup_step = setup_step
+        machine._last_settlement = _decode_limit(last_settlement)
+        machine._discards = discards
+        machine._steal_candidates = steal_candidates
+        machine._robber_return_phase = _PHASES[robber_return_phase]
+        machine._free_roads = free_roads
+        machine._free_resources = free_resources
+        machine._bought_cards = dict(zip(_DEVELOPMENT_CARDS, bought_cards))
+        machine._played_card = bool(played_card)
+        machine.phase = _PHASES[phase]
+        machine.turn_number = turn_number
+        machine.current_player_index = current_player
+        machine.last_roll = last_roll or None
+        machine.winner = _get_player(game.players, winner)
+        machine._legal = None
+        machine._legal_set = None
+    except (struct.error, IndexError, TypeError) as e:
+        raise ValueError("The data is not a serialized turn machine: %s" % e) from e
+    return machine
@@ -0,0 +1,666 @@
+from typing import List, Optional, Set, Tuple
+import random
+
+from ._game import Game
+from ._player import Player
+from ._resource import Resource
+from ._development_card import DevelopmentCard
+from ._action_type import ActionType
+from ._action_space import ActionSpace
+from ._turn_phase import TurnPhase
+from ._serialization import machine_from_bytes, machine_to_bytes
+from .board._board_index import BoardIndex
+from .board._building_type import BuildingType
+
+_RESOURCES = list(Resource)
+
+_PLAYABLE_CARDS = {
+    ActionType.PLAY_KNIGHT: DevelopmentCard.KNIGHT,
+    ActionType.PLAY_ROAD_BUILDING: DevelopmentCard.ROAD_BUILDING,
+    ActionType.PLAY_YEAR_OF_PLENTY: DevelopmentCard.YEAR_OF_PLENTY,
+    ActionType.PLAY_MONOPOLY: DevelopmentCard.MONOPOLY,
+}
+
+
+class TurnMachine:
+    """Runs the turns of a game of Catan, from the setup phase until a player wins.
+
+    Keeps track of whose turn it is and what phase the turn is in, and only allows the actions that are
+    legal under the base game rules. Actions are integers from the machine's action space, so a game can
+    be played by repeatedly picking one of ``legal_actions()`` and passing it to ``step()``.
+    Everything that does not need a decision (rolling the yields, stealing from the only player on a hex,
+    moving to the next player after the setup, etc) is done inside ``step()``.
+
+    Uses the game's methods to change the game state, so the game can still be inspected as usual.
+    Trades between players are not handled, only trades with the bank.
+
+    Args:
+        game: The game to run. Nothing should have been built on its board yet
+        victory_points_to_win: How many victory points a player needs to win. Defaults to 10
+        max_turns: The number of turns after which the game ends without a winner, or None to play until someone wins.
+            Defaults to None
+        rng: The random generator used to roll the dice, steal resources and shuffle the development card deck.
+            If None, a new unseeded generator is used and the deck is left as it is. Defaults to None
+
+    Attributes:
+        game (Game): The game being played
+        board_index (BoardIndex): The numbering of the board used by the action space
+        action_space (ActionSpace): The numbering of all the actions
+        phase (TurnPhase): The current phase of the turn
+        turn_number (int): The current turn, starting at 1 after the setup phase. 0 during the setup phase
+        current_player_index (int): The index of the player whose turn it is
+        last_roll (int): The last number rolled, or None if the dice have not been rolled yet
+        winner (Player): The player who won the game, or None if no one has won yet
+    """
+
+    MAX_SETTLEMENTS = 5
+    MAX_CITIES = 4
+    MAX_ROADS = 15
+    MAX_HAND_SIZE = 7
+
+    def __init__(
+        self,
+        game: Game,
+        victory_points_to_win: Optional[int] = 10,
+        max_turns: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.game = game
+        self.victory_points_to_win = victory_points_to_win
+        self.max_turns = max_turns
+        self._rng = rng if rng is not None else random.Random()
+        if rng is not None:
+            # Put the deck in a known order first so that the same seed always gives the same deck
+            game.development_card_deck.sort(key=lambda c: c.value)
+            self._rng.shuffle(game.development_card_deck)
+
+        self._set_board_index(BoardIndex(game.board))
+
+        num_players = len(game.players)
+        self._num_settlements = [0] * num_players
+        self._num_cities = [0] * num_players
+        self._num_roads = [0] * num_players
+        self._setup_order = list(range(num_players)) + list(
+            reversed(range(num_players))
+        )
+        self._setup_step = 0
+        self._last_settlement = None
+        self._discards: List[List[int]] = []
+        self._steal_candidates: List[int] = []
+        self._robber_return_phase = TurnPhase.MAIN
+        self._free_roads = 0
+        self._free_resources = 0
+        self._bought_cards = {d: 0 for d in DevelopmentCard}
+        self._played_card = False
+        self._legal: Optional[Tuple[int, ...]] = None
+        self._legal_set: Optional[Set[int]] = None
+
+        self.phase = TurnPhase.SETUP_SETTLEMENT
+        self.turn_number = 0
+        self.current_player_index = 0
+        self.last_roll = None
+        self.winner = None
+
+    def _set_board_index(self, board_index: BoardIndex):
+        board = self.game.board
+        self.board_index = board_index
+        self.action_space = ActionSpace(board_index, len(self.game.players))
+        self._hexes = [board.hexes[c] for c in board_index.hex_coords]
+        self._intersections = [
+            board.intersections[c] for c in board_index.intersection_coords
+        ]
+        self._paths = [board.paths[c] for c in board_index.path_coords]
+
+    @property
+    def current_player(self) -> Player:
+        """The player whose turn it is."""
+        return self.game.players[self.current_player_index]
+
+    @property
+    def acting_player_index(self) -> int:
+        """The index of the player who has to choose the next action.
+
+        This is the current player, except when other players have to discard resources after a 7 is rolled.
+        """
+        if self.phase is TurnPhase.DISCARD:
+            return self._discards[0][0]
+        return self.current_player_index
+
+    @property
+    def is_over(self) -> bool:
+        """Whether the game has finished."""
+        return self.phase is TurnPhase.GAME_OVER
+
+    def legal_actions(self) -> Tuple[int, ...]:
+        """Get all the actions that can be taken right now.
+
+        Returns:
+            The legal actions, in increasing order. Empty if the game is over
+        """
+        if self._legal is None:
+            self._legal = tuple(self._compute_legal_actions())
+        return self._legal
+
+    def get_legal_action_mask(self, out=None):
+        """Get which of the actions in the action space can be taken right now, as one byte per action.
+
+        The mask is written straight from the legal actions, without building any intermediate sets.
+
+        Args:
+            out: A writable buffer of ``action_space.size`` bytes to write the mask into,
+                i.e. a bytearray or a row of a numpy bool/uint8 array. If None, a new bytearray is created
+        Raises:
+            ValueError: If out is not the size of the action space
+        Returns:
+            The mask, with 1 for every legal action and 0 for every other action
+        """
+        size = self.action_space.size
+        if out is None:
+            out = bytearray(size)
+        mask = memoryview(out).cast("B")
+        if len(mask) != size:
+            raise ValueError(
+                "The mask must have %d entries, received %d" % (size, len(mask))
+            )
+        mask[:] = bytes(size)
+        for action in self.legal_actions():
+            mask[action] = 1
+        return out
+
+    def is_legal(self, action: int) -> bool:
+        """Check whether an action can be taken right now.
+
+        Args:
+            action: The action
+        Returns:
+            Whether the action is legal
+        """
+        if self._legal_set is None:
+            self._legal_set = set(self.legal_actions())
+        return action in self._legal_set
+
+    def invalidate(self):
+        """Forget the cached legal actions.
+
+        Call this after changing the game directly instead of through ``step()``, i.e. giving a player resources.
+        """
+        self._legal = None
+        self._legal_set = None
+
+    def copy(self, rng: Optional[random.Random] = None) -> "TurnMachine":
+        """Get a copy of this machine and its game that can be played without changing this one.
+
+        Uses ``Game.copy()``, and shares the board index and action space, so it is cheap enough to call
+        for every playout of a search.
+
+        Args:
+            rng: The random generator of the copy. Defaults to a generator in the same state as this machine's,
+                so the copy rolls the same dice as this machine would
+        Returns:
+            The copy
+        """
+        machine = TurnMachine.__new__(TurnMachine)
+        machine.game = self.game.copy()
+        machine.victory_points_to_win = self.victory_points_to_win
+        machine.max_turns = self.max_turns
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self._rng.getstate())
+        machine._rng = rng
+        machine.board_index = self.board_index
+        machine.action_space = self.action_space
+        board = machine.game.board
+        machine._hexes = self._hexes
+        machine._intersections = [
+            board.intersections[c] for c in self.board_index.intersection_coords
+        ]
+        machine._paths = [board.paths[c] for c in self.board_index.path_coords]
+        machine._num_settlements = list(self._num_settlements)
+        machine._num_cities = list(self._num_cities)
+        machine._num_roads = list(self._num_roads)
+        machine._setup_order = self._setup_order
+        machine._setup_step = self._setup_step
+        machine._last_settlement = self._last_settlement
+        machine._discards = [list(d) for d in self._discards]
+        machine._steal_candidates = list(self._steal_candidates)
+        machine._robber_return_phase = self._robber_return_phase
+        machine._free_roads = self._free_roads
+        machine._free_resources = self._free_resources
+        machine._bought_cards = dict(self._bought_cards)
+        machine._played_card = self._played_card
+        # The cached actions are never changed, only replaced, so they can be shared
+        machine._legal = self._legal
+        machine._legal_set = self._legal_set
+        machine.phase = self.phase
+        machine.turn_number = self.turn_number
+        machine.current_player_index = self.current_player_index
+        machine.last_roll = self.last_roll
+        machine.winner = (
+            None
+            if self.winner is None
+            else machine.game.players[self.game.players.index(self.winner)]
+        )
+        return machine
+
+    def to_bytes(self) -> bytes:
+        """Serialize this machine and its game to a compact binary format, i.e. to store an idle game on disk.
+
+        The state of the turn, the state of the random generator (so the restored machine rolls the same dice)
+        and the game (see ``Game.to_bytes()``) are packed with ``struct``. A machine on the standard board is
+        about 3KB, most of which is the random generator.
+
+        Raises:
+            ValueError: If the machine cannot be serialized
+        Returns:
+            The serialized machine
+        """
+        return machine_to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TurnMachine":
+        """Create a machine from the bytes returned by ``to_bytes()``.
+
+        Args:
+            data: The serialized machine
+        Raises:
+            ValueError: If the data is not a serialized turn machine
+        Returns:
+            The machine
+        """
+        return machine_from_bytes(cls, Game, data)
+
+    def determinize(self, player_index: int, rng: Optional[random.Random] = None):
+        """Replace what a player cannot see with a random guess that is consistent with what they can see.
+
+        The development cards in the other players' hands are shuffled together with the development card deck
+        and dealt back out, so every player keeps the same number of cards. Resources are not changed, since
+        every resource a player gets or spends is public.
+        Should only be called on a copy of the machine, i.e. when searching from the point of view of a player.
+
+        Args:
+            player_index: The index of the player whose point of view to keep
+            rng: The random generator used to shuffle the cards. Defaults to the machine's random generator
+        """
+        rng = rng if rng is not None else self._rng
+        game = self.game
+        others = [p for i, p in enumerate(game.players) if i != player_index]
+        pool = list(game.development_card_deck)
+        for player in others:
+            for card, amount in player.development_cards.items():
+                pool.extend([card] * amount)
+        rng.shuffle(pool)
+        for player in others:
+            hand = {d: 0 for d in DevelopmentCard}
+            for _ in range(sum(player.development_cards.values())):
+                hand[pool.pop()] += 1
+            player.development_cards = hand
+        game.development_card_deck = pool
+        if self.current_player_index != player_index:
+            # The cards bought this turn have to be among the current player's new cards
+            hand = self.current_player.development_cards
+            for card in self._bought_cards:
+                self._bought_cards[card] = min(self._bought_cards[card], hand[card])
+        self.invalidate()
+
+    def step(self, action: int):
+        """Take an action and advance the game until the next decision is needed.
+
+        Args:
+            action: The action to take. Must be one of the legal actions
+        Raises:
+            ValueError: If the action is not legal right now
+        """
+        if not self.is_legal(action):
+            raise ValueError("Action %d is not legal right now" % action)
+        self.invalidate()
+        action_type, argument = self.action_space.decode(action)
+        getattr(self, "_step_" + action_type.name.lower())(argument)
+        if self.phase is not TurnPhase.GAME_OVER and self.turn_number > 0:
+            index = self.current_player_index
+            if self.get_victory_points(index) >= self.victory_points_to_win:
+                self.winner = self.game.players[index]
+                self.phase = TurnPhase.GAME_OVER
+
+    def get_victory_points(self, player_index: int) -> int:
+        """Get the number of victory points a player has, including hidden victory point cards.
+
+        Same as Game.get_victory_points, but uses the machine's own building counts so it does not need
+        to look through the board.
+
+        Args:
+            player_index: The index of the player
+        Returns:
+            The number of victory points
+        """
+        player = self.game.players[player_index]
+        points = (
+            self._num_settlements[player_index]
+            + 2 * self._num_cities[player_index]
+            + player.development_cards[DevelopmentCard.VICTORY_POINT]
+        )
+        if player is self.game.longest_road_owner:
+            points += 2
+        if player is self.game.largest_army_owner:
+            points += 2
+        return points
+
+    def _compute_legal_actions(self) -> List[int]:
+        offsets = self.action_space.offsets
+        phase = self.phase
+        player = self.game.players[self.acting_player_index]
+        if phase is TurnPhase.MAIN:
+            return self._main_actions(player)
+        if phase is TurnPhase.ROLL:
+            actions = [offsets[ActionType.ROLL]]
+            if self._can_play(player, DevelopmentCard.KNIGHT):
+                actions.append(offsets[ActionType.PLAY_KNIGHT])
+            return actions
+        if phase is TurnPhase.SETUP_SETTLEMENT:
+            offset = offsets[ActionType.BUILD_SETTLEMENT]
+            return [offset + i for i in self._settlement_spots(player, False)]
+        if phase is TurnPhase.SETUP_ROAD:
+            offset = offsets[ActionType.BUILD_ROAD]
+            return [
+                offset + p
+                for p in self.board_index.intersection_paths[self._last_settlement]
+                if self._paths[p].building is None
+            ]
+        if phase is TurnPhase.ROAD_BUILDING:
+            offset = offsets[ActionType.BUILD_ROAD]
+            return [offset + p for p in self._road_spots(player)]
+        if phase is TurnPhase.DISCARD:
+            offset = offsets[ActionType.DISCARD]
+            return [offset + r.value for r in _RESOURCES if player.resources[r] > 0]
+        if phase is TurnPhase.MOVE_ROBBER:
+            offset = offsets[ActionType.MOVE_ROBBER]
+            robber = self.board_index.hex_indices[self.game.board.robber]
+            return [offset + h for h in range(len(self._hexes)) if h != robber]
+        if phase is TurnPhase.STEAL:
+            offset = offsets[ActionType.STEAL]
+            return [offset + p for p in self._steal_candidates]
+        if phase is TurnPhase.YEAR_OF_PLENTY or phase is TurnPhase.MONOPOLY:
+            offset = offsets[ActionType.CHOOSE_RESOURCE]
+            return [offset + r.value for r in _RESOURCES]
+        return []
+
+    def _main_actions(self, player: Player) -> List[int]:
+        offsets = self.action_space.offsets
+        index = self.current_player_index
+        resources = player.resources
+        actions = [offsets[ActionType.END_TURN]]
+        if self._num_settlements[index] < TurnMachine.MAX_SETTLEMENTS and (
+            player.has_resources(BuildingType.SETTLEMENT.get_required_resources())
+        ):
+            offset = offsets[ActionType.BUILD_SETTLEMENT]
+            actions += [offset + i for i in self._settlement_spots(player, True)]
+        if self._num_cities[index] < TurnMachine.MAX_CITIES and (
+            player.has_resources(BuildingType.CITY.get_required_resources())
+        ):
+            offset = offsets[ActionType.BUILD_CITY]
+            for i, intersection in enumerate(self._intersections):
+                building = intersection.building
+                if (
+                    building is not None
+                    and building.owner is player
+                    and building.building_type is BuildingType.SETTLEMENT
+                ):
+                    actions.append(offset + i)
+        if self._num_roads[index] < TurnMachine.MAX_ROADS and (
+            player.has_resources(BuildingType.ROAD.get_required_resources())
+        ):
+            offset = offsets[ActionType.BUILD_ROAD]
+            actions += [offset + p for p in self._road_spots(player)]
+        if len(self.game.development_card_deck) > 0 and player.has_resources(
+            DevelopmentCard.get_required_resources()
+        ):
+            actions.append(offsets[ActionType.BUILD_DEVELOPMENT_CARD])
+        for action_type, card in _PLAYABLE_CARDS.items():
+            if self._can_play(player, card):
+                actions.append(offsets[action_type])
+        offset = offsets[ActionType.TRADE]
+        rates = self._get_trade_rates(player)
+        for give in _RESOURCES:
+            if resources[give] >= rates[give.value]:
+                offset_give = offset + give.value * len(_RESOURCES)
+                actions += [
+                    offset_give + get.value for get in _RESOURCES if get != give
+                ]
+        return actions
+
+    def _can_play(self, player: Player, card: DevelopmentCard) -> bool:
+        return (
+            not self._played_card
+            and player.development_cards[card] - self._bought_cards[card] > 0
+        )
+
+    def _settlement_spots(self, player: Player, ensure_connected: bool) -> List[int]:
+        intersections = self._intersections
+        paths = self._paths
+        neighbors = self.board_index.intersection_neighbors
+        intersection_paths = self.board_index.intersection_paths
+        spots = []
+        for i, intersection in enumerate(intersections):
+            if intersection.building is not None:
+                continue
+            if any(intersections[n].building is not None for n in neighbors[i]):
+                continue
+            if ensure_connected and not any(
+                paths[p].building is not None and paths[p].building.owner is player
+                for p in intersection_paths[i]
+            ):
+                continue
+            spots.append(i)
+        return spots
+
+    def _road_spots(self, player: Player) -> List[int]:
+        intersections = self._intersections
+        paths = self._paths
+        intersection_paths = self.board_index.intersection_paths
+        spots = []
+        for p, (first, second) in enumerate(self.board_index.path_intersections):
+            if paths[p].building is not None:
+                continue
+            for i in (first, second):
+                building = intersections[i].building
+                if building is not None:
+                    if building.owner is player:
+                        spots.append(p)
+                        break
+                    # Enemy buildings cut off the roads going through them
+                    continue
+                if any(
+                    paths[q].building is not None and paths[q].building.owner is player
+                    for q in intersection_paths[i]
+                ):
+                    spots.append(p)
+                    break
+        return spots
+
+    def _get_trade_rates(self, player: Player) -> List[int]:
+        rates = [4] * len(_RESOURCES)
+        for harbor in player.connected_harbors:
+            if harbor.resource is None:
+                rates = [min(r, 3) for r in rates]
+        for harbor in player.connected_harbors:
+            if harbor.resource is not None:
+                rates[harbor.resource.value] = 2
+        return rates
+
+    def _steal(self, thief: Player, victim: Player):
+        total = sum(victim.resources.values())
+        if total == 0:
+            return
+        n = self._rng.randrange(total)
+        for res in _RESOURCES:
+            n -= victim.resources[res]
+            if n < 0:
+                self.game.transfer_resources(victim, thief, {res: 1})
+                return
+
+    def _end_robber(self):
+        self.phase = self._robber_return_phase
+
+    def _step_roll(self, argument: int):
+        roll = self._rng.randint(1, 6) + self._rng.randint(1, 6)
+        self.last_roll = roll
+        if roll != 7:
+            self.game.add_yield_for_roll(roll)
+            self.phase = TurnPhase.MAIN
+            return
+        self._robber_return_phase = TurnPhase.MAIN
+        self._discards = []
+        for i, p in enumerate(self.game.players):
+            total = sum(p.resources.values())
+            if total > TurnMachine.MAX_HAND_SIZE:
+                self._discards.append([i, total // 2])
+        self.phase = TurnPhase.DISCARD if self._discards else TurnPhase.MOVE_ROBBER
+
+    def _step_end_turn(self, argument: int):
+        self.current_player_index = (self.current_player_index + 1) % len(
+            self.game.players
+        )
+        self.turn_number += 1
+        self._bought_cards = {d: 0 for d in DevelopmentCard}
+        self._played_card = False
+        if self.max_turns is not None and self.turn_number > self.max_turns:
+            self.phase = TurnPhase.GAME_OVER
+        else:
+            self.phase = TurnPhase.ROLL
+
+    def _step_build_settlement(self, argument: int):
+        player = self.current_player
+        coords = self.board_index.intersection_coords[argument]
+        setup = self.phase is TurnPhase.SETUP_SETTLEMENT
+        self.game.build_settlement(
+            player, coords, cost_resources=not setup, ensure_connected=False
+        )
+        self._num_settlements[self.current_player_index] += 1
+        if setup:
+            # The second settlement gives the player the resources around it
+            if self._setup_step >= len(self.game.players):
+                self.game.add_resources(
+                    player, self.game.board.get_hex_resources_for_intersection(coords)
+                )
+            self._last_settlement = argument
+            self.phase = TurnPhase.SETUP_ROAD
+
+    def _step_build_city(self, argument: int):
+        self.game.upgrade_settlement_to_city(
+            self.current_player, self.board_index.intersection_coords[argument]
+        )
+        self._num_settlements[self.current_player_index] -= 1
+        self._num_cities[self.current_player_index] += 1
+
+    def _step_build_road(self, argument: int):
+        free = self.phase is not TurnPhase.MAIN
+        self.game.build_road(
+            self.current_player,
+            self.board_index.path_coords[argument],
+            cost_resources=not free,
+            ensure_connected=False,
+        )
+        self._num_roads[self.current_player_index] += 1
+        if self.phase is TurnPhase.SETUP_ROAD:
+            self._setup_step += 1
+            if self._setup_step < len(self._setup_order):
+                self.current_player_index = self._setup_order[self._setup_step]
+                self.phase = TurnPhase.SETUP_SETTLEMENT
+            else:
+                self.current_player_index = 0
+                self.turn_number = 1
+                self.phase = TurnPhase.ROLL
+        elif self.phase is TurnPhase.ROAD_BUILDING:
+            self._free_roads -= 1
+            self._check_road_building_finished()
+
+    def _check_road_building_finished(self):
+        if (
+            self._free_roads == 0
+            or self._num_roads[self.current_player_index] >= TurnMachine.MAX_ROADS
+            or not self._road_spots(self.current_player)
+        ):
+            self.phase = TurnPhase.MAIN
+
+    def _step_build_development_card(self, argument: int):
+        card = self.game.build_development_card(self.current_player)
+        self._bought_cards[card] += 1
+
+    def _play(self, card: DevelopmentCard):
+        self.game.play_development_card(self.current_player, card)
+        self._played_card = True
+
+    def _step_play_knight(self, argument: int):
+        self._play(DevelopmentCard.KNIGHT)
+        self._robber_return_phase = self.phase
+        self.phase = TurnPhase.MOVE_ROBBER
+
+    def _step_play_road_building(self, argument: int):
+        self._play(DevelopmentCard.ROAD_BUILDING)
+        self._free_roads = 2
+        self.phase = TurnPhase.ROAD_BUILDING
+        self._check_road_building_finished()
+
+    def _step_play_year_of_plenty(self, argument: int):
+        self._play(DevelopmentCard.YEAR_OF_PLENTY)
+        self._free_resources = 2
+        self.phase = TurnPhase.YEAR_OF_PLENTY
+
+    def _step_play_monopoly(self, argument: int):
+        self._play(DevelopmentCard.MONOPOLY)
+        self.phase = TurnPhase.MONOPOLY
+
+    def _step_choose_resource(self, argument: int):
+        player = self.current_player
+        res = _RESOURCES[argument]
+        if self.phase is TurnPhase.YEAR_OF_PLENTY:
+            self.game.add_resources(player, {res: 1})
+            self._free_resources -= 1
+            if self._free_resources == 0:
+                self.phase = TurnPhase.MAIN
+            return
+        for other in self.game.players:
+            if other is not player:
+                amount = other.resources[res]
+                if amount > 0:
+                    self.game.transfer_resources(other, player, {res: amount})
+        self.phase = TurnPhase.MAIN
+
+    def _step_discard(self, argument: int):
+        self.game.remove_resources(
+            self.game.players[self._discards[0][0]], {_RESOURCES[argument]: 1}
+        )
+        self._discards[0][1] -= 1
+        if self._discards[0][1] == 0:
+            self._discards.pop(0)
+            if not self._discards:
+                self.phase = TurnPhase.MOVE_ROBBER
+
+    def _step_move_robber(self, argument: int):
+        self.game.move_robber(self.board_index.hex_coords[argument])
+        candidates = set()
+        for i in self.board_index.hex_intersections[argument]:
+            building = self._intersections[i].building
+            if building is not None and building.owner is not self.current_player:
+                candidates.add(self.game.players.index(building.owner))
+        self._steal_candidates = sorted(
+            c for c in candidates if sum(self.game.players[c].resources.values()) > 0
+        )
+        if len(self._steal_candidates) == 0:
+            self._end_robber()
+        elif len(self._steal_candidates) == 1:
+            self._step_steal(self._steal_candidates[0])
+        else:
+            self.phase = TurnPhase.STEAL
+
+    def _step_steal(self, argument: int):
+        self._steal(self.current_player, self.game.players[argument])
+        self._steal_candidates = []
+        self._end_robber()
+
+    def _step_trade(self, argument: int):
+        player = self.current_player
+        give = _RESOURCES[argument // len(_RESOURCES)]
+        get = _RESOURCES[argument % len(_RESOURCES)]
+        rate = self._get_trade_rates(player)[give.value]
+        self.game.remove_resources(player, {give: rate})
+        self.game.add_resources(player, {get: 1})
@@ -0,0 +1,28 @@
+from enum import Enum
+
+
+class TurnPhase(Enum):
+    """The different phases a turn can be in, i.e. which kind of action the game is waiting for."""
+
+    SETUP_SETTLEMENT = 0
+    """A player is placing one of their two starting settlements"""
+    SETUP_ROAD = 1
+    """A player is placing the road attached to the settlement they just placed"""
+    ROLL = 2
+    """The start of a player's turn, where they may roll the dice or play a knight card"""
+    DISCARD = 3
+    """A 7 was rolled and a player with more than 7 resources must discard half of them"""
+    MOVE_ROBBER = 4
+    """The player must move the robber"""
+    STEAL = 5
+    """The player must choose who to steal a resource from"""
+    MAIN = 6
+    """The player may build, trade, play development cards or end their turn"""
+    ROAD_BUILDING = 7
+    """The player is placing the free roads from a road building card"""
+    YEAR_OF_PLENTY = 8
+    """The player is choosing the resources from a year of plenty card"""
+    MONOPOLY = 9
+    """The player is choosing the resource to take with a monopoly card"""
+    GAME_OVER = 10
+    """The game has finished"""
@@ -0,0 +1,5 @@
+"""Submodule with agents that choose the actions of a TurnMachine."""
+
+from ._mcts_agent import MCTSAgent
+
+__all__ = ["MCTSAgent"]
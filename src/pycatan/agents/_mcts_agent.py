@@ -0,0 +1,285 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import math
+import random
+import time
+
+from .._action_type import ActionType
+from .._turn_machine import TurnMachine
+
+
+class _Node:
+    __slots__ = ("children", "visits", "available", "rewards", "trade_ranks")
+
+    def __init__(self, num_players: int):
+        self.children: Dict[int, "_Node"] = {}
+        self.visits = 0
+        self.available = 0
+        self.rewards = [0.0] * num_players
+        self.trade_ranks: Optional[Dict[int, float]] = None
+
+
+def _widen(node: _Node, legal, trades: range, settings, rng: random.Random):
+    """Only keep as many of the trades as the node's number of visits allows."""
+    legal_trades = [a for a in legal if a in trades]
+    allowed = max(
+        1,
+        math.ceil(
+            settings["widening_constant"] * node.visits ** settings["widening_exponent"]
+        ),
+    )
+    if len(legal_trades) <= allowed:
+        return legal
+    # Each node considers the trades in its own random order, so that the same trades are kept between visits
+    if node.trade_ranks is None:
+        node.trade_ranks = {}
+    ranks = node.trade_ranks
+    for a in legal_trades:
+        if a not in ranks:
+            ranks[a] = rng.random()
+    kept = set(sorted(legal_trades, key=ranks.__getitem__)[:allowed])
+    return [a for a in legal if a not in trades or a in kept]
+
+
+def _evaluate(machine: TurnMachine) -> List[float]:
+    num_players = len(machine.game.players)
+    if machine.winner is not None:
+        rewards = [0.0] * num_players
+        rewards[machine.game.players.index(machine.winner)] = 1.0
+        return rewards
+    # The playout was cut short, so use how close each player is to winning instead
+    return [
+        min(machine.get_victory_points(i) / machine.victory_points_to_win, 1.0)
+        for i in range(num_players)
+    ]
+
+
+def _search(
+    machine: TurnMachine,
+    settings: Dict,
+    seed: float,
+    iterations: Optional[int],
+    time_limit: Optional[float],
+) -> Tuple[Dict[int, int], int]:
+    rng = random.Random(seed)
+    observer = machine.acting_player_index
+    num_players = len(machine.game.players)
+    space = machine.action_space
+    trades = range(
+        space.offsets[ActionType.TRADE],
+        space.offsets[ActionType.TRADE] + space.sizes[ActionType.TRADE],
+    )
+    exploration = settings["exploration"]
+    root = _Node(num_players)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    count = 0
+    while (iterations is None or count < iterations) and (
+        deadline is None or time.perf_counter() < deadline
+    ):
+        # Every playout gets its own dice, and its own guess of the hidden cards
+        state = machine.copy(rng=random.Random(rng.random()))
+        if settings["determinize"]:
+            state.determinize(observer, rng)
+        node = root
+        path = [root]
+        # Selection and expansion
+        while not state.is_over:
+            actions = _widen(node, state.legal_actions(), trades, settings, rng)
+            untried = [a for a in actions if a not in node.children]
+            for a in actions:
+                if a in node.children:
+                    node.children[a].available += 1
+            if untried:
+                action = rng.choice(untried)
+                child = _Node(num_players)
+                child.available = 1
+                node.children[action] = child
+                state.step(action)
+                path.append(child)
+                break
+            player = state.acting_player_index
+            action, child = max(
+                ((a, node.children[a]) for a in actions),
+                key=lambda item: item[1].rewards[player] / item[1].visits
+                + exploration * math.sqrt(math.log(item[1].available) / item[1].visits),
+            )
+            state.step(action)
+            node = child
+            path.append(child)
+        # Playout
+        for _ in range(settings["max_rollout_steps"]):
+            if state.is_over:
+                break
+            state.step(rng.choice(state.legal_actions()))
+        # Backpropagation
+        rewards = _evaluate(state)
+        for n in path:
+            n.visits += 1
+            for i, r in enumerate(rewards):
+                n.rewards[i] += r
+        count += 1
+    return {a: child.visits for a, child in root.children.items()}, count
+
+
+def _search_snapshot(
+    snapshot: bytes,
+    settings: Dict,
+    seed: float,
+    iterations: Optional[int],
+    time_limit: Optional[float],
+) -> Tuple[Dict[int, int], int]:
+    # Run a search in a worker process, on the machine serialized with TurnMachine.to_bytes()
+    return _search(
+        TurnMachine.from_bytes(snapshot), settings, seed, iterations, time_limit
+    )
+
+
+class MCTSAgent:
+    """Chooses the actions of a TurnMachine with Information Set Monte Carlo Tree Search (ISMCTS).
+
+    Every playout starts from a cheap copy of the machine (see ``TurnMachine.copy()``) in which the cards
+    the acting player cannot see, i.e. the other players' development cards and the development card deck,
+    are dealt again at random. Actions are chosen with UCT, using how many times an action was available
+    instead of the parent's visits, since not every action is legal in every determinization. The playout
+    is then finished with random actions, and cut short after ``max_rollout_steps`` steps.
+
+    Trades with the bank make up most of the actions in the main phase, so they are added to each node
+    gradually (progressive widening): a node that has been visited ``n`` times only considers
+    ``ceil(widening_constant * n ** widening_exponent)`` of its trades.
+
+    The search can be split across processes (root parallelism): each worker searches its own tree from a
+    snapshot of the machine (see ``TurnMachine.to_bytes()``), and the visit counts of the root actions are added
+    together.
+
+    Args:
+        iterations: The number of playouts for each decision, or None to only use the time limit.
+            Defaults to 1000
+        time_limit: The number of seconds to search for each decision, or None to only use the iterations.
+            Defaults to None
+        exploration: The exploration constant of UCT. Defaults to 0.7
+        widening_constant: How many trades a node considers. Defaults to 1
+        widening_exponent: How quickly a node considers more trades as it is visited. Defaults to 0.5
+        max_rollout_steps: The number of random actions after which a playout is stopped and scored by
+            victory points instead of by who won. Defaults to 200
+        determinize: Whether to guess the hidden cards for every playout. If False, the search can see
+            every player's cards. Defaults to True
+        num_workers: The number of processes to search in. Defaults to 1, searching in this process
+        seed: The seed of the agent's random generator. Defaults to None
+    Raises:
+        ValueError: If both iterations and time_limit are None
+
+    Attributes:
+        iterations (int): The number of playouts for each decision, or None
+        time_limit (float): The number of seconds to search for each decision, or None
+        num_workers (int): The number of processes to search in
+        last_iterations (int): The number of playouts of the last search, across all workers
+        last_elapsed (float): The number of seconds the last search took
+    """
+
+    def __init__(
+        self,
+        iterations: Optional[int] = 1000,
+        time_limit: Optional[float] = None,
+        exploration: Optional[float] = 0.7,
+        widening_constant: Optional[float] = 1.0,
+        widening_exponent: Optional[float] = 0.5,
+        max_rollout_steps: Optional[int] = 200,
+        determinize: Optional[bool] = True,
+        num_workers: Optional[int] = 1,
+        seed: Optional[int] = None,
+    ):
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSAgent needs an iteration budget or a time limit")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+        self._settings = {
+            "exploration": exploration,
+            "widening_constant": widening_constant,
+            "widening_exponent": widening_exponent,
+            "max_rollout_steps": max_rollout_steps,
+            "determinize": determinize,
+        }
+        self._rng = random.Random(seed)
+        self._executor = None
+        self.last_iterations = 0
+        self.last_elapsed = 0.0
+
+    @property
+    def playouts_per_second(self) -> float:
+        """The number of playouts per second of the last search."""
+        return self.last_iterations / self.last_elapsed if self.last_elapsed else 0.0
+
+    def choose_action(self, machine: TurnMachine) -> int:
+        """Search for the best action for the acting player.
+
+        The machine is not changed.
+
+        Args:
+            machine: The machine to choose an action for
+        Raises:
+            ValueError: If the game is over
+        Returns:
+            The action that was visited the most
+        """
+        legal = machine.legal_actions()
+        if not legal:
+            raise ValueError("Cannot choose an action when the game is over")
+        start = time.perf_counter()
+        if len(legal) == 1:
+            self.last_iterations = 0
+            self.last_elapsed = time.perf_counter() - start
+            return legal[0]
+        if self.num_workers > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.num_workers)
+            iterations = (
+                None
+                if self.iterations is None
+                else -(-self.iterations // self.num_workers)
+            )
+            # Send the workers a snapshot, which is much smaller to pickle than the machine's objects
+            snapshot = machine.to_bytes()
+            futures = [
+                self._executor.submit(
+                    _search_snapshot,
+                    snapshot,
+                    self._settings,
+                    self._rng.random(),
+                    iterations,
+                    self.time_limit,
+                )
+                for _ in range(self.num_workers)
+            ]
+            results = [f.result() for f in futures]
+        else:
+            results = [
+                _search(
+                    machine,
+                    self._settings,
+                    self._rng.random(),
+                    self.iterations,
+                    self.time_limit,
+                )
+            ]
+        visits = {a: 0 for a in legal}
+        self.last_iterations = 0
+        for counts, iterations in results:
+            self.last_iterations += iterations
+            for a, v in counts.items():
+                if a in visits:
+                    visits[a] += v
+        self.last_elapsed = time.perf_counter() - start
+        return max(legal, key=lambda a: visits[a])
+
+    def close(self):
+        """Stop the worker processes, if there are any."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
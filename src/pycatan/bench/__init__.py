@@ -0,0 +1,15 @@
+"""Submodule with benchmarks of pycatan's core operations. Run them with ``python -m pycatan.bench``."""
+
+from ._benchmarks import Benchmark, BENCHMARKS
+from ._runner import Regression, run_benchmark, run_benchmarks, compare_results
+from ._cli import main
+
+__all__ = [
+    "BENCHMARKS",
+    "Benchmark",
+    "Regression",
+    "compare_results",
+    "main",
+    "run_benchmark",
+    "run_benchmarks",
+]
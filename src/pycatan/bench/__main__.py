@@ -0,0 +1,7 @@
+"""Run the benchmarks, see ``python -m pycatan.bench --help``."""
+
+import sys
+
+from ._cli import main
+
+sys.exit(main())
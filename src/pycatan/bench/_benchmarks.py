@@ -0,0 +1,276 @@
+from typing import Callable, Dict, NamedTuple
+import io
+import random
+import subprocess
+import sys
+import tempfile
+
+from .._event_log import GameLogWriter, SeekableGameLog, replay_game_log
+from .._game import Game
+from .._player import Player
+from .._resource import Resource
+from .._turn_machine import TurnMachine
+from ..agents._mcts_agent import MCTSAgent
+from ..board._beginner_board import BeginnerBoard
+from ..board._board import Board
+from ..board._board_index import BoardIndex
+from ..board._board_renderer import BoardRenderer
+from ..board._building_type import BuildingType
+from ..board._coords import Coords
+from ..board._random_board import RandomBoard
+from ..env._dataset import Dataset, export_games
+
+
+class Benchmark(NamedTuple):
+    """A benchmark of one operation.
+
+    Attributes:
+        name (str): The name of the benchmark
+        setup (Callable[[], Callable[[], None]]): Builds everything the operation needs, and returns a function
+            that performs the operation. Only the returned function is timed
+        ops (int): How many times the returned function performs the operation
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], None]]
+    ops: int = 1
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def _benchmark(name: str, ops: int = 1):
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, ops)
+        return setup
+
+    return register
+
+
+def get_late_game(seed: int = 0, turns: int = 40) -> TurnMachine:
+    """Play a game with random actions to get a board that looks like the end of a game.
+
+    Args:
+        seed: The seed of the board and the actions. Defaults to 0
+        turns: The number of turns to play. Defaults to 40
+    Returns:
+        The turn machine of the game, after the turns have been played or someone has won
+    """
+    rng = random.Random(seed)
+    machine = TurnMachine(Game(RandomBoard(rng)), rng=rng)
+    while not machine.is_over and machine.turn_number < turns:
+        machine.step(rng.choice(machine.legal_actions()))
+    return machine
+
+
+def get_branching_road_network(num_roads: int = 15):
+    """Build a branching network of roads for one player, spreading out from the middle of the board.
+
+    Args:
+        num_roads: The number of roads to build. Defaults to 15, the most a player can have
+    Returns:
+        The board and the player who owns the roads
+    """
+    board = BeginnerBoard()
+    player = Player()
+    index = BoardIndex(board)
+    start = index.intersection_indices[Coords(1, 0)]
+    seen = {start}
+    frontier = [start]
+    roads = []
+    while len(roads) < num_roads:
+        for path in index.intersection_paths[frontier.pop(0)]:
+            if path in roads or len(roads) == num_roads:
+                continue
+            roads.append(path)
+            for i in index.path_intersections[path]:
+                if i not in seen:
+                    seen.add(i)
+                    frontier.append(i)
+    for path in roads:
+        board.add_path_building(
+            player, BuildingType.ROAD, index.path_coords[path], ensure_connected=False
+        )
+    return board, player
+
+
+@_benchmark("import_pycatan")
+def _import_pycatan():
+    # Includes starting the interpreter, which is what a new worker process pays as well
+    command = [sys.executable, "-c", "import pycatan"]
+    return lambda: subprocess.run(command, check=True)
+
+
+@_benchmark("random_board")
+def _random_board():
+    rng = random.Random(0)
+    return lambda: RandomBoard(rng)
+
+
+@_benchmark("valid_settlement_coords_empty")
+def _valid_settlement_coords_empty():
+    board = BeginnerBoard()
+    player = Player()
+    return lambda: board.get_valid_settlement_coords(player, ensure_connected=False)
+
+
+@_benchmark("valid_settlement_coords_late")
+def _valid_settlement_coords_late():
+    machine = get_late_game()
+    board = machine.game.board
+    player = machine.game.players[0]
+    return lambda: board.get_valid_settlement_coords(player)
+
+
+@_benchmark("valid_road_coords_empty")
+def _valid_road_coords_empty():
+    board = BeginnerBoard()
+    player = Player()
+    return lambda: board.get_valid_road_coords(player, ensure_connected=False)
+
+
+@_benchmark("valid_road_coords_late")
+def _valid_road_coords_late():
+    machine = get_late_game()
+    board = machine.game.board
+    player = machine.game.players[0]
+    return lambda: board.get_valid_road_coords(player)
+
+
+@_benchmark("longest_road_branching")
+def _longest_road_branching():
+    board, player = get_branching_road_network()
+    return lambda: board.calculate_player_longest_road(player)
+
+
+@_benchmark("longest_roads_if_branching")
+def _longest_roads_if_branching():
+    board, player = get_branching_road_network()
+
+    def run():
+        # Scored once per version of the board, so start without the roads found by the last run
+        board._longest_roads.clear()
+        board.longest_roads_if(player)
+
+    return run
+
+
+@_benchmark("yield_for_roll", ops=11)
+def _yield_for_roll():
+    board: Board = get_late_game().game.board
+
+    def run():
+        for roll in range(2, 13):
+            board.get_yield_for_roll(roll)
+
+    return run
+
+
+@_benchmark("possible_trades")
+def _possible_trades():
+    machine = get_late_game()
+    player = machine.game.players[0]
+    board = machine.game.board
+    player.connected_harbors = set(board.harbors.values())
+    player.resources = {res: 4 for res in Resource}
+    return player.get_possible_trades
+
+
+@_benchmark("board_as_string")
+def _board_as_string():
+    renderer = BoardRenderer(get_late_game().game.board)
+    return renderer.get_board_as_string
+
+
+@_benchmark("board_as_plain_string")
+def _board_as_plain_string():
+    renderer = BoardRenderer(get_late_game().game.board, use_color=False)
+    return renderer.get_board_as_string
+
+
+@_benchmark("game_to_bytes")
+def _game_to_bytes():
+    return get_late_game().game.to_bytes
+
+
+@_benchmark("game_from_bytes")
+def _game_from_bytes():
+    data = get_late_game().game.to_bytes()
+    return lambda: Game.from_bytes(data)
+
+
+@_benchmark("turn_machine_from_bytes")
+def _turn_machine_from_bytes():
+    data = get_late_game().to_bytes()
+    return lambda: TurnMachine.from_bytes(data)
+
+
+@_benchmark("replay_game_log")
+def _replay_game_log():
+    stream = io.BytesIO()
+    rng = random.Random(0)
+    machine = TurnMachine(Game(RandomBoard(rng)), max_turns=1000, rng=rng)
+    with GameLogWriter(stream) as writer:
+        writer.start_game(machine.game)
+        while not machine.is_over:
+            machine.step(rng.choice(machine.legal_actions()))
+    data = stream.getvalue()
+    return lambda: list(replay_game_log(io.BytesIO(data)))
+
+
+@_benchmark("seek_game_log", ops=50)
+def _seek_game_log():
+    stream = io.BytesIO()
+    rng = random.Random(0)
+    machine = TurnMachine(Game(RandomBoard(rng)), max_turns=300, rng=rng)
+    with GameLogWriter(stream) as writer:
+        writer.start_game(machine.game)
+        while not machine.is_over:
+            turn = machine.turn_number
+            machine.step(rng.choice(machine.legal_actions()))
+            if machine.turn_number != turn:
+                writer.start_turn(machine.turn_number)
+    log = SeekableGameLog(stream)
+
+    def run():
+        for turn in range(1, 300, 6):
+            log.get_game(0, turn)
+
+    return run
+
+
+@_benchmark("dataset_sample_batch")
+def _dataset_sample_batch():
+    # The directory is deleted when the benchmark is finished with it
+    directory = tempfile.TemporaryDirectory()
+    export_games(directory.name, 5, seed=0, max_turns=100)
+    dataset = Dataset(directory.name)
+    rng = random.Random(0)
+
+    def run():
+        dataset.sample_batch(256, rng)
+        return directory
+
+    return run
+
+
+@_benchmark("random_game")
+def _random_game():
+    def run():
+        # Play the same game every time
+        rng = random.Random(0)
+        machine = TurnMachine(Game(RandomBoard(rng)), max_turns=1000, rng=rng)
+        while not machine.is_over:
+            machine.step(rng.choice(machine.legal_actions()))
+
+    return run
+
+
+@_benchmark("mcts_playout", ops=20)
+def _mcts_playout():
+    machine = get_late_game(turns=20)
+    agent = MCTSAgent(iterations=20, seed=0)
+    # The agent does not search when there is only one legal action
+    while len(machine.legal_actions()) == 1:
+        machine.step(machine.legal_actions()[0])
+    return lambda: agent.choose_action(machine)
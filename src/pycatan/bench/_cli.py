@@ -0,0 +1,113 @@
+from typing import List, Optional
+import argparse
+import json
+import sys
+
+from ._benchmarks import BENCHMARKS
+from ._runner import run_benchmarks, compare_results
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return "%.2f%s" % (seconds / scale, unit)
+    return "%.0fns" % (seconds / 1e-9)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Args:
+        argv: The command line arguments. Defaults to sys.argv[1:]
+    Returns:
+        The exit code: 1 if a benchmark regressed against the baseline, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m pycatan.bench",
+        description="Time the core operations of pycatan.",
+    )
+    parser.add_argument(
+        "names", nargs="*", help="the benchmarks to run (default: all of them)"
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the results as JSON to this file, or - for stdout"
+    )
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        help="compare the results against the JSON results in this file",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="how much slower than the baseline is a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="timings per benchmark (default: 5)"
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        help="the shortest time of one timing, in seconds (default: 0.1)",
+    )
+    parser.add_argument(
+        "-l", "--list", action="store_true", help="list the benchmarks and exit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+    unknown = [n for n in args.names if n not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmarks: %s" % ", ".join(unknown))
+    # Keep stdout for the JSON if it is written there
+    log = sys.stderr if args.output == "-" else sys.stdout
+
+    def progress(name, result):
+        print(
+            "%-32s %10s %10s  (%d loops)"
+            % (
+                name,
+                _format_time(result["median"]),
+                _format_time(result["min"]),
+                result["loops"],
+            ),
+            file=log,
+        )
+
+    print("%-32s %10s %10s" % ("benchmark", "median", "min"), file=log)
+    results = run_benchmarks(
+        args.names or None, args.repeat, args.min_time, progress=progress
+    )
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        for r in regressions:
+            print(
+                "REGRESSION %s: %s -> %s (%.0f%% slower)"
+                % (
+                    r.name,
+                    _format_time(r.baseline),
+                    _format_time(r.current),
+                    (r.ratio - 1) * 100,
+                ),
+                file=log,
+            )
+        if regressions:
+            return 1
+        print("No regressions against %s" % args.baseline, file=log)
+    return 0
@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import platform
+import statistics
+import time
+
+from .. import __version__
+from ._benchmarks import BENCHMARKS, Benchmark
+
+
+class Regression(NamedTuple):
+    """A benchmark that got slower than its baseline.
+
+    Attributes:
+        name (str): The name of the benchmark
+        baseline (float): The baseline's median time of one operation, in seconds
+        current (float): The current median time of one operation, in seconds
+        ratio (float): current / baseline
+    """
+
+    name: str
+    baseline: float
+    current: float
+    ratio: float
+
+
+def run_benchmark(
+    benchmark: Benchmark, repeat: int = 5, min_time: float = 0.1
+) -> Dict[str, float]:
+    """Time one benchmark.
+
+    The operation is run in loops long enough to take at least ``min_time`` seconds, and the loop is timed
+    ``repeat`` times.
+
+    Args:
+        benchmark: The benchmark to run
+        repeat: The number of times to time the loop. Defaults to 5
+        min_time: The shortest time one loop should take, in seconds. Defaults to 0.1
+    Returns:
+        The number of operations per loop ("loops"), and the fastest ("min"), median ("median") and mean ("mean")
+        time of one operation in seconds
+    """
+    run = benchmark.setup()
+    # Find how many calls it takes to fill min_time, which also warms up any caches
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        times.append((time.perf_counter() - start) / (number * benchmark.ops))
+    return {
+        "loops": number * benchmark.ops,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    repeat: int = 5,
+    min_time: float = 0.1,
+    progress=None,
+) -> Dict:
+    """Run the benchmarks and collect the results in a form that can be written as JSON.
+
+    Args:
+        names: The names of the benchmarks to run. Defaults to running all of them
+        repeat: The number of times to time each benchmark. Defaults to 5
+        min_time: The shortest time one timed loop should take, in seconds. Defaults to 0.1
+        progress: A function called with the name and result of each benchmark after it runs. Defaults to None
+    Raises:
+        KeyError: If one of the names is not a benchmark
+    Returns:
+        The results, with the version of python in "python" and the result of each benchmark in "benchmarks"
+    """
+    names = list(BENCHMARKS) if names is None else list(names)
+    results = {
+        "pycatan": __version__,
+        "python": platform.python_version(),
+        "benchmarks": {},
+    }
+    for name in names:
+        result = run_benchmark(BENCHMARKS[name], repeat, min_time)
+        results["benchmarks"][name] = result
+        if progress is not None:
+            progress(name, result)
+    return results
+
+
+def compare_results(
+    baseline: Dict, current: Dict, threshold: float = 0.2
+) -> List[Regression]:
+    """Find the benchmarks that got slower than their baseline.
+
+    Benchmarks that are only in one of the results are ignored.
+
+    Args:
+        baseline: Results from run_benchmarks to compare against
+        current: Results from run_benchmarks to check
+        threshold: How much slower a benchmark's median can be before it is a regression,
+            i.e. 0.2 for 20% slower. Defaults to 0.2
+    Returns:
+        The regressions, in the order of the current results
+    """
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+        before = baseline["benchmarks"][name]["median"]
+        after = result["median"]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append(Regression(name, before, after, ratio))
+    return regressions
@@ -1,7 +1,9 @@
 """Submodule that is used to hold the board state."""
 
 from ._board import Board
-from ._board_renderer import BoardRenderer
+from ._board_changes import BoardChanges
+from ._board_event import BoardEvent, BoardEventType
+from ._board_index import BoardIndex
 from ._beginner_board import BeginnerBoard
 from ._building import Building, PathBuilding, IntersectionBuilding
 from ._building_type import BuildingType
@@ -12,9 +14,14 @@ from ._hex_type import HexType
 from ._intersection import Intersection
 from ._path import Path
 from ._random_board import RandomBoard
+from ._road_planner import RoadPlanner
 
 __all__ = [
     "Board",
+    "BoardChanges",
+    "BoardEvent",
+    "BoardEventType",
+    "BoardIndex",
     "BoardRenderer",
     "BeginnerBoard",
     "Building",
@@ -28,4 +35,15 @@ __all__ = [
     "Intersection",
     "Path",
     "RandomBoard",
+    "RoadPlanner",
 ]
+
+
+def __getattr__(name):
+    # The renderer (and colored) is only imported when it is used, so that programs that never print a board
+    # do not pay for importing it
+    if name == "BoardRenderer":
+        from ._board_renderer import BoardRenderer
+
+        return BoardRenderer
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -1,4 +1,13 @@
-from typing import Dict, Set, Optional, FrozenSet
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    Set,
+    Optional,
+    FrozenSet,
+    Tuple,
+)
 from itertools import product
 
 from ._coords import Coords
@@ -10,6 +19,11 @@ from .._player import Player
 from ._building import IntersectionBuilding, PathBuilding
 from ._harbor import Harbor
 from ._building_type import BuildingType
+from ._board_event import BoardEvent, BoardEventType
+from ._board_changes import BoardChanges
+from ._road_networks import RoadNetworks
+from ._road_planner import RoadPlanner
+from ._longest_road import LongestRoadCache, get_longest_road
 from .._resource import Resource
 from ..errors import (
     InvalidCoordsError,
@@ -48,8 +62,18 @@ class Board:
                     harbors (Dict[frozenset[Coords], Harbor]):
                         The harbors on the board, keyed by the coords of the path they are attached to
                     robber (Set[Coords]): The location of the robber
+                    version (int): A counter that increases every time a building is added or the robber is moved through
+                        the board's methods, so that changes can be found with ``get_changed_intersections()``,
+                        ``get_changed_paths()``, ``get_changed_hexes()`` and ``has_robber_moved()``, or tracked by each
+                        consumer with ``track_changes()``
+
+    Listeners added with ``add_event_listener()`` are sent a BoardEvent after every building is added and every
+    time the robber is moved through the board's methods.
     """
 
+    # Only a tuple of the board's own listeners once one is added, so boards without listeners do not pay for them
+    _listeners: Tuple[Callable[[BoardEvent], None], ...] = ()
+
     def __init__(
         self, hexes: Set[Hex], harbors: Set[Harbor] = set(), robber: Coords = None
     ):
@@ -80,6 +104,7 @@ class Board:
                 coord = c + offset
                 if coord in self.intersections:
                     self.paths[frozenset([c, c + offset])] = Path(set([c, c + offset]))
+        self._reset_tracking()
 
     def add_path_building(
         self,
@@ -116,9 +141,20 @@ class Board:
             self.assert_valid_road_coords(player, path_coords, ensure_connected)
 
         # Add the building
-        self.paths[frozenset(path_coords)].building = PathBuilding(
+        key = frozenset(path_coords)
+        self.paths[key].building = PathBuilding(
             player, path_coords=path_coords, building_type=building_type
         )
+        self.version += 1
+        self._path_versions[key] = self.version
+        self._building_version = self.version
+        networks = self._road_networks.get(player)
+        if networks is not None:
+            networks.add_road(self, player, key)
+        if self._listeners:
+            self._emit(
+                BoardEvent(BoardEventType.PATH_BUILDING, key, self.paths[key].building)
+            )
 
     def assert_valid_road_coords(
         self,
@@ -138,35 +174,17 @@ class Board:
             raise CoordsBlockedError("There is already a building on this path")
 
         if ensure_connected:
-            # Check if it's connected to a intersection building
-            valid_buildings = set(
-                filter(
-                    lambda b: b is not None and b.owner is player,
-                    map(lambda c: self.intersections[c].building, path_coords),
-                )
-            )
-            if len(valid_buildings) == 0:
-                # Check if it's connected to another path building
-                paths_connected = set()
-                for coords in path_coords:
-                    for c in self.get_intersection_connected_intersections(
-                        self.intersections[coords]
-                    ):
-                        connected_path = self.paths[frozenset({coords, c.coords})]
-                        # Check if there is an path building (i.e. a road) to be connected to here
-                        if (
-                            connected_path.building is not None
-                            and connected_path.building.owner is player
-                        ):
-                            # Checks that we aren't going through an enemy building to be connected
-                            building = self.intersections[coords].building
-                            if building is None or building.owner is player:
-                                paths_connected.add(path)
-
-                if len(paths_connected) == 0:
-                    raise NotConnectedError(
-                        "Road is not connected to any other building"
-                    )
+            networks = self._get_road_networks(player)
+            for coords in path_coords:
+                building = self.intersections[coords].building
+                if building is None:
+                    # Connected to one of the player's roads
+                    if networks.has_road_at(coords):
+                        return
+                elif building.owner is player:
+                    return
+                # Another player's building cuts off the roads going through it
+            raise NotConnectedError("Road is not connected to any other building")
 
     def add_intersection_building(
         self,
@@ -199,6 +217,19 @@ class Board:
         self.intersections[coords].building = IntersectionBuilding(
             player, building_type, coords
         )
+        self.version += 1
+        self._intersection_versions[coords] = self.version
+        self._building_version = self.version
+        for owner, networks in self._road_networks.items():
+            networks.add_building(self, owner, coords)
+        if self._listeners:
+            self._emit(
+                BoardEvent(
+                    BoardEventType.INTERSECTION_BUILDING,
+                    coords,
+                    self.intersections[coords].building,
+                )
+            )
 
         # Connect the player to a harbor if they can
         for harbor in self.harbors.values():
@@ -238,24 +269,8 @@ class Board:
             raise TooCloseToBuildingError(
                 "There is a building that is not at least 2 paths away from this position"
             )
-        if ensure_connected:
-            path_coords = set(
-                map(lambda c: frozenset({coords, c.coords}), connected_intersections)
-            )
-            paths = set(map(lambda e: self.paths[e], path_coords))
-            if (
-                len(
-                    set(
-                        filter(
-                            lambda path: path.building is not None
-                            and path.building.owner is player,
-                            paths,
-                        )
-                    )
-                )
-                == 0
-            ):
-                raise NotConnectedError("The settlement must be connected by road")
+        if ensure_connected and not self._get_road_networks(player).has_road_at(coords):
+            raise NotConnectedError("The settlement must be connected by road")
 
     def assert_valid_city_coords(self, player: Player, coords: Coords):
         """Check whether the coordinates given are a valid place to build a city by the player given.
@@ -399,6 +414,45 @@ class Board:
 
         return to_return
 
+    def get_road_building_pairs(
+        self, player: Player
+    ) -> Iterator[Tuple[FrozenSet[Coords], FrozenSet[Coords], int]]:
+        """Get every pair of roads the player can build with a Road Building card, one pair at a time.
+
+        Each unordered pair is only given once. The roads that can be built first are only found once, and the
+        second road is either another one of them or a road that becomes connected by the first one.
+
+        Args:
+            player: The player building the roads
+        Returns:
+            The coordinates of the two paths, and how much longer the player's longest road would be with both roads
+            built (i.e. ``(road_one, road_two, longest_road_delta)``)
+        """
+        valid = self.get_valid_road_coords(player)
+        roads = list(valid)
+        longest_road = self._get_longest_road_cache(player).longest_road
+        for i, first in enumerate(roads):
+            # The other roads that could already be built
+            for second in roads[i + 1:]:
+                length = get_longest_road(self, player, (first, second))
+                yield first, second, length - longest_road
+            # The roads that can only be built once the first one is
+            for coords in first:
+                building = self.intersections[coords].building
+                if building is not None and building.owner is not player:
+                    continue
+                for other in self.get_intersection_connected_intersections(
+                    self.intersections[coords]
+                ):
+                    second = frozenset((coords, other.coords))
+                    if (
+                        second != first
+                        and self.paths[second].building is None
+                        and second not in valid
+                    ):
+                        length = get_longest_road(self, player, (first, second))
+                        yield first, second, length - longest_road
+
     def get_intersection_connected_intersections(
         self, intersection: Intersection
     ) -> Set[Intersection]:
@@ -533,6 +587,92 @@ class Board:
 
         return len(current_longest)
 
+    def _get_longest_road_cache(self, player: Player) -> LongestRoadCache:
+        # Found again whenever the board has changed, and shared by every road checked at the same version
+        cache = self._longest_roads.get(player)
+        if cache is None or cache.version != self.version:
+            cache = self._longest_roads[player] = LongestRoadCache(self, player)
+        return cache
+
+    def longest_road_if(self, player: Player, path_coords: Set[Coords]) -> int:
+        """Calculate the length of the player's longest road if they built a road, without building it.
+
+        Args:
+            player: The player
+            path_coords: The coordinates of the two intersections connected by the path
+        Raises:
+            CoordsBlockedError: If there is already a building on the path
+        Returns:
+            The length of the longest road segment with the road
+        """
+        key = frozenset(path_coords)
+        if self.paths[key].building is not None:
+            raise CoordsBlockedError("There is already a building on this path")
+        return self._get_longest_road_cache(player).get_longest_road_with(key)
+
+    def longest_roads_if(self, player: Player) -> Dict[FrozenSet[Coords], int]:
+        """Calculate the length of the player's longest road for every road they could build, without building them.
+
+        Args:
+            player: The player
+        Returns:
+            The length of the longest road segment with each road, keyed by the coordinates of the paths the player
+            can build a road on
+        """
+        cache = self._get_longest_road_cache(player)
+        return {
+            key: cache.get_longest_road_with(key)
+            for key in self.get_valid_road_coords(player)
+        }
+
+    def _get_road_networks(self, player: Player) -> RoadNetworks:
+        # Built when first needed, and then kept up to date as buildings are added
+        networks = self._road_networks.get(player)
+        if networks is None:
+            networks = self._road_networks[player] = RoadNetworks(self, player)
+        return networks
+
+    def get_road_networks_at(self, player: Player, coords: Coords) -> Set[Hashable]:
+        """Get the player's road networks that reach an intersection, i.e. to plan which networks to join.
+
+        A network is a group of the player's roads and buildings that are connected without going through
+        another player's building.
+
+        Args:
+            player: The player
+            coords: The coordinates of the intersection
+        Returns:
+            Identifiers of the networks, which stay the same until a building is added to the board
+        """
+        return self._get_road_networks(player).get_networks_at(coords)
+
+    def is_connected_by_road(
+        self, player: Player, first: Coords, second: Coords
+    ) -> bool:
+        """Check whether two intersections are in the same road network of a player.
+
+        Args:
+            player: The player
+            first: The coordinates of one intersection
+            second: The coordinates of the other intersection
+        Returns:
+            Whether the player's roads and buildings connect the intersections
+        """
+        networks = self._get_road_networks(player)
+        return not networks.get_networks_at(first).isdisjoint(
+            networks.get_networks_at(second)
+        )
+
+    def plan_roads(self, player: Player) -> RoadPlanner:
+        """Find the fewest roads the player needs to build to reach every intersection.
+
+        Args:
+            player: The player building the roads
+        Returns:
+            The planner, which keeps its distances up to date as buildings are added to the board
+        """
+        return RoadPlanner(self, player)
+
     def get_paths_for_intersection_coords(self, coords: Coords) -> Set[Path]:
         """Get all the paths who that connected to the intersection given.
 
@@ -541,7 +681,13 @@ class Board:
         Returns:
             A set of the paths attached to that intersection
         """
-        return set(filter(lambda e: coords in e.path_coords, self.paths.values()))
+        # Only look up the paths to the neighbouring intersections instead of going through every path
+        paths = set()
+        for offset in Intersection.CONNECTED_CORNER_OFFSETS:
+            path_coords = frozenset({coords, coords + offset})
+            if path_coords in self.paths:
+                paths.add(self.paths[path_coords])
+        return paths
 
     def get_hex_resources_for_intersection(self, coords: Coords) -> Dict[Resource, int]:
         """Get the associated resources for the hexes around the intersection at the coords given.
@@ -573,6 +719,188 @@ class Board:
             ]
         )
 
+    def move_robber(self, coords: Coords):
+        """Move the robber, without checking the coordinates. Use ``Game.move_robber`` to check them.
+
+        Args:
+            coords: The coordinates of the hex to move the robber to
+        """
+        self._robber_from = self.robber
+        self.robber = coords
+        self.version += 1
+        self._robber_version = self.version
+        if self._listeners:
+            self._emit(BoardEvent(BoardEventType.ROBBER, coords, None))
+
+    def add_event_listener(self, listener: Callable[[BoardEvent], None]):
+        """Call a function with every change made to this board through its methods from now on.
+
+        Copies of the board do not keep the listeners.
+
+        Args:
+            listener: The function to call with each BoardEvent
+        """
+        self._listeners = self._listeners + (listener,)
+
+    def remove_event_listener(self, listener: Callable[[BoardEvent], None]):
+        """Stop calling a function that was added with ``add_event_listener``.
+
+        Args:
+            listener: The function to stop calling
+        Raises:
+            ValueError: If the function is not a listener of this board
+        """
+        listeners = list(self._listeners)
+        listeners.remove(listener)
+        self._listeners = tuple(listeners)
+
+    def _emit(self, event: BoardEvent):
+        for listener in self._listeners:
+            listener(event)
+
+    def get_changed_intersections(self, since_version: int) -> Set[Coords]:
+        """Get the intersections whose building has changed since a version of the board.
+
+        Args:
+            since_version: The version of the board, i.e. the ``version`` a client last saw
+        Returns:
+            The coordinates of the intersections
+        """
+        return {c for c, v in self._intersection_versions.items() if v > since_version}
+
+    def get_changed_paths(self, since_version: int) -> Set[FrozenSet[Coords]]:
+        """Get the paths whose building has changed since a version of the board.
+
+        Args:
+            since_version: The version of the board
+        Returns:
+            The keys of the paths in ``paths``
+        """
+        return {k for k, v in self._path_versions.items() if v > since_version}
+
+    def has_robber_moved(self, since_version: int) -> bool:
+        """Check whether the robber has moved since a version of the board.
+
+        Args:
+            since_version: The version of the board
+        Returns:
+            Whether the robber has moved
+        """
+        return self._robber_version > since_version
+
+    def get_changed_hexes(self, since_version: int) -> Set[Coords]:
+        """Get the hexes whose yield may have changed since a version of the board.
+
+        These are the hexes next to the intersections whose building has changed, the hex the robber is on and the
+        hex it left when it last moved. Only the last move of the robber is kept, so if it has moved more than once,
+        the hex it was on at the version is only included by ``track_changes()``, which remembers it.
+
+        Args:
+            since_version: The version of the board
+        Returns:
+            The coordinates of the hexes
+        """
+        hexes = set()
+        for coords in self.get_changed_intersections(since_version):
+            hexes.update(self.get_hexes_connected_to_intersection(coords))
+        if self._robber_version > since_version:
+            hexes.add(self.robber)
+            hexes.add(self._robber_from)
+        return hexes
+
+    def track_changes(self) -> BoardChanges:
+        """Start tracking the changes made to this board from now on, i.e. to update a cache of the board.
+
+        Returns:
+            The changes, which can be read and cleared without affecting other trackers
+        """
+        return BoardChanges(self)
+
+    def _reset_tracking(
+        self,
+        version: int = 0,
+        source: Optional["Board"] = None,
+        player_map: Optional[Dict[Player, Player]] = None,
+    ):
+        # Set up every attribute that tracks the changes made to the board, so boards created without __init__
+        # (copies and loaded boards) cannot miss one. The tracking is copied from the source board if there is one,
+        # with its players replaced by player_map. Otherwise everything that is not in its initial state is marked as
+        # changed at the version, i.e. after loading a board whose history is unknown
+        if source is not None:
+            # The road networks of the players whose networks have been needed so far
+            self._road_networks: Dict[Player, RoadNetworks] = {
+                player if player_map is None else player_map[player]: networks.copy()
+                for player, networks in source._road_networks.items()
+                if player_map is None or player in player_map
+            }
+            self.version = source.version
+            # The version at which each intersection, path and the robber last changed
+            self._intersection_versions: Dict[Coords, int] = dict(
+                source._intersection_versions
+            )
+            self._path_versions: Dict[FrozenSet[Coords], int] = dict(
+                source._path_versions
+            )
+            self._robber_version = source._robber_version
+            # The hex the robber left when it last moved
+            self._robber_from: Coords = source._robber_from
+            # The latest version at which any building changed
+            self._building_version: int = source._building_version
+            # The roads of the players whose longest road has been needed, at the version they were found
+            self._longest_roads: Dict[Player, LongestRoadCache] = {}
+            return
+        self.version = version
+        self._intersection_versions = {
+            c: version for c, i in self.intersections.items() if i.building is not None
+        }
+        self._path_versions = {
+            k: version for k, p in self.paths.items() if p.building is not None
+        }
+        self._robber_version = version
+        self._robber_from = self.robber
+        self._building_version = (
+            version if self._intersection_versions or self._path_versions else 0
+        )
+        self._road_networks = {}
+        self._longest_roads = {}
+
+    def copy(self, player_map: Optional[Dict[Player, Player]] = None) -> "Board":
+        """Get a copy of this board that can be changed without changing this board.
+
+        The hexes and harbors are shared with the copy, since they never change after the board is created.
+        The intersections, paths and buildings are copied.
+
+        Args:
+            player_map: The owner of the copied buildings for each player who owns a building on this board,
+                i.e. when the players have been copied as well. Defaults to keeping the same owners
+        Returns:
+            The copy
+        """
+        board = type(self).__new__(type(self))
+        board.hexes = dict(self.hexes)
+        board.harbors = dict(self.harbors)
+        board.robber = self.robber
+        board.intersections = {}
+        for coords, intersection in self.intersections.items():
+            building = intersection.building
+            if building is not None and player_map is not None:
+                building = IntersectionBuilding(
+                    player_map[building.owner], building.building_type, building.coords
+                )
+            board.intersections[coords] = Intersection(coords, building)
+        board.paths = {}
+        for key, path in self.paths.items():
+            building = path.building
+            if building is not None and player_map is not None:
+                building = PathBuilding(
+                    player_map[building.owner],
+                    building.building_type,
+                    building.path_coords,
+                )
+            board.paths[key] = Path(path.path_coords, building)
+        board._reset_tracking(source=self, player_map=player_map)
+        return board
+
     def __str__(self):
         from ._board_renderer import BoardRenderer
 
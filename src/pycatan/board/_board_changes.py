@@ -0,0 +1,65 @@
+from typing import FrozenSet, Set
+
+from ._coords import Coords
+
+
+class BoardChanges:
+    """The parts of a board that have changed since they were last cleared, as returned by ``Board.track_changes()``.
+
+    Each consumer of a board, i.e. a cache of legal moves or a renderer, keeps its own BoardChanges, reads what
+    has changed to update only those parts, and then calls ``clear()``. The changes are read from the versions
+    the board keeps for every intersection, path and the robber, so tracking costs nothing until it is read, and
+    any number of consumers can track the same board.
+
+    Args:
+        board: The board to track
+
+    Attributes:
+        board (Board): The board being tracked
+        since_version (int): The version of the board when the changes were last cleared
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.since_version = board.version
+        # Where the robber was when the changes were last cleared, since the board only keeps its last move
+        self._robber = board.robber
+
+    @property
+    def intersections(self) -> Set[Coords]:
+        """The coordinates of the intersections whose building has changed."""
+        return self.board.get_changed_intersections(self.since_version)
+
+    @property
+    def paths(self) -> Set[FrozenSet[Coords]]:
+        """The keys of the paths whose building has changed."""
+        return self.board.get_changed_paths(self.since_version)
+
+    @property
+    def hexes(self) -> Set[Coords]:
+        """The coordinates of the hexes whose yield may have changed, next to changed intersections or the robber."""
+        hexes = self.board.get_changed_hexes(self.since_version)
+        if self.board.has_robber_moved(self.since_version):
+            hexes.add(self._robber)
+        return hexes
+
+    @property
+    def robber_moved(self) -> bool:
+        """Whether the robber has moved."""
+        return self.board.has_robber_moved(self.since_version)
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether a building has been added or the robber has moved."""
+        # Games also increase the board's version when only a player's hand changes, so the versions of the last
+        # building and robber move are compared instead
+        board = self.board
+        return (
+            board._building_version > self.since_version
+            or board._robber_version > self.since_version
+        )
+
+    def clear(self):
+        """Mark every change so far as seen."""
+        self.since_version = self.board.version
+        self._robber = self.board.robber
@@ -0,0 +1,32 @@
+from enum import Enum
+from typing import FrozenSet, NamedTuple, Optional, Union
+
+from ._building import Building
+from ._coords import Coords
+
+
+class BoardEventType(Enum):
+    """A type of change to a board, sent to the board's event listeners."""
+
+    INTERSECTION_BUILDING = 0
+    """A settlement or city was built. The coordinates are the intersection's, and the building is the new building"""
+    PATH_BUILDING = 1
+    """A road was built. The coordinates are the path's (a frozenset of two intersection coordinates), and the
+    building is the new building"""
+    ROBBER = 2
+    """The robber was moved. The coordinates are the robber's new hex, and there is no building"""
+
+
+class BoardEvent(NamedTuple):
+    """A change to a board.
+
+    Attributes:
+        event_type (BoardEventType): The type of change
+        coords (Union[Coords, FrozenSet[Coords]]): Where the change was made, which depends on the event type
+            (see ``BoardEventType``)
+        building (Building): The new building, or None if the change is not a building
+    """
+
+    event_type: BoardEventType
+    coords: Union[Coords, FrozenSet[Coords]]
+    building: Optional[Building]
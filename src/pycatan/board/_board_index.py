@@ -0,0 +1,92 @@
+from typing import Dict, FrozenSet, List, Tuple
+
+from ._coords import Coords
+from ._hex import Hex
+
+
+def _coords_key(coords: Coords) -> Tuple[int, int]:
+    return (coords.q, coords.r)
+
+
+def _path_key(path_coords: FrozenSet[Coords]) -> Tuple[int, int, int, int]:
+    first, second = sorted(path_coords, key=_coords_key)
+    return (first.q, first.r, second.q, second.r)
+
+
+class BoardIndex:
+    """A fixed integer numbering of the hexes, intersections and paths on a board.
+
+    The hexes and intersections are ordered by their (q, r) coordinates, and the paths by the
+    coordinates of the two intersections they connect, so two boards with the same layout always
+    have the same numbering. Also precomputes the adjacency between the different parts of the board
+    as tuples of indices, which is much faster to walk than looking up coordinates.
+
+    Args:
+        board: The board to index
+
+    Attributes:
+        hex_coords (List[Coords]): The coordinates of each hex, by index
+        intersection_coords (List[Coords]): The coordinates of each intersection, by index
+        path_coords (List[FrozenSet[Coords]]): The coordinates of each path, by index
+        hex_indices (Dict[Coords, int]): The index of each hex, keyed by its coordinates
+        intersection_indices (Dict[Coords, int]): The index of each intersection, keyed by its coordinates
+        path_indices (Dict[FrozenSet[Coords], int]): The index of each path, keyed by its coordinates
+        intersection_neighbors (List[Tuple[int, ...]]): The intersections connected to each intersection by a path
+        intersection_paths (List[Tuple[int, ...]]): The paths attached to each intersection
+        intersection_hexes (List[Tuple[int, ...]]): The hexes around each intersection
+        path_intersections (List[Tuple[int, int]]): The two intersections each path connects
+        hex_intersections (List[Tuple[int, ...]]): The six intersections around each hex
+    """
+
+    def __init__(self, board):
+        self.hex_coords: List[Coords] = sorted(board.hexes, key=_coords_key)
+        self.intersection_coords: List[Coords] = sorted(
+            board.intersections, key=_coords_key
+        )
+        self.path_coords: List[FrozenSet[Coords]] = sorted(board.paths, key=_path_key)
+
+        self.hex_indices: Dict[Coords, int] = {
+            c: i for i, c in enumerate(self.hex_coords)
+        }
+        self.intersection_indices: Dict[Coords, int] = {
+            c: i for i, c in enumerate(self.intersection_coords)
+        }
+        self.path_indices: Dict[FrozenSet[Coords], int] = {
+            c: i for i, c in enumerate(self.path_coords)
+        }
+
+        self.path_intersections: List[Tuple[int, int]] = [
+            tuple(sorted(self.intersection_indices[c] for c in path_coords))
+            for path_coords in self.path_coords
+        ]
+        neighbors = [[] for _ in self.intersection_coords]
+        paths = [[] for _ in self.intersection_coords]
+        for i, (first, second) in enumerate(self.path_intersections):
+            neighbors[first].append(second)
+            neighbors[second].append(first)
+            paths[first].append(i)
+            paths[second].append(i)
+        self.intersection_neighbors: List[Tuple[int, ...]] = [
+            tuple(n) for n in neighbors
+        ]
+        self.intersection_paths: List[Tuple[int, ...]] = [tuple(p) for p in paths]
+
+        self.hex_intersections: List[Tuple[int, ...]] = [
+            tuple(
+                sorted(
+                    self.intersection_indices[c + offset]
+                    for offset in Hex.CONNECTED_CORNER_OFFSETS
+                )
+            )
+            for c in self.hex_coords
+        ]
+        self.intersection_hexes: List[Tuple[int, ...]] = [
+            tuple(
+                sorted(
+                    self.hex_indices[c + offset]
+                    for offset in Hex.CONNECTED_CORNER_OFFSETS
+                    if c + offset in self.hex_indices
+                )
+            )
+            for c in self.intersection_coords
+        ]
@@ -1,5 +1,6 @@
-from colored import stylize, fg, bg
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
+import re
+import sys
 
 from . import _board
 from ._coords import Coords
@@ -11,6 +12,28 @@ from ._building_type import BuildingType
 from ._hex import Hex
 from .._resource import Resource
 
+_ESCAPE_SEQUENCE = re.compile("\x1b\\[[0-9;]*m")
+
+
+class _StaticLayer:
+    """The parts of a rendered board that do not change while playing, and where the other parts go.
+
+    Attributes:
+        key: The colors the layer was rendered with
+        center (Tuple[int, int]): The (x, y) position in the cells of the hex at (0, 0)
+        cells (List[List[str]]): The rendered water, hexes, tokens, harbors and empty intersections and paths
+        parts (List[Tuple]): Every intersection, path and hex center as (element, chars), in the order they are drawn
+        positions (Dict): The (row, column, index) of every cell each element is still visible in,
+            where index is which of the element's characters is in the cell
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.center: Tuple[int, int] = (0, 0)
+        self.cells: List[List[str]] = []
+        self.parts: List[Tuple] = []
+        self.positions: Dict[object, List[Tuple[int, int, int]]] = {}
+
 
 class BoardRenderer:
     """Class for rendering a board in the terminal and configuring its appearance.
@@ -23,6 +46,11 @@ class BoardRenderer:
             A map of which colors to use for the different types of hexes. Colors are string hex codes (i.e. '#FF00000')
         resource_color_map:
             A map of which colors to use for the different resource harbors. Colors are string hex codes (i.e. '#FF00000')
+        use_color:
+            Whether to color the board. If False, the board is rendered as plain text without any escape codes.
+            Each player is then given a letter and a road symbol in the order they are drawn, settlements are drawn
+            with the lowercase letter, cities with the uppercase letter, and roads with the symbol, and a legend of
+            the players is added below the board. Defaults to True
     """
 
     DEFAULT_PLAYER_COLORS = ["#00c40d", "#ff00d9", "#0000FF", "#00FFFF"]
@@ -46,53 +74,115 @@ class BoardRenderer:
 
     WATER_COLOR = "#2387de"
 
+    # The symbols roads are drawn with when the board is plain text, by the order the players are drawn in. None of
+    # them is a digit, so they cannot be mistaken for a token
+    PLAIN_ROAD_CHARS = "=~+*#%"
+
+    # The number of columns and rows a hex takes up
+    HEX_SIZE = (7, 3)
+    # The number of columns and rows of water to the left, right, top and bottom of the hexes
+    MARGINS = (12, 12, 5, 4)
+
     def __init__(
         self,
         board: _board.Board,
-        player_color_map: Optional[Dict[Player, str]] = {},
+        player_color_map: Optional[Dict[Player, str]] = None,
         hex_color_map: Optional[Dict[HexType, str]] = DEFAULT_HEX_COLORS,
         resource_color_map: Optional[Dict[Resource, str]] = DEFAULT_RESOURCE_COLORS,
+        use_color: Optional[bool] = True,
     ):
         self.board = board
-        self._unused_player_colors = BoardRenderer.DEFAULT_PLAYER_COLORS
-        self.player_color_map = player_color_map
+        self._unused_player_colors = list(BoardRenderer.DEFAULT_PLAYER_COLORS)
+        self.player_color_map = player_color_map if player_color_map is not None else {}
         self.hex_color_map = hex_color_map
         self.resource_color_map = resource_color_map
+        self.use_color = use_color
+        self._player_indices: Dict[Player, int] = {}
+        self._styles: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+        self._reset = None
+        self._static_layer: Optional[_StaticLayer] = None
+        self._previous_frame: Optional[List[List[str]]] = None
+        self._cell_widths: Dict[str, int] = {}
 
     def _get_player_color(self, player: Player):
         if player not in self.player_color_map:
             self.player_color_map[player] = self._unused_player_colors.pop(0)
         return self.player_color_map[player]
 
+    def _get_player_index(self, player: Player) -> int:
+        if player not in self._player_indices:
+            self._player_indices[player] = len(self._player_indices)
+        return self._player_indices[player]
+
+    def _get_plain_road_char(self, player: Player) -> str:
+        chars = BoardRenderer.PLAIN_ROAD_CHARS
+        return chars[self._get_player_index(player) % len(chars)]
+
+    def _get_plain_building_char(self, player: Player, building_type) -> str:
+        letter = chr(ord("a") + self._get_player_index(player) % 26)
+        return letter if building_type is BuildingType.SETTLEMENT else letter.upper()
+
+    def _get_plain_legend(self) -> List[str]:
+        # Which letters and symbol each player drawn so far is drawn with
+        return [
+            "Player %d: %s settlement, %s city, %s road"
+            % (
+                i + 1,
+                self._get_plain_building_char(p, BuildingType.SETTLEMENT),
+                self._get_plain_building_char(p, BuildingType.CITY),
+                self._get_plain_road_char(p),
+            )
+            for p, i in self._player_indices.items()
+        ]
+
+    def _stylize(self, text, fore: Optional[str], back: Optional[str]) -> str:
+        if not self.use_color:
+            return str(text)
+        # Same as colored.stylize(text, fg(fore) + bg(back)), but only works out the escape codes once per color
+        style = self._styles.get((fore, back))
+        if style is None:
+            from colored import fg, bg, attr
+
+            style = (fg(fore) if fore is not None else "") + (
+                bg(back) if back is not None else ""
+            )
+            self._styles[(fore, back)] = style
+            self._reset = attr("reset")
+        return "%s%s%s" % (style, text, self._reset)
+
     def _get_path(self, chars, path, path_labels):
         fore = "#9c7500"
         back = self.hex_color_map[HexType.DESERT]
         if path.building is not None:
             fore = self._get_player_color(path.building.owner)
+            if not self.use_color:
+                chars = [self._get_plain_road_char(path.building.owner)] * len(chars)
         elif frozenset(path.path_coords) in self.board.harbors:
             fore = "#000000"
         if path in path_labels:
             chars = [path_labels[path]] * len(chars)
-        return list(map(lambda x: stylize(x, fg(fore) + bg(back)), chars))
+        return [self._stylize(x, fore, back) for x in chars]
 
     def _get_intersection(self, char, intersection, intersection_labels):
         fore = "#9c7500"
         back = self.hex_color_map[HexType.DESERT]
         if intersection in intersection_labels:
-            return [
-                stylize(intersection_labels[intersection], fg("#000000") + bg(back))
-            ]
+            return [self._stylize(intersection_labels[intersection], "#000000", back)]
         if intersection.building is not None:
-            fore = self._get_player_color(intersection.building.owner)
-            char = (
-                "s"
-                if intersection.building.building_type is BuildingType.SETTLEMENT
-                else "c"
-            )
-        return [stylize(char, fg(fore) + bg(back))]
+            building = intersection.building
+            fore = self._get_player_color(building.owner)
+            if self.use_color:
+                char = (
+                    "s" if building.building_type is BuildingType.SETTLEMENT else "c"
+                )
+            else:
+                char = self._get_plain_building_char(
+                    building.owner, building.building_type
+                )
+        return [self._stylize(char, fore, back)]
 
     def _get_hex_center(self, h, hex_labels):
-        space = stylize(" ", bg(self.hex_color_map[h.hex_type]))
+        space = self._stylize(" ", None, self.hex_color_map[h.hex_type])
         if h in hex_labels:
             return [space, space, hex_labels[h], space, space]
         if h.token_number is None:
@@ -101,11 +191,33 @@ class BoardRenderer:
             "#FF0000" if h.token_number == 6 or h.token_number == 8 else "#000000"
         )
         token_chars = [space if h.token_number < 10 else ""] + [
-            stylize(h.token_number, fg(token_color) + bg("#FFFFFF"))
+            self._stylize(h.token_number, token_color, "#FFFFFF")
         ]
         return [space] + [t for t in token_chars] + [space, space]
 
-    def _get_hex(self, coords, hex_labels, intersection_labels, path_labels):
+    def _get_part(self, element, chars, hex_labels, intersection_labels, path_labels):
+        if isinstance(element, Intersection):
+            return self._get_intersection(chars[0], element, intersection_labels)
+        if isinstance(element, Path):
+            return self._get_path(chars, element, path_labels)
+        return self._get_hex_center(element, hex_labels)
+
+    def _get_static_part(self, element, chars):
+        # The element as it looks when nothing is built on it and it has no label
+        back = self.hex_color_map[HexType.DESERT]
+        if isinstance(element, Intersection):
+            return [self._stylize(chars[0], "#9c7500", back)]
+        if isinstance(element, Path):
+            fore = (
+                "#000000"
+                if frozenset(element.path_coords) in self.board.harbors
+                else "#9c7500"
+            )
+            return [self._stylize(c, fore, back) for c in chars]
+        return self._get_hex_center(element, {})
+
+    def _get_hex(self, coords):
+        """Get the intersections, paths and center that make up a hex, as rows of (element, chars)."""
         intersection_coords = [
             c + coords
             for c in (
@@ -130,24 +242,27 @@ class BoardRenderer:
             for i in range(len(intersection_coords))
         ]
         return [
-            self._get_intersection(".", intersections[0], intersection_labels)
-            + self._get_path(["-", "-"], paths[0], path_labels)
-            + self._get_intersection("'", intersections[1], intersection_labels)
-            + self._get_path(["-", "-"], paths[1], path_labels)
-            + self._get_intersection(".", intersections[2], intersection_labels),
-            self._get_path(["|"], paths[5], path_labels)
-            + self._get_hex_center(self.board.hexes[coords], hex_labels)
-            + self._get_path(["|"], paths[2], path_labels),
-            self._get_intersection("'", intersections[5], intersection_labels)
-            + self._get_path(["-", "-"], paths[4], path_labels)
-            + self._get_intersection(".", intersections[4], intersection_labels)
-            + self._get_path(["-", "-"], paths[3], path_labels)
-            + self._get_intersection("'", intersections[3], intersection_labels),
+            [
+                (intersections[0], ["."]),
+                (paths[0], ["-", "-"]),
+                (intersections[1], ["'"]),
+                (paths[1], ["-", "-"]),
+                (intersections[2], ["."]),
+            ],
+            [
+                (paths[5], ["|"]),
+                (self.board.hexes[coords], None),
+                (paths[2], ["|"]),
+            ],
+            [
+                (intersections[5], ["'"]),
+                (paths[4], ["-", "-"]),
+                (intersections[4], ["."]),
+                (paths[3], ["-", "-"]),
+                (intersections[3], ["'"]),
+            ],
         ]
 
-    def _stylize_arr(self, arr, styles):
-        return [stylize(s, styles) for s in arr]
-
     def _get_harbor(self, harbor):
         fore = (
             "#FFFFFF"
@@ -155,10 +270,10 @@ class BoardRenderer:
             else self.resource_color_map[harbor.resource]
         )
         return [
-            self._stylize_arr(
-                ["3" if harbor.resource is None else "2", ":", "1"],
-                fg(fore) + bg(BoardRenderer.WATER_COLOR),
-            )
+            [
+                self._stylize(c, fore, BoardRenderer.WATER_COLOR)
+                for c in ["3" if harbor.resource is None else "2", ":", "1"]
+            ]
         ]
 
     def _get_harbor_coords(self, harbor):
@@ -182,6 +297,110 @@ class BoardRenderer:
     def _get_hex_center_coords(self, coords):
         return ((int)(3 * coords.r), -(int)(1.34 * coords.q + 0.67 * coords.r))
 
+    def _get_size_and_center(self):
+        # Leave room for the water around the hexes, and make sure every harbor fits
+        hex_positions = [self._get_hex_center_coords(c) for c in self.board.hexes]
+        harbor_positions = [
+            self._get_harbor_coords(h) for h in self.board.harbors.values()
+        ]
+        left = min(
+            [x - BoardRenderer.MARGINS[0] for x, y in hex_positions]
+            + [x for x, y in harbor_positions]
+        )
+        right = max(
+            [
+                x + BoardRenderer.HEX_SIZE[0] + BoardRenderer.MARGINS[1]
+                for x, y in hex_positions
+            ]
+            + [x + 3 for x, y in harbor_positions]
+        )
+        top = min(
+            [y - BoardRenderer.MARGINS[2] for x, y in hex_positions]
+            + [y for x, y in harbor_positions]
+        )
+        bottom = max(
+            [
+                y + BoardRenderer.HEX_SIZE[1] + BoardRenderer.MARGINS[3]
+                for x, y in hex_positions
+            ]
+            + [y + 1 for x, y in harbor_positions]
+        )
+        return (bottom - top, right - left), (-left, -top)
+
+    def _get_static_layer(self) -> _StaticLayer:
+        key = (
+            self.use_color,
+            tuple(self.hex_color_map.items()),
+            tuple(self.resource_color_map.items()),
+        )
+        if self._static_layer is not None and self._static_layer.key == key:
+            return self._static_layer
+        layer = _StaticLayer(key)
+        size, center = self._get_size_and_center()
+        layer.center = center
+        water = self._stylize(" ", None, BoardRenderer.WATER_COLOR)
+        layer.cells = [[water] * size[1] for i in range(size[0])]
+        # Which element is drawn in each cell, as (element, index)
+        owners = {}
+        seen = set()
+        # In a fixed order, so players are always given the same colors and letters for the same board
+        for hex_coords in sorted(self.board.hexes, key=lambda c: (c.q, c.r)):
+            x, y = self._get_hex_center_coords(hex_coords)
+            x += center[0]
+            y += center[1]
+            for i, row in enumerate(self._get_hex(hex_coords)):
+                j = 0
+                for element, chars in row:
+                    if element not in seen:
+                        seen.add(element)
+                        layer.parts.append((element, chars))
+                    cells = self._get_static_part(element, chars)
+                    for index, cell in enumerate(cells):
+                        layer.cells[y + i][x + j] = cell
+                        owners[(y + i, x + j)] = (element, index)
+                        j += 1
+        for harbor in self.board.harbors.values():
+            x, y = self._get_harbor_coords(harbor)
+            harbor_cells = self._get_harbor(harbor)
+            self._copy_into_array(
+                layer.cells, harbor_cells, center[0] + x, center[1] + y
+            )
+            for i, row in enumerate(harbor_cells):
+                for j in range(len(row)):
+                    owners.pop((center[1] + y + i, center[0] + x + j), None)
+        for (row, column), (element, index) in owners.items():
+            layer.positions.setdefault(element, []).append((row, column, index))
+        self._static_layer = layer
+        return layer
+
+    def _get_cells(self, hex_labels, intersection_labels, path_labels):
+        layer = self._get_static_layer()
+        buf = [list(row) for row in layer.cells]
+        # Draw everything that has something built on it or a label over the static layer. The elements are
+        # drawn in the same order as the static layer so that players are given their colors in the same order
+        for element, chars in layer.parts:
+            if chars is None:
+                if element not in hex_labels:
+                    continue
+            elif (
+                element.building is None
+                and element not in intersection_labels
+                and element not in path_labels
+            ):
+                continue
+            cells = self._get_part(
+                element, chars, hex_labels, intersection_labels, path_labels
+            )
+            for row, column, index in layer.positions.get(element, ()):
+                buf[row][column] = cells[index]
+
+        center = layer.center
+        x, y = self._get_hex_center_coords(self.board.robber)
+        buf[center[1] + y + 1][center[0] + x + 4] = self._stylize(
+            "R", "#FFFFFF", "#000000"
+        )
+        return buf
+
     def get_coords_as_xy(self, coords: Coords) -> Tuple:
         """Get the coordinates given as x, y position.
 
@@ -213,7 +432,9 @@ class BoardRenderer:
         intersection_labels: Optional[Dict[Intersection, str]] = {},
         path_labels: Optional[Dict[Path, str]] = {},
     ) -> str:
-        """Get the board as a large, multiline string that includes colors.
+        """Get the board as a large, multiline string that includes colors, unless use_color is False.
+
+        Without colors, a legend of the players follows the board if anything has been built on it.
 
         Args:
             hex_labels: A dictionary of labels to put on the hexes instead of the numbered tokens
@@ -223,37 +444,11 @@ class BoardRenderer:
         Returns:
             str: The board as a string
         """
-        size = 20, 55
-        buf = [
-            [stylize(" ", bg(BoardRenderer.WATER_COLOR)) for j in range(size[1])]
-            for i in range(size[0])
-        ]
-
-        center = int(size[1] / 2) - 3, int(size[0] / 2) - 1
-
-        for hex_coords in self.board.hexes:
-            x, y = self._get_hex_center_coords(hex_coords)
-            self._copy_into_array(
-                buf,
-                self._get_hex(hex_coords, hex_labels, intersection_labels, path_labels),
-                center[0] + x,
-                center[1] + y,
-            )
-        for harbor in self.board.harbors.values():
-            x, y = self._get_harbor_coords(harbor)
-            self._copy_into_array(
-                buf, self._get_harbor(harbor), center[0] + x, center[1] + y
-            )
-
-        x, y = self._get_hex_center_coords(self.board.robber)
-        self._copy_into_array(
-            buf,
-            [[stylize("R", fg("#FFFFFF") + bg("#000000"))]],
-            center[0] + x + 4,
-            center[1] + y + 1,
-        )
-
-        return "\n".join(["".join(row) for row in buf])
+        buf = self._get_cells(hex_labels, intersection_labels, path_labels)
+        rows = ["".join(row) for row in buf]
+        if not self.use_color:
+            rows += self._get_plain_legend()
+        return "\n".join(rows)
 
     def render_board(
         self,
@@ -270,3 +465,88 @@ class BoardRenderer:
         """
         buf = self.get_board_as_string(hex_labels, intersection_labels, path_labels)
         print(buf)
+
+    def get_board_update_as_string(
+        self,
+        hex_labels: Optional[Dict[Hex, str]] = {},
+        intersection_labels: Optional[Dict[Intersection, str]] = {},
+        path_labels: Optional[Dict[Path, str]] = {},
+    ) -> str:
+        """Get what has to be written to a terminal to change the last frame into the board as it is now.
+
+        The renderer remembers the last frame it rendered with this method. The first frame clears the
+        terminal and draws the whole board in the top left corner. After that, only the cells that changed
+        (i.e. a new road, settlement or the robber moving) are written, each after a sequence that moves the
+        cursor to it. The cursor is always left on the line below the board.
+
+        Args:
+            hex_labels: A dictionary of labels to put on the hexes instead of the numbered tokens
+            intersection_labels: A dictionary of labels to put on the points
+            path_labels: A dictionary of labels to put on the paths
+
+        Returns:
+            str: The escape sequences and cells to write, or an empty string if nothing changed
+        """
+        buf = self._get_cells(hex_labels, intersection_labels, path_labels)
+        previous = self._previous_frame
+        self._previous_frame = buf
+        if previous is None or len(previous) != len(buf):
+            return "\x1b[2J\x1b[H" + "\n".join(["".join(row) for row in buf]) + "\n"
+        width = self._get_cell_width
+        out = []
+        for r, (old, new) in enumerate(zip(previous, buf)):
+            if old == new:
+                continue
+            # The display column of each cell has to be worked out, since labels can be wider than one column
+            column = 0
+            cursor = None
+            shifted = False
+            for c, cell in enumerate(new):
+                if shifted or c >= len(old) or cell is not old[c] and cell != old[c]:
+                    if cursor != column:
+                        out.append("\x1b[%d;%dH" % (r + 1, column + 1))
+                    out.append(cell)
+                    cursor = column + width(cell)
+                    if c >= len(old) or width(cell) != width(old[c]):
+                        # Everything after this cell moved, so it all has to be written again
+                        shifted = True
+                column += width(cell)
+            if shifted or len(old) > len(new):
+                out.append("\x1b[%d;%dH\x1b[K" % (r + 1, column + 1))
+        if not out:
+            return ""
+        out.append("\x1b[%d;1H" % (len(buf) + 1))
+        return "".join(out)
+
+    def render_board_update(
+        self,
+        hex_labels: Optional[Dict[Hex, str]] = {},
+        intersection_labels: Optional[Dict[Intersection, str]] = {},
+        path_labels: Optional[Dict[Path, str]] = {},
+    ):
+        """Update the board rendered in the terminal, only writing the cells that changed since the last update.
+
+        See get_board_update_as_string.
+
+        Args:
+            hex_labels: A dictionary of labels to put on the hexes instead of the numbered tokens
+            intersection_labels: A dictionary of labels to put on the points
+            path_labels: A dictionary of labels to put on the paths
+        """
+        update = self.get_board_update_as_string(
+            hex_labels, intersection_labels, path_labels
+        )
+        if update:
+            sys.stdout.write(update)
+            sys.stdout.flush()
+
+    def reset_live_render(self):
+        """Forget the last frame, so the next update draws the whole board again, i.e. after the terminal was cleared."""
+        self._previous_frame = None
+
+    def _get_cell_width(self, cell: str) -> int:
+        width = self._cell_widths.get(cell)
+        if width is None:
+            width = len(_ESCAPE_SEQUENCE.sub("", cell))
+            self._cell_widths[cell] = width
+        return width
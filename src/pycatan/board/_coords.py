@@ -18,6 +18,8 @@ class Coords:
         return hash((self.q, self.r))
 
     def __eq__(self, other):
+        if not isinstance(other, Coords):
+            return NotImplemented
         return self.q == other.q and self.r == other.r
 
     def __add__(self, other):
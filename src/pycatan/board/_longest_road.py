@@ -0,0 +1,133 @@
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from .._player import Player
+from ._coords import Coords
+
+
+def _get_roads(
+    board, player: Player, extra_roads: Iterable[FrozenSet[Coords]] = ()
+) -> Dict[Coords, List[Tuple[FrozenSet[Coords], Coords]]]:
+    # The player's roads at every intersection, with the intersection at their other end
+    roads: Dict[Coords, List[Tuple[FrozenSet[Coords], Coords]]] = {}
+    keys = [
+        k
+        for k, p in board.paths.items()
+        if p.building is not None and p.building.owner is player
+    ]
+    keys.extend(extra_roads)
+    for key in keys:
+        first, second = key
+        roads.setdefault(first, []).append((key, second))
+        roads.setdefault(second, []).append((key, first))
+    return roads
+
+
+def _get_blocked(board, player: Player, coords: Iterable[Coords]) -> Set[Coords]:
+    # The intersections with another player's building, which roads cannot go past
+    blocked = set()
+    for c in coords:
+        building = board.intersections[c].building
+        if building is not None and building.owner is not player:
+            blocked.add(c)
+    return blocked
+
+
+def _get_longest(
+    roads: Dict[Coords, List[Tuple[FrozenSet[Coords], Coords]]], blocked: Set[Coords]
+) -> int:
+    used: Set[FrozenSet[Coords]] = set()
+
+    def get_longest_from(coords: Coords) -> int:
+        longest = 0
+        for key, other in roads[coords]:
+            if key not in used:
+                used.add(key)
+                length = 1 if other in blocked else 1 + get_longest_from(other)
+                used.remove(key)
+                if length > longest:
+                    longest = length
+        return longest
+
+    return max((get_longest_from(c) for c in roads), default=0)
+
+
+def get_longest_road(
+    board, player: Player, extra_roads: Iterable[FrozenSet[Coords]] = ()
+) -> int:
+    """Get the length of the player's longest road, as if they had also built some other roads.
+
+    The board is not changed, so this can be used to score roads before building them.
+
+    Args:
+        board: The board
+        player: The player
+        extra_roads: The coordinates of the paths to count as the player's roads as well
+    Returns:
+        The number of roads in the longest road, which goes through each road at most once and does not go past
+        another player's building
+    """
+    roads = _get_roads(board, player, extra_roads)
+    return _get_longest(roads, _get_blocked(board, player, roads))
+
+
+class LongestRoadCache:
+    """The player's roads and longest road at one version of a board, to find the longest road with one more road.
+
+    Adding a road never makes a road shorter, so the longest road with the new road is either the current longest
+    road or the longest road that goes through the new road. Only the roads the new road connects to are searched.
+
+    Args:
+        board: The board
+        player: The player
+
+    Attributes:
+        version (int): The version of the board the cache is for
+        longest_road (int): The length of the player's longest road
+    """
+
+    def __init__(self, board, player: Player):
+        self.version = board.version
+        self._roads = _get_roads(board, player)
+        self._blocked = _get_blocked(board, player, self._roads)
+        self._board = board
+        self._player = player
+        self.longest_road = _get_longest(self._roads, self._blocked)
+
+    def get_longest_road_with(self, path_coords: FrozenSet[Coords]) -> int:
+        """Get the length of the player's longest road if they built a road on a path.
+
+        Args:
+            path_coords: The coordinates of the path, which should not have a building on it
+        Returns:
+            The number of roads in the longest road
+        """
+        first, second = path_coords
+        blocked = set(self._blocked)
+        blocked.update(_get_blocked(self._board, self._player, path_coords))
+        roads = self._roads
+        used = {path_coords}
+
+        # The longest road through the path goes on from its second end, and then the rest of it is the part before
+        # the first end. Both parts are searched together so they never use the same road
+        def get_before_first() -> int:
+            return 0 if first in blocked else get_longest_from(first, True)
+
+        def get_longest_from(coords: Coords, is_before_first: bool) -> int:
+            longest = 0 if is_before_first else get_before_first()
+            for key, other in roads.get(coords, ()):
+                if key not in used:
+                    used.add(key)
+                    if other not in blocked:
+                        length = 1 + get_longest_from(other, is_before_first)
+                    else:
+                        length = 1 + (0 if is_before_first else get_before_first())
+                    used.remove(key)
+                    if length > longest:
+                        longest = length
+            return longest
+
+        if second in blocked:
+            through = 1 + get_before_first()
+        else:
+            through = 1 + get_longest_from(second, False)
+        return max(self.longest_road, through)
@@ -1,3 +1,4 @@
+from typing import Optional
 import random
 
 from ._hex_type import HexType
@@ -9,9 +10,16 @@ from .._resource import Resource
 
 
 class RandomBoard(Board):
-    """A board where the hexes, numbered tokens and harbors are all shuffled randomly."""
+    """A board where the hexes, numbered tokens and harbors are all shuffled randomly.
 
-    def __init__(self):
+    Args:
+        rng: The random generator to shuffle the board with, i.e. a seeded one to always get the same board.
+            Defaults to the random module
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        if rng is None:
+            rng = random
         hex_deck = (
             [HexType.FOREST] * 4
             + [HexType.PASTURE] * 4
@@ -21,7 +29,7 @@ class RandomBoard(Board):
             + [HexType.DESERT]
         )
         token_deck = [5, 2, 6, 3, 8, 10, 9, 12, 11, 4, 8, 10, 9, 4, 5, 6, 3, 11]
-        random.shuffle(hex_deck)
+        rng.shuffle(hex_deck)
         hex_coords = [
             Coords(4, -2),
             Coords(3, 0),
@@ -62,7 +70,7 @@ class RandomBoard(Board):
             Resource.WOOL,
             Resource.GRAIN,
         ] + 4 * [None]
-        random.shuffle(harbor_deck)
+        rng.shuffle(harbor_deck)
         harbor_coords = {
             frozenset({Coords(5, -2), Coords(5, -3)}),
             frozenset({Coords(4, 0), Coords(3, 1)}),
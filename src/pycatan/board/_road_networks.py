@@ -0,0 +1,170 @@
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set
+
+from .._player import Player
+from ._coords import Coords
+
+
+class RoadNetworks:
+    """The connected road networks of one player, kept up to date as buildings are added to the board.
+
+    The player's roads and buildings are the elements of a union-find (disjoint set) structure. Two roads are in
+    the same network if they meet at an intersection without another player's building on it, and a road is in
+    the same network as the player's building at either of its ends. Adding one of the player's roads or buildings
+    only merges networks, in almost constant time. Another player's building can split a network, so the networks
+    that meet at it are rebuilt, which only visits the elements of those networks.
+
+    Each network is identified by one of its elements (the coordinates of a road or building), which stays the same
+    until the network is merged or split.
+
+    Args:
+        board: The board
+        player: The player whose networks to keep
+    """
+
+    def __init__(self, board, player: Player):
+        self._parent: Dict[Hashable, Hashable] = {}
+        # The elements of every network, keyed by the network's root
+        self._members: Dict[Hashable, List[Hashable]] = {}
+        # The player's roads at every intersection
+        self._roads_at: Dict[Coords, List[FrozenSet[Coords]]] = {}
+        # The player's buildings
+        self._buildings: Set[Coords] = set()
+        elements = []
+        for key, path in board.paths.items():
+            if path.building is not None and path.building.owner is player:
+                self._make_set(key)
+                for coords in key:
+                    self._roads_at.setdefault(coords, []).append(key)
+                elements.append(key)
+        for coords, intersection in board.intersections.items():
+            if (
+                intersection.building is not None
+                and intersection.building.owner is player
+            ):
+                self._make_set(coords)
+                self._buildings.add(coords)
+                elements.append(coords)
+        self._connect(board, player, elements)
+
+    def find(self, element: Hashable) -> Hashable:
+        """Get the network of one of the player's roads or buildings.
+
+        Args:
+            element: The coordinates of the road (a frozenset of two intersection coordinates) or building
+        Raises:
+            KeyError: If the player has no road or building there
+        Returns:
+            The element that identifies the network
+        """
+        parent = self._parent
+        while parent[element] != element:
+            # Path halving, so later lookups of the same elements are shorter
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def get_networks_at(self, coords: Coords) -> Set[Hashable]:
+        """Get the networks that reach an intersection.
+
+        Args:
+            coords: The coordinates of the intersection
+        Returns:
+            The elements that identify the networks. There can be several if another player's building splits them
+        """
+        networks = {self.find(key) for key in self._roads_at.get(coords, ())}
+        if coords in self._buildings:
+            networks.add(self.find(coords))
+        return networks
+
+    def has_road_at(self, coords: Coords) -> bool:
+        """Check whether the player has a road at an intersection.
+
+        Args:
+            coords: The coordinates of the intersection
+        Returns:
+            Whether one of the player's roads ends at the intersection
+        """
+        return coords in self._roads_at
+
+    def add_road(self, board, player: Player, key: FrozenSet[Coords]):
+        """Add a road the player has built.
+
+        Args:
+            board: The board, with the road on it
+            player: The player
+            key: The coordinates of the road
+        """
+        self._make_set(key)
+        for coords in key:
+            self._roads_at.setdefault(coords, []).append(key)
+        self._connect(board, player, [key])
+
+    def add_building(self, board, player: Player, coords: Coords):
+        """Add a building that has been built on the board, by the player or another player.
+
+        Args:
+            board: The board, with the building on it
+            player: The player whose networks these are
+            coords: The coordinates of the building
+        """
+        if board.intersections[coords].building.owner is player:
+            if coords not in self._buildings:
+                self._make_set(coords)
+                self._buildings.add(coords)
+                self._connect(board, player, [coords])
+            return
+        roads = self._roads_at.get(coords, ())
+        if len(roads) < 2:
+            return
+        # The roads that met at the intersection may no longer be connected, so rebuild the networks they are in
+        roots = {self.find(key) for key in roads}
+        elements = [e for root in roots for e in self._members.pop(root)]
+        for element in elements:
+            self._parent[element] = element
+            self._members[element] = [element]
+        self._connect(board, player, elements)
+
+    def copy(self) -> "RoadNetworks":
+        """Get a copy of the networks, i.e. for a copy of the board.
+
+        Returns:
+            The copy
+        """
+        networks = RoadNetworks.__new__(RoadNetworks)
+        networks._parent = dict(self._parent)
+        networks._members = {k: list(v) for k, v in self._members.items()}
+        networks._roads_at = {k: list(v) for k, v in self._roads_at.items()}
+        networks._buildings = set(self._buildings)
+        return networks
+
+    def _make_set(self, element: Hashable):
+        self._parent[element] = element
+        self._members[element] = [element]
+
+    def _union(self, first: Hashable, second: Hashable):
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            return
+        # Merge the smaller network into the larger one, so every element is moved at most a logarithmic number of times
+        if len(self._members[first]) < len(self._members[second]):
+            first, second = second, first
+        self._parent[second] = first
+        self._members[first].extend(self._members.pop(second))
+
+    def _connect(self, board, player: Player, elements: Iterable[Hashable]):
+        # Merge the networks of the elements with the networks of what they touch
+        for element in elements:
+            if isinstance(element, Coords):
+                for key in self._roads_at.get(element, ()):
+                    self._union(element, key)
+                continue
+            for coords in element:
+                building = board.intersections[coords].building
+                if building is not None and building.owner is not player:
+                    # Another player's building cuts off the roads going through it
+                    continue
+                for key in self._roads_at[coords]:
+                    self._union(element, key)
+                if building is not None:
+                    self._union(element, coords)
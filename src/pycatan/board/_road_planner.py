@@ -0,0 +1,205 @@
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional
+from itertools import count
+import heapq
+
+from .._player import Player
+from ._coords import Coords
+
+
+class RoadPlanner:
+    """The fewest roads a player needs to build to reach every intersection, as returned by ``Board.plan_roads()``.
+
+    The distances are found with a breadth first search over the free paths, starting from every intersection the
+    player's roads or buildings already reach. Another player's building can be reached, but roads cannot be built
+    on past it. The planner tracks the changes made to the board, and only searches again from the parts of the
+    board that changed the next time it is read: the player's new roads and buildings only shorten distances, and
+    another player's building or road only lengthens the distances of the intersections that were reached through it.
+
+    Args:
+        board: The board
+        player: The player building the roads
+    """
+
+    def __init__(self, board, player: Player):
+        self.board = board
+        self.player = player
+        # The intersections connected to each intersection, which never change
+        self._neighbors: Dict[Coords, List[Coords]] = {
+            c: [] for c in board.intersections
+        }
+        for first, second in board.paths:
+            self._neighbors[first].append(second)
+            self._neighbors[second].append(first)
+        self._changes = board.track_changes()
+        self._distances: Dict[Coords, int] = {}
+        # The intersection each intersection is reached from, or None if the player already reaches it
+        self._parents: Dict[Coords, Optional[Coords]] = {}
+        self._search(self._get_starts(board.intersections))
+
+    def get_distance(self, coords: Coords) -> Optional[int]:
+        """Get the number of roads the player needs to build to reach an intersection.
+
+        Args:
+            coords: The coordinates of the intersection
+        Returns:
+            The number of roads, which is 0 if the player already reaches it, or None if it cannot be reached
+        """
+        self.update()
+        return self._distances.get(coords)
+
+    def get_distances(self) -> Dict[Coords, int]:
+        """Get the number of roads the player needs to build to reach every intersection it can reach.
+
+        Returns:
+            The number of roads, keyed by the coordinates of the intersections
+        """
+        self.update()
+        return dict(self._distances)
+
+    def get_roads_to(self, coords: Coords) -> Optional[List[FrozenSet[Coords]]]:
+        """Get the roads the player needs to build to reach an intersection.
+
+        Args:
+            coords: The coordinates of the intersection
+        Returns:
+            The coordinates of the paths, in the order they can be built, or None if the intersection cannot be
+            reached
+        """
+        self.update()
+        if coords not in self._distances:
+            return None
+        return self._get_roads_to(coords)
+
+    def get_all_roads(self) -> Dict[Coords, List[FrozenSet[Coords]]]:
+        """Get the roads the player needs to build to reach every intersection it can reach.
+
+        Returns:
+            The coordinates of the paths, in the order they can be built, keyed by the coordinates of the
+            intersections
+        """
+        self.update()
+        return {c: self._get_roads_to(c) for c in self._distances}
+
+    def update(self):
+        """Update the distances with the buildings added to the board since they were last updated.
+
+        This is called by the other methods, so it only needs to be called to choose when the work is done.
+        """
+        changes = self._changes
+        if not changes.is_dirty:
+            return
+        board = self.board
+        player = self.player
+        starts = set()
+        # Intersections whose search tree has to be cut off below them
+        cut = set()
+        for key in changes.paths:
+            if board.paths[key].building.owner is player:
+                starts.update(key)
+                continue
+            first, second = key
+            if self._parents.get(first) == second:
+                cut.add(first)
+            elif self._parents.get(second) == first:
+                cut.add(second)
+        for coords in changes.intersections:
+            if board.intersections[coords].building.owner is player:
+                starts.add(coords)
+            else:
+                # Roads built past the building are no longer possible
+                cut.update(c for c, p in self._parents.items() if p == coords)
+        changes.clear()
+        if cut:
+            self._repair(cut)
+        if starts:
+            self._search(starts)
+
+    def _get_starts(self, intersections: Iterable[Coords]) -> List[Coords]:
+        # The intersections the player already reaches
+        board = self.board
+        player = self.player
+        starts = []
+        for coords in intersections:
+            building = board.intersections[coords].building
+            if building is not None and building.owner is player:
+                starts.append(coords)
+                continue
+            for c in self._neighbors[coords]:
+                road = board.paths[frozenset((coords, c))].building
+                if road is not None and road.owner is player:
+                    starts.append(coords)
+                    break
+        return starts
+
+    def _get_roads_to(self, coords: Coords) -> List[FrozenSet[Coords]]:
+        roads = []
+        parent = self._parents[coords]
+        while parent is not None:
+            roads.append(frozenset((parent, coords)))
+            coords = parent
+            parent = self._parents[coords]
+        roads.reverse()
+        return roads
+
+    def _search(self, starts: Iterable[Coords]):
+        # Reach the starts without any roads, and update every intersection that is reached in fewer roads from them
+        counter = count()
+        queue = []
+        for coords in starts:
+            self._distances[coords] = 0
+            self._parents[coords] = None
+            heapq.heappush(queue, (0, next(counter), coords))
+        self._relax(queue, counter)
+
+    def _repair(self, cut: Iterable[Coords]):
+        # Forget the distances of the intersections reached through the cut ones, since they may have been reached
+        # through a path or intersection that is now blocked, and reach them again from their neighbors
+        children: Dict[Coords, List[Coords]] = {}
+        for coords, parent in self._parents.items():
+            if parent is not None:
+                children.setdefault(parent, []).append(coords)
+        lost = set()
+        stack = list(cut)
+        while stack:
+            coords = stack.pop()
+            if coords in lost:
+                continue
+            lost.add(coords)
+            stack.extend(children.get(coords, ()))
+        for coords in lost:
+            del self._distances[coords]
+            del self._parents[coords]
+        counter = count()
+        queue = []
+        for coords in lost:
+            for c in self._neighbors[coords]:
+                if c in self._distances and self._can_build(c, coords):
+                    heapq.heappush(queue, (self._distances[c], next(counter), c))
+        self._relax(queue, counter)
+
+    def _relax(self, queue: list, counter: Iterator[int]):
+        distances = self._distances
+        parents = self._parents
+        while queue:
+            distance, _, coords = heapq.heappop(queue)
+            if distance != distances[coords]:
+                # Reached in fewer roads since it was queued
+                continue
+            building = self.board.intersections[coords].building
+            if building is not None and building.owner is not self.player:
+                # Another player's building cuts off the roads going past it
+                continue
+            for c in self._neighbors[coords]:
+                if distance + 1 < distances.get(c, distance + 2) and self._can_build(
+                    coords, c
+                ):
+                    distances[c] = distance + 1
+                    parents[c] = coords
+                    heapq.heappush(queue, (distance + 1, next(counter), c))
+
+    def _can_build(self, first: Coords, second: Coords) -> bool:
+        # Whether a road can be built from the first intersection, which is reached, to the second
+        building = self.board.intersections[first].building
+        if building is not None and building.owner is not self.player:
+            return False
+        return self.board.paths[frozenset((first, second))].building is None
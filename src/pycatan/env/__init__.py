@@ -0,0 +1,15 @@
+"""Submodule with environments for training agents to play Catan, i.e. with reinforcement learning."""
+
+from ._catan_env import CatanEnv
+from ._dataset import Dataset, DatasetWriter, export_games
+from ._observation_encoder import ObservationEncoder
+from ._vector_env import VectorEnv
+
+__all__ = [
+    "CatanEnv",
+    "Dataset",
+    "DatasetWriter",
+    "ObservationEncoder",
+    "VectorEnv",
+    "export_games",
+]
@@ -0,0 +1,155 @@
+from typing import Callable, Optional
+from array import array
+import random
+
+from .._game import Game
+from .._turn_machine import TurnMachine
+from .._action_space import ActionSpace
+from .._action_type import ActionType
+from ..board._board import Board
+from ..board._random_board import RandomBoard
+from ._observation_encoder import ObservationEncoder
+
+
+class CatanEnv:
+    """An environment that plays games of Catan with a fixed, discrete action space.
+
+    Every action is an integer from the turn machine's action space, and after every step the environment
+    writes the observation of the game (see ObservationEncoder) into ``observation`` and which actions are legal
+    into ``action_mask``. The observation, mask and rewards are kept in buffers that are updated in place,
+    so they can be wrapped once (i.e. with ``numpy.frombuffer``) and read after every step without copying.
+
+    Args:
+        num_players: The number of players. Defaults to 4
+        board_factory: A function that creates the board for a new game from the environment's random generator.
+            All the boards must have the same layout. Defaults to creating a RandomBoard
+        victory_points_to_win: How many victory points a player needs to win. Defaults to 10
+        max_turns: The number of turns after which a game ends without a winner, or None to play until someone wins.
+            Defaults to None
+        seed: The seed for the first game. Defaults to None
+        observation: A writable buffer to write the observation into. If None, a new bytearray is used
+        action_mask: A writable buffer of one byte per action to write the legal action mask into.
+            If None, a new bytearray is used
+        rewards: A writable buffer of one float per player to write the rewards into. If None, a new array is used
+
+    Attributes:
+        machine (TurnMachine): The turn machine running the current game
+        observation: The observation of the current state
+        action_mask: The legal action mask of the current state, one byte per action
+        rewards: The rewards each player got from the last step. The winner gets 1 on the step that ends the game,
+            every other reward is 0
+    """
+
+    def __init__(
+        self,
+        num_players: Optional[int] = 4,
+        board_factory: Optional[Callable[[random.Random], Board]] = None,
+        victory_points_to_win: Optional[int] = 10,
+        max_turns: Optional[int] = None,
+        seed: Optional[int] = None,
+        observation=None,
+        action_mask=None,
+        rewards=None,
+    ):
+        self.num_players = num_players
+        self.board_factory = (
+            board_factory if board_factory is not None else lambda rng: RandomBoard(rng)
+        )
+        self.victory_points_to_win = victory_points_to_win
+        self.max_turns = max_turns
+        self._rng = random.Random(seed)
+        self.rewards = (
+            rewards if rewards is not None else array("f", [0.0] * num_players)
+        )
+        self._new_game(seed)
+        self.observation = (
+            observation
+            if observation is not None
+            else bytearray(
+                ObservationEncoder.get_size(self.machine.board_index, num_players)
+            )
+        )
+        self.action_mask = (
+            action_mask
+            if action_mask is not None
+            else bytearray(self.action_space.size)
+        )
+        self._write_state()
+
+    @property
+    def game(self) -> Game:
+        """The game currently being played."""
+        return self.machine.game
+
+    @property
+    def action_space(self) -> ActionSpace:
+        """The action space of the environment."""
+        return self.machine.action_space
+
+    @property
+    def acting_player_index(self) -> int:
+        """The index of the player who chooses the next action."""
+        return self.machine.acting_player_index
+
+    @property
+    def is_over(self) -> bool:
+        """Whether the current game has finished."""
+        return self.machine.is_over
+
+    def reset(self, seed: Optional[int] = None):
+        """Start a new game.
+
+        Args:
+            seed: The seed to use for the new game. If None, keeps using the environment's random generator
+        """
+        self._new_game(seed)
+        self._write_state()
+
+    def _new_game(self, seed: Optional[int]):
+        if seed is not None:
+            self._rng.seed(seed)
+        game = Game(self.board_factory(self._rng), self.num_players)
+        self.machine = TurnMachine(
+            game,
+            victory_points_to_win=self.victory_points_to_win,
+            max_turns=self.max_turns,
+            rng=self._rng,
+        )
+        for i in range(self.num_players):
+            self.rewards[i] = 0.0
+
+    def _write_state(self):
+        self._encoder = ObservationEncoder(
+            self.game, self.machine.board_index, self.observation
+        )
+        self.machine.get_legal_action_mask(self.action_mask)
+
+    def step(self, action: int) -> bool:
+        """Take an action, and update the observation, action mask and rewards.
+
+        Only the parts of the observation that the action could have changed are written again.
+
+        Args:
+            action: The action to take
+        Raises:
+            ValueError: If the action is not legal
+        Returns:
+            Whether the game is over
+        """
+        self.machine.step(action)
+        action_type, argument = self.action_space.decode(action)
+        if (
+            action_type is ActionType.BUILD_SETTLEMENT
+            or action_type is ActionType.BUILD_CITY
+        ):
+            self._encoder.update_intersection(argument)
+        elif action_type is ActionType.BUILD_ROAD:
+            self._encoder.update_path(argument)
+        self._encoder.update_robber()
+        self._encoder.update_players()
+        for i in range(self.num_players):
+            self.rewards[i] = 0.0
+        if self.machine.winner is not None:
+            self.rewards[self.game.players.index(self.machine.winner)] = 1.0
+        self.machine.get_legal_action_mask(self.action_mask)
+        return self.machine.is_over
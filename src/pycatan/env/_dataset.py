@@ -0,0 +1,353 @@
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+import ast
+import contextlib
+import mmap
+import os
+import random
+import struct
+
+from .._turn_machine import TurnMachine
+from ._catan_env import CatanEnv
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# The length of the header, padded so that the data is aligned and the header can be rewritten in place
+# with a larger number of rows
+_NPY_HEADER_SIZE = 128
+
+# The file name, numpy dtype and array typecode of each column. The observations are one row of bytes per state
+_COLUMNS: List[Tuple[str, str, str]] = [
+    ("observations", "|u1", "B"),
+    ("actions", "<i4", "i"),
+    ("players", "|u1", "B"),
+]
+
+
+def _get_npy_header(dtype: str, shape: Tuple[int, ...]) -> bytes:
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%s), }" % (
+        dtype,
+        "".join("%d," % n for n in shape),
+    )
+    padding = _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2 - len(header) - 1
+    return (
+        _NPY_MAGIC
+        + struct.pack("<H", _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2)
+        + header.encode("latin1")
+        + b" " * padding
+        + b"\n"
+    )
+
+
+def _read_npy_header(data) -> Tuple[str, Tuple[int, ...], int]:
+    if bytes(data[: len(_NPY_MAGIC) - 2]) != _NPY_MAGIC[:-2]:
+        raise ValueError("Not a .npy file")
+    major = data[len(_NPY_MAGIC) - 2]
+    if major == 1:
+        (length,) = struct.unpack_from("<H", data, len(_NPY_MAGIC))
+        start = len(_NPY_MAGIC) + 2
+    else:
+        (length,) = struct.unpack_from("<I", data, len(_NPY_MAGIC))
+        start = len(_NPY_MAGIC) + 4
+    end = start + length
+    header = ast.literal_eval(bytes(data[start:end]).decode("latin1"))
+    if header["fortran_order"]:
+        raise ValueError("Arrays in Fortran order are not supported")
+    return header["descr"], tuple(header["shape"]), end
+
+
+class DatasetWriter:
+    """Writes encoded game states and the action taken in each of them to a directory of .npy files, one per column.
+
+    The columns are ``observations.npy`` (one row of ``observation_size`` bytes per state, see ObservationEncoder),
+    ``actions.npy`` (the action taken, as int32) and ``players.npy`` (the index of the player who took the action).
+    The rows are written as they are added, so datasets much larger than memory can be written, and the
+    number of rows in the headers is updated when the writer is flushed or closed.
+    The files are standard .npy files, so they can also be opened with ``numpy.load(path, mmap_mode="r")``.
+
+    Args:
+        directory: The directory to write the files to. It is created if it does not exist, and existing
+            files are replaced
+        observation_size: The number of bytes in each observation
+        buffer_size: The number of bytes each file collects before writing them. Defaults to 1MiB
+
+    Attributes:
+        directory (str): The directory the files are written to
+        observation_size (int): The number of bytes in each observation
+        num_rows (int): The number of rows written so far
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        observation_size: int,
+        buffer_size: Optional[int] = 1 << 20,
+    ):
+        self.directory = directory
+        self.observation_size = observation_size
+        self.num_rows = 0
+        os.makedirs(directory, exist_ok=True)
+        with contextlib.ExitStack() as stack:
+            # The files that were opened are closed if another one cannot be opened or written
+            self._files = [
+                stack.enter_context(
+                    open(os.path.join(directory, name + ".npy"), "wb", buffering=buffer_size)
+                )
+                for name, _, _ in _COLUMNS
+            ]
+            self._write_headers()
+            stack.pop_all()
+        self._action = struct.Struct("<i")
+
+    def _write_headers(self):
+        shapes = [
+            (self.num_rows, self.observation_size),
+            (self.num_rows,),
+            (self.num_rows,),
+        ]
+        for f, (_, dtype, _), shape in zip(self._files, _COLUMNS, shapes):
+            position = f.tell()
+            f.seek(0)
+            f.write(_get_npy_header(dtype, shape))
+            if position > 0:
+                f.seek(position)
+
+    def add(self, observation, action: int, player: int):
+        """Add a row.
+
+        Args:
+            observation: The encoded state, i.e. ``CatanEnv.observation``
+            action: The action that was taken in the state
+            player: The index of the player who took the action
+        Raises:
+            ValueError: If the observation is not ``observation_size`` bytes
+        """
+        if len(observation) != self.observation_size:
+            raise ValueError(
+                "The observation must have %d bytes, received %d"
+                % (self.observation_size, len(observation))
+            )
+        observations, actions, players = self._files
+        observations.write(observation)
+        actions.write(self._action.pack(action))
+        players.write(bytes((player,)))
+        self.num_rows += 1
+
+    def flush(self):
+        """Update the number of rows in the headers, and write everything to the files."""
+        self._write_headers()
+        for f in self._files:
+            f.flush()
+
+    def close(self):
+        """Update the headers and close the files."""
+        if self._files[0].closed:
+            return
+        self._write_headers()
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def export_games(
+    directory: str,
+    num_games: int,
+    choose_action: Optional[Callable[[TurnMachine], int]] = None,
+    seed: Optional[int] = None,
+    **env_args,
+) -> int:
+    """Play games and write every state and the action chosen in it to a dataset.
+
+    Args:
+        directory: The directory to write the dataset to (see DatasetWriter)
+        num_games: The number of games to play
+        choose_action: The function that chooses the action for the turn machine, i.e. ``MCTSAgent.choose_action``.
+            Defaults to choosing a random legal action
+        seed: The seed of the first game and of the random actions. Defaults to None
+        env_args: The arguments of the CatanEnv used to play the games, i.e. ``max_turns``
+    Returns:
+        The number of rows written
+    """
+    rng = random.Random(seed)
+    env = CatanEnv(seed=seed, **env_args)
+    with DatasetWriter(directory, len(env.observation)) as writer:
+        for i in range(num_games):
+            if i > 0:
+                env.reset()
+            while not env.is_over:
+                machine = env.machine
+                if choose_action is None:
+                    action = rng.choice(machine.legal_actions())
+                else:
+                    action = choose_action(machine)
+                writer.add(env.observation, action, machine.acting_player_index)
+                env.step(action)
+        return writer.num_rows
+
+
+class Dataset:
+    """Reads a dataset written by DatasetWriter without loading it into memory.
+
+    The files are memory mapped, so only the rows that are used are read from the disk, and the operating
+    system caches them between epochs. Rows and batches are returned as buffers, which can be wrapped with
+    ``numpy.frombuffer`` without copying.
+
+    Args:
+        directory: The directory the dataset was written to
+
+    Attributes:
+        directory (str): The directory the dataset is read from
+        observation_size (int): The number of bytes in each observation
+        observations (memoryview): All the observations, one after the other
+        actions (memoryview): The action of each row, as ints
+        players (memoryview): The player of each row
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._files = []
+        self._mmaps = []
+        # Every view of the files, which have to be released before the files can be closed
+        self._views: List[memoryview] = []
+        columns: Dict[str, memoryview] = {}
+        shapes = {}
+        with contextlib.ExitStack() as stack:
+            # Everything that was opened is closed again if a file cannot be read
+            for name, dtype, typecode in _COLUMNS:
+                f = stack.enter_context(open(os.path.join(directory, name + ".npy"), "rb"))
+                self._files.append(f)
+                data = stack.enter_context(
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+                self._mmaps.append(data)
+                file_dtype, shape, start = _read_npy_header(data)
+                if file_dtype != dtype:
+                    raise ValueError(
+                        "%s.npy should contain %s, not %s" % (name, dtype, file_dtype)
+                    )
+                view = stack.enter_context(memoryview(data))
+                self._views.append(view)
+                end = start + shape[0] * array(typecode).itemsize * (
+                    shape[1] if len(shape) > 1 else 1
+                )
+                if len(view) < end:
+                    raise ValueError("%s.npy is shorter than its header says" % name)
+                view = stack.enter_context(view[start:end].cast(typecode))
+                self._views.append(view)
+                columns[name] = view
+                shapes[name] = shape
+            num_rows = shapes["observations"][0]
+            if shapes["actions"][0] != num_rows or shapes["players"][0] != num_rows:
+                raise ValueError("The columns of the dataset have different lengths")
+            stack.pop_all()
+        self.observation_size = shapes["observations"][1]
+        self.observations = columns["observations"]
+        self.actions = columns["actions"]
+        self.players = columns["players"]
+        self._num_rows = num_rows
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def __getitem__(self, index: int) -> Tuple[memoryview, int, int]:
+        """Get a row of the dataset.
+
+        Args:
+            index: The index of the row
+        Returns:
+            The observation (without copying it), the action and the player
+        """
+        if index < 0:
+            index += self._num_rows
+        if not 0 <= index < self._num_rows:
+            raise IndexError("Row %d is not in the dataset" % index)
+        start = index * self.observation_size
+        end = start + self.observation_size
+        return self.observations[start:end], self.actions[index], self.players[index]
+
+    def get_batch(
+        self, indices, observations=None, actions=None, players=None
+    ) -> Tuple[bytearray, array, bytearray]:
+        """Copy some rows of the dataset into contiguous buffers.
+
+        Args:
+            indices: The indices of the rows
+            observations: A writable buffer of ``len(indices) * observation_size`` bytes to copy the observations
+                into, i.e. to reuse the same buffer for every batch. If None, a new bytearray is created
+            actions: A writable buffer of ``len(indices)`` int32s to copy the actions into. If None, a new array is
+                created
+            players: A writable buffer of ``len(indices)`` bytes to copy the players into. If None, a new bytearray
+                is created
+        Returns:
+            The observations, actions and players of the rows, in the order of the indices
+        """
+        size = self.observation_size
+        if observations is None:
+            observations = bytearray(len(indices) * size)
+        if actions is None:
+            actions = array("i", bytes(4 * len(indices)))
+        if players is None:
+            players = bytearray(len(indices))
+        out = memoryview(observations).cast("B")
+        source = self.observations
+        for i, index in enumerate(indices):
+            start = index * size
+            end = start + size
+            row = i * size
+            row_end = row + size
+            out[row:row_end] = source[start:end]
+            actions[i] = self.actions[index]
+            players[i] = self.players[index]
+        return observations, actions, players
+
+    def sample_batch(
+        self,
+        batch_size: int,
+        rng: Optional[random.Random] = None,
+        observations=None,
+        actions=None,
+        players=None,
+    ) -> Tuple[bytearray, array, bytearray]:
+        """Copy a random minibatch of rows into contiguous buffers.
+
+        The rows are read in the order they are stored in, which is faster when the dataset is not cached.
+
+        Args:
+            batch_size: The number of rows to sample, without replacement
+            rng: The random generator to sample with. Defaults to the random module
+            observations: See ``get_batch()``
+            actions: See ``get_batch()``
+            players: See ``get_batch()``
+        Raises:
+            ValueError: If batch_size is larger than the dataset
+        Returns:
+            The observations, actions and players of the rows
+        """
+        rng = rng if rng is not None else random
+        indices = sorted(rng.sample(range(self._num_rows), batch_size))
+        return self.get_batch(indices, observations, actions, players)
+
+    def close(self):
+        """Close the files of the dataset.
+
+        The buffers of the dataset cannot be used after this.
+
+        Raises:
+            BufferError: If a row returned by ``dataset[i]`` is still being used
+        """
+        for view in reversed(self._views):
+            view.release()
+        for data in self._mmaps:
+            data.close()
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
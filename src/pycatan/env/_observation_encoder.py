@@ -0,0 +1,218 @@
+from typing import Dict, Optional
+
+from .._game import Game
+from .._resource import Resource
+from .._development_card import DevelopmentCard
+from ..board._board_index import BoardIndex
+from ..board._building_type import BuildingType
+from ..board._hex_type import HexType
+
+_RESOURCES = list(Resource)
+_DEVELOPMENT_CARDS = list(DevelopmentCard)
+
+
+class ObservationEncoder:
+    """Encodes the state of a game as a flat array of bytes, i.e. for a neural network.
+
+    The observation is made of the following sections, one after the other. Players are in the same
+    order as ``game.players``, and hexes, intersections and paths are numbered by the board index.
+
+    * hex_types: A one-hot encoding of each hex's type, 6 bytes per hex
+    * hex_tokens: The number on each hex's token, or 0 for no token
+    * harbors: For each intersection, a one-hot encoding of the harbor attached to it. The first byte is
+      for 3:1 harbors, the others for the 2:1 harbors of each resource
+    * robber: 1 for the hex the robber is on, 0 for the others
+    * settlements: For each player, 1 for every intersection they have a settlement on
+    * cities: For each player, 1 for every intersection they have a city on
+    * roads: For each player, 1 for every path they have a road on
+    * resources: For each player, how many of each resource they have
+    * development_cards: For each player, how many of each development card they have
+    * played_knights: How many knight cards each player has played
+    * longest_road_owner: 1 for the player who has the longest road
+    * largest_army_owner: 1 for the player who has the largest army
+    * development_card_deck: How many cards are left in the development card deck
+
+    The hexes and harbors are only written once. After that the observation is updated piece by piece with
+    the ``update_*`` methods, so that only the parts of the board that changed are written again.
+    Counts above 255 are written as 255.
+
+    Args:
+        game: The game to encode
+        board_index: The index of the game's board, to avoid building a new one. Defaults to None
+        out: A writable buffer of ``size`` bytes to write the observation into, i.e. a bytearray or a row of a
+            numpy uint8 array. If None, a new bytearray is created
+
+    Attributes:
+        game (Game): The game being encoded
+        board_index (BoardIndex): The index of the game's board
+        size (int): The number of bytes in the observation
+        offsets (Dict[str, int]): Where each section of the observation starts
+        observation: The buffer the observation is written into
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        board_index: Optional[BoardIndex] = None,
+        out=None,
+    ):
+        self.game = game
+        self.board_index = (
+            board_index if board_index is not None else BoardIndex(game.board)
+        )
+        self.offsets = ObservationEncoder._get_offsets(
+            self.board_index, len(game.players)
+        )
+        self.size = self.offsets["end"]
+        self.observation = out if out is not None else bytearray(self.size)
+        self._buffer = memoryview(self.observation).cast("B")
+        if len(self._buffer) != self.size:
+            raise ValueError(
+                "The observation buffer must have %d bytes, received %d"
+                % (self.size, len(self._buffer))
+            )
+        self._intersections = [
+            game.board.intersections[c] for c in self.board_index.intersection_coords
+        ]
+        self._paths = [game.board.paths[c] for c in self.board_index.path_coords]
+        self._robber = None
+        self.encode()
+
+    @staticmethod
+    def get_size(board_index: BoardIndex, num_players: int) -> int:
+        """Get the size of the observations of games on a board.
+
+        Useful to allocate a batch of observations before creating the encoders.
+
+        Args:
+            board_index: The index of the board
+            num_players: The number of players in the game
+        Returns:
+            The number of bytes in an observation
+        """
+        return ObservationEncoder._get_offsets(board_index, num_players)["end"]
+
+    @staticmethod
+    def _get_offsets(board_index: BoardIndex, num_players: int) -> Dict[str, int]:
+        num_hexes = len(board_index.hex_coords)
+        num_intersections = len(board_index.intersection_coords)
+        num_paths = len(board_index.path_coords)
+        sizes = [
+            ("hex_types", num_hexes * len(HexType)),
+            ("hex_tokens", num_hexes),
+            ("harbors", num_intersections * (len(Resource) + 1)),
+            ("robber", num_hexes),
+            ("settlements", num_players * num_intersections),
+            ("cities", num_players * num_intersections),
+            ("roads", num_players * num_paths),
+            ("resources", num_players * len(Resource)),
+            ("development_cards", num_players * len(DevelopmentCard)),
+            ("played_knights", num_players),
+            ("longest_road_owner", num_players),
+            ("largest_army_owner", num_players),
+            ("development_card_deck", 1),
+        ]
+        offsets = {}
+        total = 0
+        for name, size in sizes:
+            offsets[name] = total
+            total += size
+        offsets["end"] = total
+        return offsets
+
+    def encode(self):
+        """Write the whole observation from scratch."""
+        buf = self._buffer
+        buf[:] = bytes(self.size)
+        index = self.board_index
+        board = self.game.board
+        offset = self.offsets["hex_types"]
+        for i, coords in enumerate(index.hex_coords):
+            buf[offset + i * len(HexType) + board.hexes[coords].hex_type.value] = 1
+        offset = self.offsets["hex_tokens"]
+        for i, coords in enumerate(index.hex_coords):
+            buf[offset + i] = board.hexes[coords].token_number or 0
+        offset = self.offsets["harbors"]
+        for harbor in board.harbors.values():
+            value = 0 if harbor.resource is None else harbor.resource.value + 1
+            for coords in harbor.path_coords:
+                if coords in index.intersection_indices:
+                    i = index.intersection_indices[coords]
+                    buf[offset + i * (len(Resource) + 1) + value] = 1
+        self._robber = None
+        self.update_robber()
+        for i in range(len(self._intersections)):
+            self.update_intersection(i)
+        for i in range(len(self._paths)):
+            self.update_path(i)
+        self.update_players()
+
+    def update_intersection(self, index: int):
+        """Write the building on an intersection again.
+
+        Args:
+            index: The index of the intersection
+        """
+        buf = self._buffer
+        num_intersections = len(self._intersections)
+        settlements = self.offsets["settlements"] + index
+        cities = self.offsets["cities"] + index
+        for p in range(len(self.game.players)):
+            buf[settlements + p * num_intersections] = 0
+            buf[cities + p * num_intersections] = 0
+        building = self._intersections[index].building
+        if building is not None:
+            p = self.game.players.index(building.owner)
+            if building.building_type is BuildingType.CITY:
+                buf[cities + p * num_intersections] = 1
+            else:
+                buf[settlements + p * num_intersections] = 1
+
+    def update_path(self, index: int):
+        """Write the building on a path again.
+
+        Args:
+            index: The index of the path
+        """
+        buf = self._buffer
+        num_paths = len(self._paths)
+        roads = self.offsets["roads"] + index
+        for p in range(len(self.game.players)):
+            buf[roads + p * num_paths] = 0
+        building = self._paths[index].building
+        if building is not None:
+            buf[roads + self.game.players.index(building.owner) * num_paths] = 1
+
+    def update_robber(self):
+        """Write the position of the robber again, if it has moved."""
+        robber = self.board_index.hex_indices[self.game.board.robber]
+        if robber == self._robber:
+            return
+        offset = self.offsets["robber"]
+        if self._robber is not None:
+            self._buffer[offset + self._robber] = 0
+        self._buffer[offset + robber] = 1
+        self._robber = robber
+
+    def update_players(self):
+        """Write the players' hands, played knights, awards and the size of the development card deck again."""
+        buf = self._buffer
+        offsets = self.offsets
+        game = self.game
+        for p, player in enumerate(game.players):
+            offset = offsets["resources"] + p * len(_RESOURCES)
+            for i, res in enumerate(_RESOURCES):
+                buf[offset + i] = min(player.resources[res], 255)
+            offset = offsets["development_cards"] + p * len(_DEVELOPMENT_CARDS)
+            for i, card in enumerate(_DEVELOPMENT_CARDS):
+                buf[offset + i] = min(player.development_cards[card], 255)
+            buf[offsets["played_knights"] + p] = min(player.number_played_knights, 255)
+            buf[offsets["longest_road_owner"] + p] = (
+                1 if player is game.longest_road_owner else 0
+            )
+            buf[offsets["largest_army_owner"] + p] = (
+                1 if player is game.largest_army_owner else 0
+            )
+        buf[offsets["development_card_deck"]] = min(
+            len(game.development_card_deck), 255
+        )
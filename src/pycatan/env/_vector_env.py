@@ -0,0 +1,297 @@
+from typing import Callable, List, Optional, Sequence
+from multiprocessing import shared_memory
+import multiprocessing
+import random
+import os
+
+from ..board._board import Board
+from ._catan_env import CatanEnv
+
+
+def _get_layout(
+    num_envs: int, num_players: int, observation_size: int, action_size: int
+):
+    # Rewards go first so that the floats are aligned
+    sizes = [
+        ("rewards", num_envs * num_players * 4),
+        ("observations", num_envs * observation_size),
+        ("action_masks", num_envs * action_size),
+        ("dones", num_envs),
+        ("acting_players", num_envs),
+    ]
+    layout = {}
+    total = 0
+    for name, size in sizes:
+        layout[name] = (total, total + size)
+        total += size
+    return layout, total
+
+
+def _get_views(buf, layout):
+    views = {name: buf[start:end] for name, (start, end) in layout.items()}
+    views["rewards"] = views["rewards"].cast("f")
+    return views
+
+
+def _get_row(view, index: int, size: int):
+    return view[slice(index * size, (index + 1) * size)]
+
+
+def _serve(connection, views, first_env: int, seeds, settings):
+    envs = []
+    try:
+        for i, seed in enumerate(seeds, start=first_env):
+            envs.append(
+                CatanEnv(
+                    num_players=settings["num_players"],
+                    board_factory=settings["board_factory"],
+                    victory_points_to_win=settings["victory_points_to_win"],
+                    max_turns=settings["max_turns"],
+                    seed=seed,
+                    observation=_get_row(
+                        views["observations"], i, settings["observation_size"]
+                    ),
+                    action_mask=_get_row(views["action_masks"], i, settings["action_size"]),
+                    rewards=_get_row(views["rewards"], i, settings["num_players"]),
+                )
+            )
+            views["dones"][i] = 0
+            views["acting_players"][i] = envs[-1].acting_player_index
+    except Exception as e:
+        # The parent stops every worker when one of them cannot start
+        connection.send(e)
+        return
+    connection.send(None)
+    while True:
+        command, data = connection.recv()
+        if command == "close":
+            return
+        try:
+            for i, env in enumerate(envs):
+                index = first_env + i
+                if command == "step":
+                    done = env.step(data[i])
+                    views["dones"][index] = 1 if done else 0
+                    if done:
+                        # Keep the rewards of the last step of the finished game
+                        rewards = list(env.rewards)
+                        env.reset()
+                        for p, r in enumerate(rewards):
+                            env.rewards[p] = r
+                else:
+                    env.reset(data[i])
+                    views["dones"][index] = 0
+                views["acting_players"][index] = env.acting_player_index
+            connection.send(None)
+        except Exception as e:
+            connection.send(e)
+
+
+def _run_worker(connection, shm_name: str, first_env: int, seeds, layout, settings):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    views = _get_views(shm.buf, layout)
+    try:
+        _serve(connection, views, first_env, seeds, settings)
+    finally:
+        # The environments are gone once _serve returns, and the views have to be released
+        # before the shared memory can be closed
+        for view in views.values():
+            view.release()
+        shm.close()
+        connection.close()
+
+
+class VectorEnv:
+    """Runs many CatanEnvs at the same time, spread across worker processes.
+
+    The observations, action masks, rewards, done flags and acting players of all the environments are kept
+    in one block of shared memory that the workers write into directly. Only the actions are sent to the
+    workers, so nothing about the games has to be pickled between processes.
+    An environment whose game finishes is reset automatically; its reward and done flag for that step are
+    kept, but its observation and mask are the ones of the new game.
+
+    Each section of the shared memory is exposed as a flat memoryview. With numpy, i.e.
+    ``numpy.frombuffer(env.observations, numpy.uint8).reshape(env.num_envs, env.observation_size)`` gives
+    an array of the observations without copying them.
+
+    Args:
+        num_envs: The number of environments
+        num_workers: The number of worker processes. Defaults to the number of CPUs, or num_envs if there are less
+        num_players: The number of players in each game. Defaults to 4
+        board_factory: The board factory passed to each CatanEnv. Must be picklable. Defaults to creating RandomBoards
+        victory_points_to_win: How many victory points a player needs to win. Defaults to 10
+        max_turns: The number of turns after which a game ends without a winner. Defaults to None
+        seed: If given, environment i starts with the seed ``seed + i``. Defaults to None
+
+    Attributes:
+        num_envs (int): The number of environments
+        num_players (int): The number of players in each game
+        observation_size (int): The number of bytes in an observation
+        action_size (int): The number of actions in the action space
+        action_space (ActionSpace): The action space shared by all the environments
+        observations (memoryview): The observations, observation_size bytes per environment
+        action_masks (memoryview): The legal action masks, action_size bytes per environment
+        rewards (memoryview): The rewards of the last step, num_players floats per environment
+        dones (memoryview): 1 for each environment whose game finished on the last step, 0 for the others
+        acting_players (memoryview): The index of the player who chooses the next action in each environment
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_workers: Optional[int] = None,
+        num_players: Optional[int] = 4,
+        board_factory: Optional[Callable[[random.Random], Board]] = None,
+        victory_points_to_win: Optional[int] = 10,
+        max_turns: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_envs))
+        sample = CatanEnv(num_players=num_players, board_factory=board_factory)
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.observation_size = len(sample.observation)
+        self.action_size = sample.action_space.size
+        self.action_space = sample.action_space
+
+        layout, total = _get_layout(
+            num_envs, num_players, self.observation_size, self.action_size
+        )
+        self._shm = None
+        self._views = {}
+        self._ranges = []
+        self._connections = []
+        self._processes = []
+        self._closed = False
+        try:
+            self._shm = shared_memory.SharedMemory(create=True, size=total)
+            self._views = _get_views(self._shm.buf, layout)
+            self.observations = self._views["observations"]
+            self.action_masks = self._views["action_masks"]
+            self.rewards = self._views["rewards"]
+            self.dones = self._views["dones"]
+            self.acting_players = self._views["acting_players"]
+
+            settings = {
+                "num_players": num_players,
+                "board_factory": board_factory,
+                "victory_points_to_win": victory_points_to_win,
+                "max_turns": max_turns,
+                "observation_size": self.observation_size,
+                "action_size": self.action_size,
+            }
+            seeds = [None if seed is None else seed + i for i in range(num_envs)]
+            for w in range(num_workers):
+                start = w * num_envs // num_workers
+                end = (w + 1) * num_envs // num_workers
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_run_worker,
+                    args=(child, self._shm.name, start, seeds[start:end], layout, settings),
+                    daemon=True,
+                )
+                self._ranges.append((start, end))
+                self._connections.append(parent)
+                process.start()
+                child.close()
+                self._processes.append(process)
+            # Wait until every worker has written its first observations
+            self._receive_all()
+        except BaseException:
+            # Stop the workers that did start and free the shared memory, since nothing else will
+            self.close()
+            raise
+
+    def _send_all(self, command: str, data: Sequence):
+        for (start, end), connection in zip(self._ranges, self._connections):
+            connection.send((command, list(data[start:end])))
+        self._receive_all()
+
+    def _receive_all(self):
+        errors = [c.recv() for c in self._connections]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def get_observation(self, index: int) -> memoryview:
+        """Get the observation of one environment.
+
+        Args:
+            index: The index of the environment
+        Returns:
+            A view of the environment's observation in the shared memory
+        """
+        return _get_row(self.observations, index, self.observation_size)
+
+    def get_action_mask(self, index: int) -> memoryview:
+        """Get the legal action mask of one environment.
+
+        Args:
+            index: The index of the environment
+        Returns:
+            A view of the environment's action mask in the shared memory
+        """
+        return _get_row(self.action_masks, index, self.action_size)
+
+    def reset(self, seeds: Optional[List[Optional[int]]] = None):
+        """Start a new game in every environment.
+
+        Args:
+            seeds: The seed for each environment's new game. Defaults to None for every environment
+        """
+        self._send_all("reset", seeds if seeds is not None else [None] * self.num_envs)
+
+    def step(self, actions: Sequence[int]):
+        """Take one action in every environment.
+
+        The actions are checked against the action masks before any of them are sent to the workers, so if one
+        of them is not legal, none of the environments take a step.
+
+        Args:
+            actions: The action to take in each environment
+        Raises:
+            ValueError: If the wrong number of actions is given, or an action is not legal
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(
+                "Expected %d actions, received %d" % (self.num_envs, len(actions))
+            )
+        actions = [int(a) for a in actions]
+        for i, action in enumerate(actions):
+            if not 0 <= action < self.action_size or not self.action_masks[i * self.action_size + action]:
+                raise ValueError("Action %d is not legal in environment %d" % (action, i))
+        self._send_all("step", actions)
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for connection in self._connections:
+            try:
+                connection.send(("close", None))
+            except OSError:
+                # The worker has already stopped
+                pass
+        for process in self._processes:
+            process.join()
+        for connection in self._connections:
+            connection.close()
+        for view in self._views.values():
+            view.release()
+        self.observations = None
+        self.action_masks = None
+        self.rewards = None
+        self.dones = None
+        self.acting_players = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
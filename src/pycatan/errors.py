@@ -38,3 +38,9 @@ class NotEnoughResourcesError(Exception):
     """Error when the player doesn't have enough resources to do this action."""
 
     pass
+
+
+class ServerError(Exception):
+    """Error for when a GameServer rejects a client's request."""
+
+    pass
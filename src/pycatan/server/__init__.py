@@ -0,0 +1,32 @@
+"""Submodule with an asyncio server that hosts many games, and clients that play them over TCP or Unix sockets."""
+
+from ._client import Client, LocalClient
+from ._protocol import (
+    GameStatus,
+    GameUpdate,
+    MessageType,
+    decode_status,
+    encode_message,
+    split_messages,
+)
+from ._registry import GameRegistry, RegistryMetrics, estimate_size
+from ._server import GameServer, Session
+from ._spectator_feed import Spectator, SpectatorFeed
+
+__all__ = [
+    "Client",
+    "GameRegistry",
+    "GameServer",
+    "GameStatus",
+    "GameUpdate",
+    "LocalClient",
+    "MessageType",
+    "RegistryMetrics",
+    "Session",
+    "Spectator",
+    "SpectatorFeed",
+    "decode_status",
+    "encode_message",
+    "estimate_size",
+    "split_messages",
+]
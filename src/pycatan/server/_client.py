@@ -0,0 +1,339 @@
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+import asyncio
+import struct
+
+from .._delta import GameDelta
+from .._game import Game
+from ..errors import ServerError
+from ._protocol import (
+    CREATE_GAME,
+    FRAME_HEADER,
+    GAME_ID,
+    GET_DELTA,
+    JOIN,
+    STATUS,
+    STEP,
+    GameStatus,
+    GameUpdate,
+    MessageType,
+    decode_status,
+    encode_message,
+    split_messages,
+)
+
+
+def _decode_state(payload: bytes) -> Tuple[Game, GameStatus]:
+    start = STATUS.size
+    return Game.from_bytes(payload[start:]), decode_status(payload)
+
+
+class _BaseClient:
+    def __init__(self):
+        self._responses: Deque[asyncio.Future] = deque()
+        self._updates: Optional[asyncio.Queue] = None
+        self._closed = False
+
+    async def _send(self, data: bytes):
+        raise NotImplementedError()
+
+    def _get_updates(self) -> asyncio.Queue:
+        # Created when first used, so that it belongs to the running event loop
+        if self._updates is None:
+            self._updates = asyncio.Queue()
+        return self._updates
+
+    def _receive(self, message_type: MessageType, payload: bytes):
+        if message_type is MessageType.UPDATE:
+            self._get_updates().put_nowait(
+                GameUpdate(
+                    decode_status(payload), GameDelta.from_bytes(payload, STATUS.size)
+                )
+            )
+        elif message_type is MessageType.GAME_CLOSED:
+            self._get_updates().put_nowait(GameUpdate(decode_status(payload), None))
+        elif self._responses:
+            future = self._responses.popleft()
+            if not future.done():
+                future.set_result((message_type, payload))
+
+    def _fail(self, error: Exception):
+        while self._responses:
+            future = self._responses.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    async def _request(
+        self, message_type: MessageType, payload: bytes = b""
+    ) -> Tuple[MessageType, bytes]:
+        if self._closed:
+            raise ConnectionError("The client was closed")
+        future = asyncio.get_running_loop().create_future()
+        # The server answers every request in order
+        self._responses.append(future)
+        await self._send(encode_message(message_type, payload))
+        response_type, response = await future
+        if response_type is MessageType.ERROR:
+            raise ServerError(response.decode("utf-8", "replace"))
+        return response_type, response
+
+    async def create_game(
+        self, num_players: int = 4, seed: Optional[int] = None
+    ) -> int:
+        """Create a game on the server.
+
+        Args:
+            num_players: The number of players. Defaults to 4
+            seed: The seed of the game. Defaults to None
+        Raises:
+            ServerError: If the server could not create the game
+        Returns:
+            The id of the game
+        """
+        _, response = await self._request(
+            MessageType.CREATE_GAME,
+            CREATE_GAME.pack(num_players, seed is not None, seed or 0),
+        )
+        return GAME_ID.unpack(response)[0]
+
+    async def join(self, game_id: int, player_index: int):
+        """Take a player's seat in a game, to take that player's actions and see their development cards.
+
+        Args:
+            game_id: The id of the game
+            player_index: The index of the player
+        Raises:
+            ServerError: If there is no game or player with the id, the seat was taken by another client,
+                or the client is already watching the game
+        """
+        await self._request(MessageType.JOIN, JOIN.pack(game_id, player_index))
+
+    async def watch(self, game_id: int) -> Tuple[Game, GameStatus]:
+        """Get the state of a game, and receive the changes made to it from now on with ``next_update()``.
+
+        Applying every update to the game returned (with ``Game.apply_delta()``) keeps it the same as the game on
+        the server. Updates are not queued up on the server while the client is slow to read them, so an update
+        may include the changes of several actions.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            ServerError: If there is no game with the id
+        Returns:
+            The game and its status
+        """
+        _, response = await self._request(MessageType.WATCH, GAME_ID.pack(game_id))
+        return _decode_state(response)
+
+    async def unwatch(self, game_id: int):
+        """Stop receiving the changes made to a game.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            ServerError: If there is no game with the id
+        """
+        await self._request(MessageType.UNWATCH, GAME_ID.pack(game_id))
+
+    async def get_state(self, game_id: int) -> Tuple[Game, GameStatus]:
+        """Get the state of a game, as seen from the client's seats (see ``join()``).
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            ServerError: If there is no game with the id
+        Returns:
+            The game and its status
+        """
+        _, response = await self._request(MessageType.GET_STATE, GAME_ID.pack(game_id))
+        return _decode_state(response)
+
+    async def get_legal_actions(self, game_id: int) -> List[int]:
+        """Get the actions that can be taken in a game by the player who acts next.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            ServerError: If there is no game with the id, or the client does not have the seat of the player
+        Returns:
+            The legal actions
+        """
+        _, response = await self._request(
+            MessageType.GET_LEGAL_ACTIONS, GAME_ID.pack(game_id)
+        )
+        count = (len(response) - GAME_ID.size) // 2
+        return list(struct.unpack_from("<%dH" % count, response, GAME_ID.size))
+
+    async def step(self, game_id: int, action: int) -> GameStatus:
+        """Take an action in a game.
+
+        Args:
+            game_id: The id of the game
+            action: The action to take
+        Raises:
+            ServerError: If there is no game with the id, the client does not have the seat of the player who acts
+                next or the action is not legal
+        Returns:
+            The status of the game after the action
+        """
+        _, response = await self._request(MessageType.STEP, STEP.pack(game_id, action))
+        return decode_status(response)
+
+    async def get_delta(
+        self, game_id: int, since_version: int
+    ) -> Tuple[GameDelta, GameStatus]:
+        """Get the changes made to a game since a version, i.e. to update a copy of the game from ``get_state()``.
+
+        Args:
+            game_id: The id of the game
+            since_version: The version of the copy (see ``Game.version``)
+        Raises:
+            ServerError: If there is no game with the id
+        Returns:
+            The changes, which can be applied with ``Game.apply_delta()``, and the status of the game
+        """
+        _, response = await self._request(
+            MessageType.GET_DELTA, GET_DELTA.pack(game_id, since_version)
+        )
+        return GameDelta.from_bytes(response, STATUS.size), decode_status(response)
+
+    async def close_game(self, game_id: int):
+        """Remove a game from the server.
+
+        The other clients that have a seat in or are watching the game are sent an update without changes (see
+        ``next_update()``).
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            ServerError: If there is no game with the id, or another client has taken a seat in the game
+        """
+        await self._request(MessageType.CLOSE_GAME, GAME_ID.pack(game_id))
+
+    async def next_update(self) -> GameUpdate:
+        """Wait for the next change to one of the games being watched.
+
+        When a game the client has a seat in or is watching is closed by someone else, the update has the game's
+        final status and no changes.
+
+        Returns:
+            The update
+        """
+        return await self._get_updates().get()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        raise NotImplementedError()
+
+
+class Client(_BaseClient):
+    """Plays and watches games on a GameServer over a TCP or Unix socket.
+
+    Create clients with ``Client.connect_tcp()`` or ``Client.connect_unix()``. Requests can be made from several
+    coroutines at once, and are answered in the order they were sent.
+
+    Args:
+        reader: The stream to read the server's messages from
+        writer: The stream to send messages to the server
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        super().__init__()
+        self._reader = reader
+        self._writer = writer
+        self._read_task = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> "Client":
+        """Connect to a server over TCP.
+
+        Args:
+            host: The host of the server
+            port: The port of the server
+        Returns:
+            The client
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> "Client":
+        """Connect to a server over a Unix socket.
+
+        Args:
+            path: The path of the server's socket
+        Returns:
+            The client
+        """
+        reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+
+    async def _send(self, data: bytes):
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def _read(self):
+        try:
+            while True:
+                header = await self._reader.readexactly(FRAME_HEADER.size)
+                length, message_type = FRAME_HEADER.unpack(header)
+                payload = await self._reader.readexactly(length) if length else b""
+                self._receive(MessageType(message_type), payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        self._closed = True
+        self._fail(ConnectionError("The connection to the server was closed"))
+
+    async def close(self):
+        """Disconnect from the server."""
+        self._closed = True
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._read_task.cancel()
+        self._fail(ConnectionError("The client was closed"))
+
+
+class LocalClient(_BaseClient):
+    """Plays and watches games on a GameServer in the same process, without a socket, i.e. for tests.
+
+    Has the same methods as Client. The messages are still encoded and decoded, so the client behaves the same
+    as a client connected over a socket.
+
+    Args:
+        server: The server to connect to
+
+    Attributes:
+        server (GameServer): The server the client is connected to
+    """
+
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+        self._session = server.open_session(self._deliver)
+        self._received = b""
+
+    def _deliver(self, data: bytes):
+        messages, self._received = split_messages(self._received + data)
+        for message_type, payload in messages:
+            self._receive(message_type, payload)
+
+    async def _send(self, data: bytes):
+        # Give other coroutines a chance to run, as sending to a socket would
+        await asyncio.sleep(0)
+        messages, _ = split_messages(data)
+        for message_type, payload in messages:
+            self.server.handle_message(self._session, message_type, payload)
+
+    async def close(self):
+        """Disconnect from the server."""
+        self._closed = True
+        self.server.close_session(self._session)
+        self._fail(ConnectionError("The client was closed"))
@@ -0,0 +1,199 @@
+from enum import Enum
+from typing import List, NamedTuple, Optional, Tuple
+import struct
+
+from .._delta import GameDelta
+from .._turn_machine import TurnMachine
+from .._turn_phase import TurnPhase
+
+# The length of the message's payload and the message's type
+FRAME_HEADER = struct.Struct("<HB")
+MAX_PAYLOAD_SIZE = 0xFFFF
+
+GAME_ID = struct.Struct("<I")
+# Number of players, whether there is a seed, seed
+CREATE_GAME = struct.Struct("<BBq")
+# Game id, action
+STEP = struct.Struct("<IH")
+# Game id, phase, acting player, turn number, winner, last roll, version of the game
+STATUS = struct.Struct("<IBBHBBI")
+# Game id, version to get the changes since
+GET_DELTA = struct.Struct("<II")
+# Game id, index of the player
+JOIN = struct.Struct("<IB")
+ACTION = struct.Struct("<H")
+_NONE = 0xFF
+
+_PHASES = list(TurnPhase)
+
+
+class MessageType(Enum):
+    """A type of message sent between a GameServer and its clients.
+
+    Every message is framed as its payload's length (2 bytes, little endian), its type (1 byte) and the payload.
+    Game ids are 4 bytes and actions 2 bytes, both little endian.
+    """
+
+    CREATE_GAME = 0
+    """Create a game. The payload is the number of players, 1 if there is a seed and the seed (8 bytes)"""
+    WATCH = 1
+    """Get the state of a game and receive an UPDATE whenever it changes. The payload is the game id"""
+    UNWATCH = 2
+    """Stop receiving the updates of a game. The payload is the game id"""
+    GET_STATE = 3
+    """Get the state of a game. The payload is the game id"""
+    GET_LEGAL_ACTIONS = 4
+    """Get the legal actions of a game. The payload is the game id"""
+    STEP = 5
+    """Take an action in a game. The payload is the game id and the action"""
+    CLOSE_GAME = 6
+    """Remove a game from the server. The payload is the game id. Only allowed if no other client has taken a seat
+    in the game"""
+    GET_DELTA = 7
+    """Get the changes made to a game since a version. The payload is the game id and the version (4 bytes)"""
+    JOIN = 8
+    """Take a player's seat in a game, to take that player's actions and see their development cards. The payload
+    is the game id and the index of the player (1 byte). Seats have to be taken before watching the game"""
+
+    OK = 64
+    """The request succeeded. There is no payload"""
+    ERROR = 65
+    """The request failed. The payload is the reason, in UTF-8"""
+    GAME_CREATED = 66
+    """The game was created. The payload is the game id"""
+    STATE = 67
+    """The state of a game, as seen from the client's seats. The payload is the game's status followed by the game
+    (see ``Game.to_bytes()``), in which the development cards the client cannot see are a random guess"""
+    LEGAL_ACTIONS = 68
+    """The legal actions of a game. The payload is the game id followed by every legal action"""
+    STATUS = 69
+    """The action was taken. The payload is the game's status after the action"""
+    UPDATE = 70
+    """Sent to the watchers of a game when it changes, without being requested. The payload is the game's status
+    followed by the changes since the last update sent to the watcher (see ``GameDelta.to_bytes()``). A watcher
+    that is slow to read its updates is sent the changes of several actions at once"""
+    DELTA = 71
+    """The changes made to a game since a version. The payload is the game's status followed by the changes
+    (see ``GameDelta.to_bytes()``)"""
+    GAME_CLOSED = 72
+    """Sent to the clients that have a seat in or are watching a game when another client or the server closes it,
+    without being requested. The payload is the game's final status"""
+
+
+class GameStatus(NamedTuple):
+    """The state of the turns of a game on a GameServer.
+
+    Attributes:
+        game_id (int): The id of the game
+        phase (TurnPhase): The current phase of the turn
+        acting_player (int): The index of the player who chooses the next action
+        turn_number (int): The current turn
+        winner (int): The index of the player who won, or None
+        last_roll (int): The last number rolled, or None
+        version (int): The version of the game (see ``Game.version``)
+    """
+
+    game_id: int
+    phase: TurnPhase
+    acting_player: int
+    turn_number: int
+    winner: Optional[int]
+    last_roll: Optional[int]
+    version: int
+
+
+class GameUpdate(NamedTuple):
+    """The changes made to a game, sent to the game's watchers.
+
+    Attributes:
+        status (GameStatus): The status of the game after the changes
+        delta (GameDelta): The changes made to the game since the last update, which can be applied to a copy of
+            the game with ``Game.apply_delta()``, or None if the game was closed (see ``MessageType.GAME_CLOSED``)
+    """
+
+    status: GameStatus
+    delta: Optional[GameDelta]
+
+
+def encode_message(message_type: MessageType, payload: bytes = b"") -> bytes:
+    """Frame a message.
+
+    Args:
+        message_type: The type of the message
+        payload: The payload of the message. Defaults to no payload
+    Raises:
+        ValueError: If the payload is too long
+    Returns:
+        The framed message
+    """
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise ValueError(
+            "The payload of a message can be at most %d bytes" % MAX_PAYLOAD_SIZE
+        )
+    return FRAME_HEADER.pack(len(payload), message_type.value) + payload
+
+
+def split_messages(data: bytes) -> Tuple[List[Tuple[MessageType, bytes]], bytes]:
+    """Split a block of received bytes into messages.
+
+    Args:
+        data: The bytes received
+    Raises:
+        ValueError: If a message has an unknown type
+    Returns:
+        The messages, and the bytes at the end of the data that are not a whole message yet
+    """
+    messages = []
+    pos = 0
+    while pos + FRAME_HEADER.size <= len(data):
+        length, message_type = FRAME_HEADER.unpack_from(data, pos)
+        start = pos + FRAME_HEADER.size
+        end = start + length
+        if end > len(data):
+            break
+        messages.append((MessageType(message_type), data[start:end]))
+        pos = end
+    return messages, data[pos:]
+
+
+def encode_status(game_id: int, machine: TurnMachine) -> bytes:
+    """Encode the status of a game.
+
+    Args:
+        game_id: The id of the game
+        machine: The turn machine running the game
+    Returns:
+        The encoded status
+    """
+    winner = machine.winner
+    return STATUS.pack(
+        game_id,
+        machine.phase.value,
+        machine.acting_player_index,
+        machine.turn_number,
+        _NONE if winner is None else machine.game.players.index(winner),
+        machine.last_roll or 0,
+        machine.game.version,
+    )
+
+
+def decode_status(payload: bytes) -> GameStatus:
+    """Decode a status encoded by ``encode_status()``.
+
+    Args:
+        payload: The start of the payload of the message
+    Returns:
+        The status
+    """
+    game_id, phase, acting_player, turn_number, winner, last_roll, version = (
+        STATUS.unpack_from(payload)
+    )
+    return GameStatus(
+        game_id,
+        _PHASES[phase],
+        acting_player,
+        turn_number,
+        None if winner == _NONE else winner,
+        last_roll or None,
+        version,
+    )
@@ -0,0 +1,331 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Set
+import os
+import shutil
+import tempfile
+import time
+
+from .._turn_machine import TurnMachine
+
+# The memory used by a machine per hex, intersection and path of its board, measured with tracemalloc on games on
+# the standard board (about 130KB per game)
+_BYTES_PER_PLACE = 900
+
+
+def estimate_size(machine: TurnMachine) -> int:
+    """Estimate the memory used by a turn machine and its game, from the size of the board.
+
+    Args:
+        machine: The machine
+    Returns:
+        The estimated number of bytes
+    """
+    board = machine.game.board
+    return _BYTES_PER_PLACE * (
+        len(board.hexes) + len(board.intersections) + len(board.paths)
+    )
+
+
+class RegistryMetrics:
+    """Counters of how a GameRegistry has used memory and disk.
+
+    Attributes:
+        hits (int): The number of times a game was found in memory
+        evictions (int): The number of times a game was written to disk and removed from memory
+        rehydrations (int): The number of times a game was read back from disk
+        bytes_written (int): The total size of the snapshots written
+        bytes_read (int): The total size of the snapshots read
+        eviction_seconds (float): The total time spent evicting games
+        rehydration_seconds (float): The total time spent reading games back from disk
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.evictions = 0
+        self.rehydrations = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.eviction_seconds = 0.0
+        self.rehydration_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Get the counters as a dictionary, i.e. to report them to a monitoring system.
+
+        Returns:
+            The name and value of every counter
+        """
+        return dict(vars(self))
+
+
+class _Entry:
+    __slots__ = ("machine", "size", "last_used")
+
+    def __init__(self, machine: TurnMachine, size: int, last_used: float):
+        self.machine = machine
+        self.size = size
+        self.last_used = last_used
+
+
+class GameRegistry:
+    """Keeps the most recently used games in memory, and moves the others to snapshots on disk.
+
+    Games are kept in least recently used order. When adding or reading a game would go over the number
+    of games or bytes allowed in memory, the games that were used least recently are written to disk with
+    ``TurnMachine.to_bytes()`` (a few KB each) and removed from memory. ``get()`` reads them back transparently,
+    so callers do not need to know where a game is. Games that have not been used for a while can also be
+    evicted with ``evict_idle()``, so idle games do not use memory indefinitely. Games that others hold on to,
+    i.e. while they are being watched, can be pinned so that they are never evicted.
+
+    Args:
+        directory: The directory to write the snapshots to. Defaults to a temporary directory that is removed
+            when the registry is closed
+        max_games: The number of games to keep in memory, or None for no limit. Defaults to None
+        max_bytes: The number of bytes the games in memory may use, or None for no limit. Defaults to None
+        size_of: The function that estimates the memory used by a game. Defaults to ``estimate_size()``
+        clock: The function that returns the current time in seconds. Defaults to ``time.monotonic``
+
+    Attributes:
+        max_games (int): The number of games kept in memory, or None for no limit
+        max_bytes (int): The number of bytes the games in memory may use, or None for no limit
+        metrics (RegistryMetrics): What the registry has done so far
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_games: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        size_of: Optional[Callable[[TurnMachine], int]] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.max_games = max_games
+        self.max_bytes = max_bytes
+        self.metrics = RegistryMetrics()
+        self._directory = directory
+        self._temporary_directory = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._size_of = size_of if size_of is not None else estimate_size
+        self._clock = clock if clock is not None else time.monotonic
+        # The games in memory, from the least to the most recently used
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._memory_bytes = 0
+        # The size of the snapshot of every game on disk
+        self._spilled: Dict[int, int] = {}
+        self._pinned: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._spilled)
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._entries or game_id in self._spilled
+
+    def __iter__(self) -> Iterator[int]:
+        yield from list(self._entries)
+        yield from list(self._spilled)
+
+    @property
+    def num_in_memory(self) -> int:
+        """The number of games in memory."""
+        return len(self._entries)
+
+    @property
+    def num_on_disk(self) -> int:
+        """The number of games on disk."""
+        return len(self._spilled)
+
+    @property
+    def memory_bytes(self) -> int:
+        """The estimated memory used by the games in memory."""
+        return self._memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        """The size of the snapshots on disk."""
+        return sum(self._spilled.values())
+
+    def is_in_memory(self, game_id: int) -> bool:
+        """Check whether a game is in memory.
+
+        Args:
+            game_id: The id of the game
+        Returns:
+            Whether the game is in memory, as opposed to on disk or not in the registry
+        """
+        return game_id in self._entries
+
+    def is_pinned(self, game_id: int) -> bool:
+        """Check whether a game is pinned in memory.
+
+        Args:
+            game_id: The id of the game
+        Returns:
+            Whether the game is pinned
+        """
+        return game_id in self._pinned
+
+    def pin(self, game_id: int):
+        """Keep a game in memory until it is unpinned, reading it from disk if it was evicted.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            KeyError: If there is no game with the id
+        """
+        self.get(game_id)
+        self._pinned.add(game_id)
+
+    def unpin(self, game_id: int):
+        """Allow a pinned game to be evicted again.
+
+        Args:
+            game_id: The id of the game
+        """
+        self._pinned.discard(game_id)
+
+    def add(self, game_id: int, machine: TurnMachine):
+        """Add a game, as the most recently used game.
+
+        Args:
+            game_id: The id of the game
+            machine: The turn machine running the game
+        Raises:
+            ValueError: If there is already a game with the id
+        """
+        if game_id in self:
+            raise ValueError("There is already a game %d" % game_id)
+        self._insert(game_id, machine)
+        self._enforce_limits()
+
+    def get(self, game_id: int) -> TurnMachine:
+        """Get a game, reading it from disk if it was evicted, and mark it as the most recently used game.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            KeyError: If there is no game with the id
+        Returns:
+            The turn machine running the game
+        """
+        entry = self._entries.get(game_id)
+        if entry is not None:
+            self.metrics.hits += 1
+            entry.last_used = self._clock()
+            self._entries.move_to_end(game_id)
+            return entry.machine
+        if game_id not in self._spilled:
+            raise KeyError(game_id)
+        start = time.perf_counter()
+        path = self._get_path(game_id)
+        with open(path, "rb") as f:
+            data = f.read()
+        machine = TurnMachine.from_bytes(data)
+        os.remove(path)
+        del self._spilled[game_id]
+        self._insert(game_id, machine)
+        self.metrics.rehydrations += 1
+        self.metrics.bytes_read += len(data)
+        self.metrics.rehydration_seconds += time.perf_counter() - start
+        # Make room for the game, without evicting the game itself
+        self._enforce_limits()
+        return machine
+
+    def remove(self, game_id: int):
+        """Remove a game from memory or disk.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            KeyError: If there is no game with the id
+        """
+        entry = self._entries.pop(game_id, None)
+        self._pinned.discard(game_id)
+        if entry is not None:
+            self._memory_bytes -= entry.size
+        else:
+            del self._spilled[game_id]
+            os.remove(self._get_path(game_id))
+
+    def evict(self, game_id: int):
+        """Write a game to disk and remove it from memory.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            KeyError: If the game is not in memory
+            ValueError: If the game is pinned
+        """
+        if game_id in self._pinned:
+            raise ValueError("Game %d is pinned" % game_id)
+        start = time.perf_counter()
+        entry = self._entries.pop(game_id)
+        self._memory_bytes -= entry.size
+        data = entry.machine.to_bytes()
+        with open(self._get_path(game_id), "wb") as f:
+            f.write(data)
+        self._spilled[game_id] = len(data)
+        self.metrics.evictions += 1
+        self.metrics.bytes_written += len(data)
+        self.metrics.eviction_seconds += time.perf_counter() - start
+
+    def evict_idle(self, max_idle_seconds: float) -> List[int]:
+        """Evict every game that has not been used for a while, except the pinned games.
+
+        Args:
+            max_idle_seconds: How long a game can go unused before it is evicted
+        Returns:
+            The ids of the games evicted
+        """
+        cutoff = self._clock() - max_idle_seconds
+        evicted = []
+        # The games are in the order they were used, so the idle games are at the start
+        for game_id, entry in self._entries.items():
+            if entry.last_used > cutoff:
+                break
+            if game_id not in self._pinned:
+                evicted.append(game_id)
+        for game_id in evicted:
+            self.evict(game_id)
+        return evicted
+
+    def close(self):
+        """Remove every game, and the temporary directory if one was created."""
+        for game_id in list(self._spilled):
+            self.remove(game_id)
+        self._entries.clear()
+        self._pinned.clear()
+        self._memory_bytes = 0
+        if self._temporary_directory is not None:
+            shutil.rmtree(self._temporary_directory, ignore_errors=True)
+            self._temporary_directory = None
+
+    def _insert(self, game_id: int, machine: TurnMachine):
+        entry = _Entry(machine, self._size_of(machine), self._clock())
+        self._entries[game_id] = entry
+        self._memory_bytes += entry.size
+
+    def _enforce_limits(self):
+        # Never evict the most recently used game, which the caller is about to use
+        while len(self._entries) > 1 and (
+            (self.max_games is not None and len(self._entries) > self.max_games)
+            or (self.max_bytes is not None and self._memory_bytes > self.max_bytes)
+        ):
+            most_recent = next(reversed(self._entries))
+            game_id = next(
+                (
+                    i
+                    for i in self._entries
+                    if i not in self._pinned and i != most_recent
+                ),
+                None,
+            )
+            if game_id is None:
+                # Every other game is pinned
+                break
+            self.evict(game_id)
+
+    def _get_path(self, game_id: int) -> str:
+        if self._directory is None:
+            self._temporary_directory = tempfile.mkdtemp(prefix="pycatan-")
+            self._directory = self._temporary_directory
+        return os.path.join(self._directory, "%d.pcm" % game_id)
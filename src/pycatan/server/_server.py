@@ -0,0 +1,519 @@
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Set
+import asyncio
+import random
+import struct
+
+from .._game import Game
+from .._turn_machine import TurnMachine
+from ..board._board import Board
+from ..board._random_board import RandomBoard
+from ._registry import GameRegistry
+from ._spectator_feed import Spectator, SpectatorFeed
+from ._views import get_delta_view, get_state_view
+from ._protocol import (
+    CREATE_GAME,
+    FRAME_HEADER,
+    GAME_ID,
+    GET_DELTA,
+    JOIN,
+    STEP,
+    MessageType,
+    encode_message,
+    encode_status,
+)
+
+
+class Session:
+    """A client connected to a GameServer, as returned by ``GameServer.open_session()``.
+
+    Args:
+        send: The function that sends framed messages to the client
+        drain: The coroutine function that waits until the messages sent so far have been written, or None if
+            messages are delivered immediately. Defaults to None
+
+    Attributes:
+        send (Callable[[bytes], None]): The function that sends framed messages to the client
+        watching (Set[int]): The ids of the games the client is watching
+        seats (Dict[int, Set[int]]): The indices of the players whose seats the client has taken, keyed by game id
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], None],
+        drain: Optional[Callable[[], Awaitable[None]]] = None,
+    ):
+        self.send = send
+        self.watching: Set[int] = set()
+        self.seats: Dict[int, Set[int]] = {}
+        self._drain = drain
+
+    async def drain(self):
+        """Wait until the messages sent so far have been written, so that slow clients are not sent more."""
+        if self._drain is not None:
+            await self._drain()
+
+
+class _Table:
+    __slots__ = ("feeds", "watchers", "seats")
+
+    def __init__(self):
+        # The feed of the game's changes for each set of players whose hands the watchers can see
+        self.feeds: Dict[FrozenSet[int], SpectatorFeed] = {}
+        # The task sending the updates to each watcher
+        self.watchers: Dict[Session, asyncio.Task] = {}
+        # The session that has taken each player's seat
+        self.seats: Dict[int, Session] = {}
+
+
+class GameServer:
+    """Hosts many games at once, and lets clients play them over TCP or Unix sockets.
+
+    Each game is run by a TurnMachine, which changes the game through the Game methods, and clients take actions
+    by their number in the machine's action space. Clients that watch a game are sent the changes made to it
+    (see ``MessageType.UPDATE``) instead of the whole state, so they can keep their own copy of the game.
+    The changes are pushed by a SpectatorFeed, which waits for each watcher's connection to accept the last update
+    and combines the changes made in the meantime, so slow watchers do not make the server buffer without limit.
+    Every connection is handled in its own coroutine, and actions are cheap enough to be taken
+    directly on the event loop, so one server can host thousands of games.
+
+    The games are kept in a GameRegistry, which can move idle games to disk so that a server can host
+    many more games than fit in memory. Games that are being watched stay in memory.
+
+    Clients take players' seats in a game (see ``MessageType.JOIN``), and can only take the actions of the
+    players whose seats they have. A client can only close a game if no other client has a seat in it, and the
+    clients with seats in or watching a game are told when it is closed. Clients only see the development cards of their own players: in the states
+    and changes they are sent, the other players' cards and the order of the deck are replaced by a random guess
+    from the cards nobody has seen, so only the number of cards in each hand is real.
+
+    The protocol is described by MessageType. Use Client to connect over a socket, or LocalClient to connect
+    in the same process.
+
+    Args:
+        board_factory: A function that creates the board of a new game from the game's random generator.
+            Defaults to creating a RandomBoard
+        victory_points_to_win: How many victory points a player needs to win. Defaults to 10
+        max_turns: The number of turns after which a game ends without a winner, or None to play until someone wins.
+            Defaults to None
+        registry: The registry to keep the games in. Defaults to a registry that keeps every game in memory
+
+    Attributes:
+        registry (GameRegistry): The registry the games are kept in
+    """
+
+    def __init__(
+        self,
+        board_factory: Optional[Callable[[random.Random], Board]] = None,
+        victory_points_to_win: Optional[int] = 10,
+        max_turns: Optional[int] = None,
+        registry: Optional[GameRegistry] = None,
+    ):
+        self.board_factory = (
+            board_factory if board_factory is not None else lambda rng: RandomBoard(rng)
+        )
+        self.victory_points_to_win = victory_points_to_win
+        self.max_turns = max_turns
+        self.registry = registry if registry is not None else GameRegistry()
+        self._tables: Dict[int, _Table] = {}
+        self._next_id = 1
+        self._servers: List[asyncio.AbstractServer] = []
+        # Guesses the cards clients cannot see, separately from the games' random generators
+        self._rng = random.Random()
+        self._handlers = {
+            MessageType.CREATE_GAME: self._handle_create_game,
+            MessageType.WATCH: self._handle_watch,
+            MessageType.UNWATCH: self._handle_unwatch,
+            MessageType.GET_STATE: self._handle_get_state,
+            MessageType.GET_LEGAL_ACTIONS: self._handle_get_legal_actions,
+            MessageType.STEP: self._handle_step,
+            MessageType.CLOSE_GAME: self._handle_close_game,
+            MessageType.GET_DELTA: self._handle_get_delta,
+            MessageType.JOIN: self._handle_join,
+        }
+
+    @property
+    def game_ids(self) -> List[int]:
+        """The ids of the games on the server."""
+        return list(self._tables)
+
+    def create_game(self, num_players: int = 4, seed: Optional[int] = None) -> int:
+        """Create a new game.
+
+        Args:
+            num_players: The number of players. Defaults to 4
+            seed: The seed of the game's board, dice and development card deck. Defaults to None
+        Raises:
+            ValueError: If there are no players
+        Returns:
+            The id of the game
+        """
+        if num_players < 1:
+            raise ValueError("A game needs at least one player")
+        rng = random.Random(seed)
+        machine = TurnMachine(
+            Game(self.board_factory(rng), num_players),
+            victory_points_to_win=self.victory_points_to_win,
+            max_turns=self.max_turns,
+            rng=rng,
+        )
+        game_id = self._next_id
+        self._next_id += 1
+        self.registry.add(game_id, machine)
+        self._tables[game_id] = _Table()
+        return game_id
+
+    def _get_table(self, game_id: int) -> _Table:
+        table = self._tables.get(game_id)
+        if table is None:
+            raise ValueError("There is no game %d" % game_id)
+        return table
+
+    def get_machine(self, game_id: int) -> TurnMachine:
+        """Get the turn machine running a game, reading it from disk if it was evicted.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            ValueError: If there is no game with the id
+        Returns:
+            The turn machine
+        """
+        self._get_table(game_id)
+        return self.registry.get(game_id)
+
+    def step(self, game_id: int, action: int) -> TurnMachine:
+        """Take an action in a game. The game's watchers are sent the changes it made.
+
+        Args:
+            game_id: The id of the game
+            action: The action to take
+        Raises:
+            ValueError: If there is no game with the id, or the action is not legal
+        Returns:
+            The turn machine running the game
+        """
+        table = self._get_table(game_id)
+        machine = self.get_machine(game_id)
+        machine.step(action)
+        for feed in table.feeds.values():
+            # The action may only have changed the turn, which the game does not announce
+            feed.notify()
+        return machine
+
+    def close_game(self, game_id: int):
+        """Remove a game from the server. The clients that have a seat in or are watching the game are told it closed.
+
+        Args:
+            game_id: The id of the game
+        Raises:
+            ValueError: If there is no game with the id
+        """
+        self._close_game(game_id)
+
+    def _close_game(self, game_id: int, closed_by: Optional[Session] = None):
+        table = self._get_table(game_id)
+        closed = encode_message(
+            MessageType.GAME_CLOSED,
+            encode_status(game_id, self.get_machine(game_id)),
+        )
+        for session in set(table.watchers) | set(table.seats.values()):
+            if session is not closed_by:
+                session.send(closed)
+        for session in list(table.watchers):
+            self._unwatch(session, game_id)
+        for session in table.seats.values():
+            session.seats.pop(game_id, None)
+        self.registry.remove(game_id)
+        del self._tables[game_id]
+
+    def open_session(
+        self,
+        send: Callable[[bytes], None],
+        drain: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> Session:
+        """Start a session for a client, i.e. to connect clients over a different transport.
+
+        Args:
+            send: The function that sends framed messages to the client
+            drain: The coroutine function that waits until the messages sent so far have been written, i.e.
+                ``StreamWriter.drain``. Defaults to None, for messages that are delivered immediately
+        Returns:
+            The session, to pass to ``handle_message()`` with every message from the client
+        """
+        return Session(send, drain)
+
+    def close_session(self, session: Session):
+        """End a session, stop sending it the updates of the games it was watching and free its seats.
+
+        Args:
+            session: The session to end
+        """
+        for game_id in list(session.watching):
+            self._unwatch(session, game_id)
+        for game_id, seats in session.seats.items():
+            table = self._tables.get(game_id)
+            if table is not None:
+                for seat in seats:
+                    del table.seats[seat]
+        session.seats.clear()
+
+    def handle_message(
+        self, session: Session, message_type: MessageType, payload: bytes
+    ):
+        """Handle a message from a client, and send the response to it.
+
+        Invalid requests are answered with an ERROR message.
+
+        Args:
+            session: The session of the client
+            message_type: The type of the message
+            payload: The payload of the message
+        """
+        handler = self._handlers.get(message_type)
+        try:
+            if handler is None:
+                raise ValueError("%s is not a request" % message_type.name)
+            handler(session, payload)
+        except (ValueError, struct.error) as e:
+            session.send(encode_message(MessageType.ERROR, str(e).encode("utf-8")))
+
+    def _get_visible(self, session: Session, game_id: int) -> FrozenSet[int]:
+        # The indices of the players whose development cards the session can see
+        return frozenset(session.seats.get(game_id, ()))
+
+    def _check_seat(self, session: Session, game_id: int, machine: TurnMachine):
+        if machine.acting_player_index not in session.seats.get(game_id, ()):
+            raise ValueError(
+                "The client does not have the seat of player %d, who acts next in game %d"
+                % (machine.acting_player_index, game_id)
+            )
+
+    def _send_state(self, session: Session, game_id: int):
+        machine = self.get_machine(game_id)
+        view = get_state_view(
+            machine.game, self._get_visible(session, game_id), self._rng
+        )
+        session.send(
+            encode_message(
+                MessageType.STATE,
+                encode_status(game_id, machine) + view.to_bytes(),
+            )
+        )
+
+    def _handle_create_game(self, session: Session, payload: bytes):
+        num_players, has_seed, seed = CREATE_GAME.unpack(payload)
+        game_id = self.create_game(num_players, seed if has_seed else None)
+        session.send(encode_message(MessageType.GAME_CREATED, GAME_ID.pack(game_id)))
+
+    def _watch(self, session: Session, game_id: int):
+        table = self._get_table(game_id)
+        machine = self.get_machine(game_id)
+        if session in table.watchers:
+            return
+        visible = self._get_visible(session, game_id)
+        feed = table.feeds.get(visible)
+        if feed is None:
+            if not table.feeds:
+                # The feeds hold on to the game, so keep the game in memory while it is watched
+                self.registry.pin(game_id)
+            feed = table.feeds[visible] = SpectatorFeed(
+                machine.game,
+                lambda delta: encode_message(
+                    MessageType.UPDATE,
+                    encode_status(game_id, machine)
+                    + get_delta_view(
+                        machine.game, delta, visible, self._rng
+                    ).to_bytes(),
+                ),
+            )
+        spectator = feed.subscribe(machine.game.version)
+        table.watchers[session] = asyncio.get_running_loop().create_task(
+            self._send_updates(session, spectator)
+        )
+        session.watching.add(game_id)
+
+    def _unwatch(self, session: Session, game_id: int):
+        table = self._get_table(game_id)
+        task = table.watchers.pop(session, None)
+        if task is not None:
+            task.cancel()
+        session.watching.discard(game_id)
+        visible = self._get_visible(session, game_id)
+        feed = table.feeds.get(visible)
+        if feed is not None and all(
+            self._get_visible(s, game_id) != visible for s in table.watchers
+        ):
+            feed.close()
+            del table.feeds[visible]
+            if not table.feeds:
+                self.registry.unpin(game_id)
+
+    async def _send_updates(self, session: Session, spectator: Spectator):
+        try:
+            async for update in spectator:
+                session.send(update)
+                # Let the changes pile up in the feed instead of the connection's buffer
+                await session.drain()
+        except ConnectionError:
+            pass
+        finally:
+            spectator.feed.unsubscribe(spectator)
+
+    def _handle_watch(self, session: Session, payload: bytes):
+        (game_id,) = GAME_ID.unpack(payload)
+        # Send the state first, so that the updates start from it
+        self._send_state(session, game_id)
+        self._watch(session, game_id)
+
+    def _handle_unwatch(self, session: Session, payload: bytes):
+        (game_id,) = GAME_ID.unpack(payload)
+        self._unwatch(session, game_id)
+        session.send(encode_message(MessageType.OK))
+
+    def _handle_get_state(self, session: Session, payload: bytes):
+        (game_id,) = GAME_ID.unpack(payload)
+        self._send_state(session, game_id)
+
+    def _handle_join(self, session: Session, payload: bytes):
+        game_id, seat = JOIN.unpack(payload)
+        table = self._get_table(game_id)
+        if seat >= len(self.get_machine(game_id).game.players):
+            raise ValueError("There is no player %d in game %d" % (seat, game_id))
+        if table.seats.get(seat, session) is not session:
+            raise ValueError(
+                "The seat of player %d in game %d is already taken" % (seat, game_id)
+            )
+        if session in table.watchers:
+            raise ValueError("Seats have to be taken before watching game %d" % game_id)
+        table.seats[seat] = session
+        session.seats.setdefault(game_id, set()).add(seat)
+        session.send(encode_message(MessageType.OK))
+
+    def _handle_get_legal_actions(self, session: Session, payload: bytes):
+        (game_id,) = GAME_ID.unpack(payload)
+        machine = self.get_machine(game_id)
+        self._check_seat(session, game_id, machine)
+        actions = machine.legal_actions()
+        session.send(
+            encode_message(
+                MessageType.LEGAL_ACTIONS,
+                GAME_ID.pack(game_id) + struct.pack("<%dH" % len(actions), *actions),
+            )
+        )
+
+    def _handle_step(self, session: Session, payload: bytes):
+        game_id, action = STEP.unpack(payload)
+        self._check_seat(session, game_id, self.get_machine(game_id))
+        machine = self.step(game_id, action)
+        session.send(
+            encode_message(MessageType.STATUS, encode_status(game_id, machine))
+        )
+
+    def _handle_get_delta(self, session: Session, payload: bytes):
+        game_id, since_version = GET_DELTA.unpack(payload)
+        machine = self.get_machine(game_id)
+        delta = get_delta_view(
+            machine.game,
+            machine.game.get_delta(since_version),
+            self._get_visible(session, game_id),
+            self._rng,
+        )
+        session.send(
+            encode_message(
+                MessageType.DELTA, encode_status(game_id, machine) + delta.to_bytes()
+            )
+        )
+
+    def _handle_close_game(self, session: Session, payload: bytes):
+        (game_id,) = GAME_ID.unpack(payload)
+        table = self._get_table(game_id)
+        taken = sorted(i for i, s in table.seats.items() if s is not session)
+        if taken:
+            raise ValueError(
+                "Game %d cannot be closed, other clients have the seats of players %s"
+                % (game_id, ", ".join(map(str, taken)))
+            )
+        self._close_game(game_id, session)
+        session.send(encode_message(MessageType.OK))
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Serve a client connected over a stream until it disconnects.
+
+        Used by ``start_tcp()`` and ``start_unix()``, but can be passed to any asyncio server.
+
+        Args:
+            reader: The stream to read the client's messages from
+            writer: The stream to write the responses to
+        """
+        session = self.open_session(writer.write, writer.drain)
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                length, message_type = FRAME_HEADER.unpack(header)
+                payload = await reader.readexactly(length) if length else b""
+                try:
+                    message_type = MessageType(message_type)
+                except ValueError:
+                    session.send(
+                        encode_message(MessageType.ERROR, b"Unknown message type")
+                    )
+                    continue
+                self.handle_message(session, message_type, payload)
+                # Stop reading from a client that is not reading its responses
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.close_session(session)
+            writer.close()
+
+    async def start_tcp(
+        self, host: Optional[str] = "127.0.0.1", port: Optional[int] = 0
+    ) -> asyncio.AbstractServer:
+        """Start accepting clients over TCP.
+
+        Args:
+            host: The host to listen on. Defaults to 127.0.0.1
+            port: The port to listen on. Defaults to 0, choosing a free port
+        Returns:
+            The asyncio server, i.e. to get the port from ``server.sockets[0].getsockname()``
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self._servers.append(server)
+        return server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Start accepting clients over a Unix socket.
+
+        Args:
+            path: The path of the socket
+        Returns:
+            The asyncio server
+        """
+        server = await asyncio.start_unix_server(self.handle_connection, path)
+        self._servers.append(server)
+        return server
+
+    async def evict_idle_games(
+        self, max_idle_seconds: float, interval: Optional[float] = None
+    ):
+        """Regularly move the games that have not been used for a while to disk, until cancelled.
+
+        Run it as a task next to the server, i.e. ``asyncio.create_task(server.evict_idle_games(600))``.
+
+        Args:
+            max_idle_seconds: How long a game can go unused before it is evicted
+            interval: How often to look for idle games, in seconds. Defaults to half of max_idle_seconds
+        """
+        interval = interval if interval is not None else max_idle_seconds / 2
+        while True:
+            await asyncio.sleep(interval)
+            self.registry.evict_idle(max_idle_seconds)
+
+    async def close(self):
+        """Stop accepting clients."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
@@ -0,0 +1,164 @@
+from typing import Callable, Dict, Optional, Set
+import asyncio
+
+from .._delta import GameDelta
+from .._event import GameEvent
+from .._game import Game
+
+
+class Spectator:
+    """A subscriber of a SpectatorFeed, as returned by ``SpectatorFeed.subscribe()``.
+
+    Iterate over the spectator (``async for update in spectator``) to receive the updates until the feed is closed.
+
+    Attributes:
+        feed (SpectatorFeed): The feed the spectator is subscribed to
+        version (int): The version of the game the spectator has seen
+    """
+
+    def __init__(self, feed: "SpectatorFeed", version: int, revision: int):
+        self.feed = feed
+        self.version = version
+        # The number of the last change of the feed the spectator was sent
+        self._revision = revision
+
+    async def next(self) -> Optional[bytes]:
+        """Wait until the game has changed since the last update, and get the changes since the spectator's version.
+
+        If the game has changed several times since the last update, for example because the spectator was busy
+        sending the last update, the changes are combined into one update, so slow spectators skip straight to the
+        latest state instead of falling further and further behind.
+
+        Returns:
+            The encoded changes since the spectator's version, or None if the feed was closed
+        """
+        feed = self.feed
+        while not feed.is_closed and feed._revision <= self._revision:
+            await feed._changed.wait()
+        if feed.is_closed:
+            return None
+        update = feed.get_update(self.version)
+        self.version = feed.game.version
+        self._revision = feed._revision
+        return update
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        update = await self.next()
+        if update is None:
+            raise StopAsyncIteration()
+        return update
+
+
+class SpectatorFeed:
+    """Pushes the changes made to a game to many spectators, each at their own pace.
+
+    The feed listens to the game's events and wakes the spectators after every change. Changes that are not made
+    to the game itself, such as the turn moving on, are announced with ``notify()``. Each spectator gets the
+    changes since the last version it has seen (see ``Game.get_delta()``), so a spectator that cannot keep up is
+    sent one combined update instead of a growing queue of them. Spectators at the same version share the same
+    encoded update, so the cost of a change does not grow with the number of spectators that are keeping up.
+
+    Args:
+        game: The game to watch
+        encode: The function that encodes the changes sent to the spectators. Defaults to ``GameDelta.to_bytes``
+
+    Attributes:
+        num_encoded (int): The number of updates encoded so far
+    """
+
+    def __init__(
+        self, game: Game, encode: Optional[Callable[[GameDelta], bytes]] = None
+    ):
+        self._game = game
+        self._encode = encode if encode is not None else GameDelta.to_bytes
+        self._spectators: Set[Spectator] = set()
+        self._changed = asyncio.Event()
+        self._closed = False
+        # The number of changes announced so far
+        self._revision = 0
+        # The encoded updates of the current revision, keyed by the version they start from
+        self._updates: Dict[int, bytes] = {}
+        self._updates_revision = 0
+        self.num_encoded = 0
+        game.add_event_listener(self._on_event)
+
+    @property
+    def game(self) -> Game:
+        """The game being watched."""
+        return self._game
+
+    @property
+    def num_spectators(self) -> int:
+        """The number of spectators subscribed to the feed."""
+        return len(self._spectators)
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether the feed has been closed."""
+        return self._closed
+
+    def subscribe(self, version: Optional[int] = None) -> Spectator:
+        """Add a spectator.
+
+        Args:
+            version: The version of the game the spectator has, i.e. from ``Game.from_bytes(game.to_bytes())``.
+                Defaults to the current version
+        Returns:
+            The spectator
+        """
+        spectator = Spectator(
+            self, self._game.version if version is None else version, self._revision
+        )
+        self._spectators.add(spectator)
+        return spectator
+
+    def unsubscribe(self, spectator: Spectator):
+        """Remove a spectator.
+
+        Args:
+            spectator: The spectator
+        """
+        self._spectators.discard(spectator)
+
+    def get_update(self, since_version: int) -> bytes:
+        """Get the encoded changes to the game since a version, encoding them only once per change.
+
+        Args:
+            since_version: The version to get the changes since
+        Returns:
+            The encoded changes
+        """
+        if self._updates_revision != self._revision:
+            self._updates.clear()
+            self._updates_revision = self._revision
+        update = self._updates.get(since_version)
+        if update is None:
+            update = self._encode(self._game.get_delta(since_version))
+            self._updates[since_version] = update
+            self.num_encoded += 1
+        return update
+
+    def close(self):
+        """Stop watching the game, and end the spectators' updates."""
+        if self._closed:
+            return
+        self._closed = True
+        self._game.remove_event_listener(self._on_event)
+        self._spectators.clear()
+        self._updates.clear()
+        self._changed.set()
+
+    def notify(self):
+        """Wake the spectators after a change that is not made through the game, i.e. the end of a turn."""
+        # Spectators only run after the change that woke them is finished, so the events of one action are sent
+        # as one update
+        self._revision += 1
+        changed = self._changed
+        self._changed = asyncio.Event()
+        changed.set()
+
+    def _on_event(self, event: GameEvent):
+        self.notify()
@@ -0,0 +1,68 @@
+from typing import AbstractSet, Dict, List, Tuple
+import random
+
+from .._delta import GameDelta
+from .._development_card import DevelopmentCard
+from .._game import Game
+
+
+def _deal_hidden_cards(
+    game: Game, visible: AbstractSet[int], rng: random.Random
+) -> Tuple[Dict[int, Dict[DevelopmentCard, int]], List[DevelopmentCard]]:
+    # Shuffle the development cards the viewer cannot see (the deck and the hands of the players not in visible)
+    # together and deal them back out, so every player keeps the same number of cards but which cards they are is
+    # only a guess. Returns the hand of every hidden player, keyed by their index, and the rest of the cards
+    hidden = [i for i in range(len(game.players)) if i not in visible]
+    pool = list(game.development_card_deck)
+    for i in hidden:
+        for card, amount in game.players[i].development_cards.items():
+            pool.extend([card] * amount)
+    rng.shuffle(pool)
+    hands = {}
+    for i in hidden:
+        hand = {d: 0 for d in DevelopmentCard}
+        for _ in range(sum(game.players[i].development_cards.values())):
+            hand[pool.pop()] += 1
+        hands[i] = hand
+    return hands, pool
+
+
+def get_state_view(game: Game, visible: AbstractSet[int], rng: random.Random) -> Game:
+    """Get a copy of a game with only what a client is allowed to see.
+
+    Args:
+        game: The game
+        visible: The indices of the players whose hands the client can see
+        rng: The random generator used to guess the hidden cards
+    Returns:
+        The copy, in which the development cards of the other players and the order of the deck are a random guess
+    """
+    view = game.copy()
+    hands, deck = _deal_hidden_cards(game, visible, rng)
+    for i, hand in hands.items():
+        view.players[i].development_cards = hand
+    view.development_card_deck = deck
+    return view
+
+
+def get_delta_view(
+    game: Game, delta: GameDelta, visible: AbstractSet[int], rng: random.Random
+) -> GameDelta:
+    """Hide the development cards a client is not allowed to see from the changes made to a game.
+
+    Args:
+        game: The game, at the version the delta ends at
+        delta: The changes
+        visible: The indices of the players whose hands the client can see
+        rng: The random generator used to guess the hidden cards
+    Returns:
+        The changes, in which the development cards of the other players are a random guess
+    """
+    if all(i in visible for i in delta.players):
+        return delta
+    hands, _ = _deal_hidden_cards(game, visible, rng)
+    players = {
+        i: p if i in visible else p._replace(development_cards=hands[i])
+        for i, p in delta.players.items()
+    }
+    return delta._replace(players=players)
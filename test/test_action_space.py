@@ -0,0 +1,41 @@
+import pytest
+
+from pycatan import ActionSpace, ActionType, Resource
+from pycatan.board import BeginnerBoard, BoardIndex
+
+
+def get_action_space():
+    return ActionSpace(BoardIndex(BeginnerBoard()), 4)
+
+
+def test_action_space_size():
+    assert get_action_space().size == 1 + 1 + 54 + 54 + 72 + 1 + 4 + 5 + 5 + 19 + 4 + 25
+
+
+def test_action_space_encodes_and_decodes():
+    space = get_action_space()
+    seen = set()
+    for action_type in ActionType:
+        for i in range(space.sizes[action_type]):
+            action = space.encode(action_type, i)
+            assert space.decode(action) == (action_type, i)
+            seen.add(action)
+    assert seen == set(range(space.size))
+
+
+def test_action_space_encodes_trades():
+    space = get_action_space()
+    assert space.decode(space.encode_trade(Resource.WOOL, Resource.ORE)) == (
+        ActionType.TRADE,
+        Resource.WOOL.value * 5 + Resource.ORE.value,
+    )
+
+
+def test_action_space_rejects_invalid_actions():
+    space = get_action_space()
+    with pytest.raises(ValueError):
+        space.encode(ActionType.MOVE_ROBBER, 19)
+    with pytest.raises(ValueError):
+        space.decode(space.size)
+    with pytest.raises(ValueError):
+        space.decode(-1)
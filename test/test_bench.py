@@ -0,0 +1,78 @@
+import json
+
+from pycatan.bench import (
+    BENCHMARKS,
+    Benchmark,
+    compare_results,
+    main,
+    run_benchmark,
+    run_benchmarks,
+)
+from pycatan.bench._benchmarks import get_branching_road_network
+
+
+def get_results(**medians):
+    return {
+        "benchmarks": {
+            name: {"loops": 1, "min": m, "median": m, "mean": m}
+            for name, m in medians.items()
+        }
+    }
+
+
+def test_run_benchmark_times_each_operation():
+    calls = []
+    result = run_benchmark(
+        Benchmark("test", lambda: lambda: calls.append(1), ops=2),
+        repeat=3,
+        min_time=0.001,
+    )
+    assert result["loops"] % 2 == 0
+    assert len(calls) >= 3 * result["loops"] / 2
+    assert 0 <= result["min"] <= result["median"]
+
+
+def test_run_benchmarks_results_are_json():
+    results = run_benchmarks(["valid_road_coords_empty"], repeat=1, min_time=0.001)
+    assert list(results["benchmarks"]) == ["valid_road_coords_empty"]
+    assert json.loads(json.dumps(results)) == results
+
+
+def test_every_benchmark_sets_up():
+    for benchmark in BENCHMARKS.values():
+        assert callable(benchmark.setup())
+
+
+def test_branching_road_network():
+    board, player = get_branching_road_network()
+    roads = [
+        p
+        for p in board.paths.values()
+        if p.building is not None and p.building.owner is player
+    ]
+    assert len(roads) == 15
+    assert board.calculate_player_longest_road(player) == 9
+
+
+def test_compare_results_finds_regressions():
+    baseline = get_results(a=1.0, b=1.0, c=1.0)
+    current = get_results(a=1.1, b=1.5, d=5.0)
+    regressions = compare_results(baseline, current, threshold=0.2)
+    assert [r.name for r in regressions] == ["b"]
+    assert regressions[0].ratio == 1.5
+    assert compare_results(baseline, current, threshold=0.05)[0].name == "a"
+
+
+def test_bench_main(tmp_path, capsys):
+    assert main(["--list"]) == 0
+    assert "random_game" in capsys.readouterr().out.split()
+    output = tmp_path / "results.json"
+    args = ["yield_for_roll", "-r", "1", "--min-time", "0.001"]
+    assert main(args + ["-o", str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert list(results["benchmarks"]) == ["yield_for_roll"]
+    # Compare against a baseline that is much faster
+    results["benchmarks"]["yield_for_roll"]["median"] /= 1000
+    output.write_text(json.dumps(results))
+    assert main(args + ["-b", str(output)]) == 1
+    assert "REGRESSION yield_for_roll" in capsys.readouterr().out
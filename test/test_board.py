@@ -1,7 +1,18 @@
 from typing import Set
+import random
+import types
 import pytest
 
-from pycatan.board import Board, BeginnerBoard, Coords, Hex, HexType, BuildingType
+from pycatan.board import (
+    Board,
+    BeginnerBoard,
+    BoardEvent,
+    BoardEventType,
+    Coords,
+    Hex,
+    HexType,
+    BuildingType,
+)
 from pycatan import Player, Resource
 from pycatan.errors import (
     InvalidCoordsError,
@@ -652,3 +663,459 @@ def test_get_players_on_hex():
     assert board.get_players_on_hex(Coords(0, 0)) == {p1}
     assert board.get_players_on_hex(Coords(1, 1)) == {p1, p2, p3}
     assert board.get_players_on_hex(Coords(2, -1)) == {p1, p3}
+
+
+def test_board_copy_is_independent():
+    board = BeginnerBoard()
+    p1 = Player()
+    add_free_settlement(board, p1, Coords(0, 1))
+    copy = board.copy()
+    assert type(copy) is BeginnerBoard
+    assert copy.hexes == board.hexes
+    assert copy.get_players_on_hex(Coords(0, 0)) == {p1}
+    p2 = Player()
+    add_free_settlement(copy, p2, Coords(1, 2))
+    assert copy.get_players_on_hex(Coords(1, 1)) == {p1, p2}
+    assert board.get_players_on_hex(Coords(1, 1)) == {p1}
+    # Buildings can be given to other players in the copy
+    other = board.copy({p1: p2})
+    assert other.get_players_on_hex(Coords(0, 0)) == {p2}
+
+
+def test_board_version_tracks_changes():
+    b = BeginnerBoard()
+    p = Player()
+    assert b.version == 0
+    add_free_settlement(b, p, Coords(1, 0))
+    add_free_road(b, p, {Coords(1, 0), Coords(1, -1)})
+    assert b.version == 2
+    assert b.get_changed_intersections(0) == {Coords(1, 0)}
+    assert b.get_changed_paths(0) == {frozenset({Coords(1, 0), Coords(1, -1)})}
+    assert b.get_changed_paths(2) == set()
+    assert not b.has_robber_moved(0)
+    b.move_robber(Coords(3, -3))
+    assert b.robber == Coords(3, -3)
+    assert b.has_robber_moved(2) and not b.has_robber_moved(3)
+    b.add_intersection_building(p, Coords(1, 0), BuildingType.CITY)
+    assert b.get_changed_intersections(2) == {Coords(1, 0)}
+    copy = b.copy()
+    assert copy.version == 4
+    assert copy.get_changed_paths(0) == b.get_changed_paths(0)
+
+
+def test_board_sends_events_to_listeners():
+    b = BeginnerBoard()
+    p = Player()
+    events = []
+    b.add_event_listener(events.append)
+    add_free_settlement(b, p, Coords(1, 0))
+    add_free_road(b, p, {Coords(1, 0), Coords(1, -1)})
+    b.add_intersection_building(p, Coords(1, 0), BuildingType.CITY)
+    b.move_robber(Coords(3, -3))
+    assert [(e.event_type, e.coords) for e in events] == [
+        (BoardEventType.INTERSECTION_BUILDING, Coords(1, 0)),
+        (BoardEventType.PATH_BUILDING, frozenset({Coords(1, 0), Coords(1, -1)})),
+        (BoardEventType.INTERSECTION_BUILDING, Coords(1, 0)),
+        (BoardEventType.ROBBER, Coords(3, -3)),
+    ]
+    assert events[2].building.building_type is BuildingType.CITY
+    assert events[2].building.owner is p
+    assert events[3] == BoardEvent(BoardEventType.ROBBER, Coords(3, -3), None)
+    # Copies do not keep the listeners
+    add_free_settlement(b.copy(), p, Coords(-4, 1))
+    assert len(events) == 4
+    b.remove_event_listener(events.append)
+    b.move_robber(Coords(0, 0))
+    assert len(events) == 4
+    with pytest.raises(ValueError):
+        b.remove_event_listener(events.append)
+
+
+def test_board_changes_are_tracked_per_consumer():
+    b = BeginnerBoard()
+    p = Player()
+    first = b.track_changes()
+    add_free_settlement(b, p, Coords(1, 0))
+    second = b.track_changes()
+    assert first.is_dirty and not second.is_dirty
+    add_free_road(b, p, {Coords(1, 0), Coords(1, -1)})
+    assert first.intersections == {Coords(1, 0)}
+    assert second.intersections == set()
+    assert first.paths == second.paths == {frozenset({Coords(1, 0), Coords(1, -1)})}
+    assert first.hexes == b.get_hexes_connected_to_intersection(Coords(1, 0))
+    assert second.hexes == set()
+    first.clear()
+    assert not first.is_dirty and first.intersections == set()
+    # Moving the robber changes the hex it started on and the hex it is on, but not the hexes it passed through
+    start = b.robber
+    b.move_robber(Coords(0, 0))
+    b.move_robber(Coords(1, -1))
+    assert first.robber_moved
+    assert first.hexes == {start, Coords(1, -1)}
+    first.clear()
+    b.move_robber(Coords(-1, 1))
+    assert first.hexes == {Coords(1, -1), Coords(-1, 1)}
+    # Consumers that missed a move may also get the hex the robber last moved from
+    assert second.hexes == {start, Coords(1, -1), Coords(-1, 1)}
+    # Only the last move of the robber is kept, so copies do not grow as it moves
+    copy = b.copy()
+    assert copy._robber_from == Coords(1, -1)
+    assert copy.get_changed_hexes(second.since_version) == b.get_changed_hexes(second.since_version)
+    # Hands changing the board's version does not make it dirty
+    first.clear()
+    b.version += 1
+    assert not first.is_dirty
+
+
+def _coords_key(coords):
+    return coords.q, coords.r
+
+
+def _path_key(path_coords):
+    return sorted(map(_coords_key, path_coords))
+
+
+def _old_is_connected_road(board, player, path_coords):
+    # The connectivity check that walked the neighbouring paths, before the road networks
+    for coords in path_coords:
+        building = board.intersections[coords].building
+        if building is not None:
+            if building.owner is player:
+                return True
+            continue
+        for c in board.get_intersection_connected_intersections(
+            board.intersections[coords]
+        ):
+            path = board.paths[frozenset({coords, c.coords})]
+            if path.building is not None and path.building.owner is player:
+                return True
+    return False
+
+
+def _get_components(board, player):
+    # The player's road networks, found with a flood fill
+    components = {}
+    for key, path in board.paths.items():
+        if (
+            path.building is None
+            or path.building.owner is not player
+            or key in components
+        ):
+            continue
+        stack = [key]
+        components[key] = key
+        while stack:
+            current = stack.pop()
+            for coords in current:
+                building = board.intersections[coords].building
+                if building is not None and building.owner is not player:
+                    continue
+                for other in board.get_paths_for_intersection_coords(coords):
+                    other_key = frozenset(other.path_coords)
+                    if (
+                        other.building is not None
+                        and other.building.owner is player
+                        and other_key not in components
+                    ):
+                        components[other_key] = key
+                        stack.append(other_key)
+    return components
+
+
+def test_road_networks_match_walking_the_board():
+    rng = random.Random(0)
+    for _ in range(3):
+        b = BeginnerBoard()
+        players = [Player() for _ in range(3)]
+        for p in players:
+            add_free_settlement(
+                b,
+                p,
+                rng.choice(
+                    sorted(b.get_valid_settlement_coords(p, False), key=_coords_key)
+                ),
+            )
+        for step in range(80):
+            p = rng.choice(players)
+            if step % 4 == 0:
+                spots = sorted(
+                    b.get_valid_settlement_coords(p, ensure_connected=False),
+                    key=_coords_key,
+                )
+                if spots:
+                    b.add_intersection_building(
+                        p,
+                        rng.choice(spots),
+                        BuildingType.SETTLEMENT,
+                        ensure_connected=False,
+                    )
+            else:
+                roads = sorted(b.get_valid_road_coords(p), key=_path_key)
+                if roads:
+                    add_free_road(b, p, set(rng.choice(roads)))
+            copy = b.copy()
+            for player in players:
+                for key, path in b.paths.items():
+                    if path.building is None:
+                        assert b.is_valid_road_coords(
+                            player, key
+                        ) == _old_is_connected_road(b, player, key)
+                for coords, intersection in b.intersections.items():
+                    expected = any(
+                        path.building is not None and path.building.owner is player
+                        for path in b.get_paths_for_intersection_coords(coords)
+                    )
+                    assert b._get_road_networks(player).has_road_at(coords) == expected
+                # Connected roads are in the same network, on the board and its copy
+                components = _get_components(b, player)
+                keys = sorted(components, key=_path_key)
+                for first in keys[:6]:
+                    for second in keys:
+                        same = components[first] == components[second]
+                        networks = b._get_road_networks(player)
+                        assert (networks.find(first) == networks.find(second)) == same
+                        networks = copy._get_road_networks(player)
+                        assert (networks.find(first) == networks.find(second)) == same
+
+
+def test_enemy_settlement_splits_road_network():
+    b = BeginnerBoard()
+    p1 = Player()
+    p2 = Player()
+    add_free_settlement(b, p1, Coords(1, 0))
+    add_free_road(b, p1, {Coords(1, 0), Coords(1, -1)})
+    add_free_road(b, p1, {Coords(1, -1), Coords(0, -1)})
+    add_free_road(b, p1, {Coords(0, -1), Coords(-1, 0)})
+    assert b.is_connected_by_road(p1, Coords(1, 0), Coords(-1, 0))
+    assert len(b.get_road_networks_at(p1, Coords(0, -1))) == 1
+    assert b.get_road_networks_at(p2, Coords(0, -1)) == set()
+    b.add_intersection_building(
+        p2, Coords(0, -1), BuildingType.SETTLEMENT, ensure_connected=False
+    )
+    assert not b.is_connected_by_road(p1, Coords(1, 0), Coords(-1, 0))
+    assert b.is_connected_by_road(p1, Coords(1, 0), Coords(1, -1))
+    assert len(b.get_road_networks_at(p1, Coords(0, -1))) == 2
+    # The road cut off by the settlement can still be extended from its other end
+    assert b.is_valid_road_coords(p1, {Coords(-1, 0), Coords(-2, 0)})
+    assert not b.is_valid_road_coords(p1, {Coords(0, -1), Coords(0, -2)})
+
+
+def _get_road_distances(board, player):
+    # The fewest roads needed to reach each intersection, searched again from scratch
+    distances = {}
+    for coords, intersection in board.intersections.items():
+        building = intersection.building
+        if (building is not None and building.owner is player) or any(
+            p.building is not None and p.building.owner is player
+            for p in board.get_paths_for_intersection_coords(coords)
+        ):
+            distances[coords] = 0
+    queue = list(distances)
+    while queue:
+        coords = queue.pop(0)
+        building = board.intersections[coords].building
+        if building is not None and building.owner is not player:
+            continue
+        for path in board.get_paths_for_intersection_coords(coords):
+            other = path.other_intersection(coords)
+            if path.building is None and other not in distances:
+                distances[other] = distances[coords] + 1
+                queue.append(other)
+    return distances
+
+
+def test_road_planner_matches_searching_again():
+    rng = random.Random(1)
+    for _ in range(3):
+        b = BeginnerBoard()
+        players = [Player() for _ in range(3)]
+        for p in players:
+            spots = b.get_valid_settlement_coords(p, False)
+            add_free_settlement(b, p, rng.choice(sorted(spots, key=_coords_key)))
+        planners = [b.plan_roads(p) for p in players]
+        for step in range(60):
+            p = rng.choice(players)
+            if step % 4 == 0:
+                spots = b.get_valid_settlement_coords(p, ensure_connected=False)
+                if spots:
+                    b.add_intersection_building(
+                        p,
+                        rng.choice(sorted(spots, key=_coords_key)),
+                        BuildingType.SETTLEMENT,
+                        ensure_connected=False,
+                    )
+            else:
+                roads = sorted(b.get_valid_road_coords(p), key=_path_key)
+                if roads:
+                    add_free_road(b, p, set(rng.choice(roads)))
+            for player, planner in zip(players, planners):
+                distances = _get_road_distances(b, player)
+                assert planner.get_distances() == distances
+                for coords, roads in planner.get_all_roads().items():
+                    assert len(roads) == distances[coords]
+                    if step % 10 != 0:
+                        continue
+                    # The roads can be built in order
+                    copy = b.copy()
+                    for road in roads:
+                        copy.assert_valid_road_coords(player, road)
+                        add_free_road(copy, player, set(road))
+                    if roads:
+                        assert coords in roads[-1]
+
+
+def test_road_planner_is_blocked_by_other_players():
+    b = BeginnerBoard()
+    p1 = Player()
+    p2 = Player()
+    add_free_settlement(b, p1, Coords(1, 0))
+    planner = b.plan_roads(p1)
+    assert planner.get_distance(Coords(1, 0)) == 0
+    assert planner.get_distance(Coords(1, -1)) == 1
+    assert planner.get_roads_to(Coords(0, -1)) == [
+        frozenset({Coords(1, 0), Coords(1, -1)}),
+        frozenset({Coords(1, -1), Coords(0, -1)}),
+    ]
+    b.add_intersection_building(
+        p2, Coords(0, -1), BuildingType.SETTLEMENT, ensure_connected=False
+    )
+    # The settlement can be reached, but not built past
+    assert planner.get_distance(Coords(0, -1)) == 2
+    assert all(Coords(0, -1) not in r for r in planner.get_roads_to(Coords(-1, 0)))
+    add_free_road(b, p2, {Coords(1, 0), Coords(2, 0)})
+    assert (
+        planner.get_distance(Coords(2, 0)) is None
+        or planner.get_distance(Coords(2, 0)) > 1
+    )
+    add_free_road(b, p1, {Coords(1, 0), Coords(0, 1)})
+    assert planner.get_distance(Coords(0, 1)) == 0
+    assert planner.get_distances() == _get_road_distances(b, p1)
+    assert b.plan_roads(p2).get_distances() == _get_road_distances(b, p2)
+
+
+def test_road_building_pairs_match_building_the_roads():
+    rng = random.Random(2)
+    for _ in range(3):
+        b = BeginnerBoard()
+        players = [Player() for _ in range(3)]
+        for p in players:
+            spots = b.get_valid_settlement_coords(p, False)
+            add_free_settlement(b, p, rng.choice(sorted(spots, key=_coords_key)))
+        for step in range(30):
+            p = rng.choice(players)
+            if step % 5 == 0:
+                spots = b.get_valid_settlement_coords(p, ensure_connected=False)
+                if spots:
+                    add_free_settlement(
+                        b, p, rng.choice(sorted(spots, key=_coords_key))
+                    )
+            else:
+                roads = sorted(b.get_valid_road_coords(p), key=_path_key)
+                if roads:
+                    add_free_road(b, p, set(rng.choice(roads)))
+        player = players[0]
+        longest_road = b.calculate_player_longest_road(player)
+        expected = {}
+        for first in b.get_valid_road_coords(player):
+            copy = b.copy()
+            add_free_road(copy, player, set(first))
+            for second in copy.get_valid_road_coords(player):
+                after = copy.copy()
+                add_free_road(after, player, set(second))
+                expected[frozenset((first, second))] = (
+                    after.calculate_player_longest_road(player) - longest_road
+                )
+        pairs = list(b.get_road_building_pairs(player))
+        assert len(expected) > 0
+        assert len(pairs) == len(expected)
+        assert {frozenset((f, s)): d for f, s, d in pairs} == expected
+
+
+def test_road_building_pairs_give_longest_road_delta():
+    b = BeginnerBoard()
+    p = Player()
+    add_free_settlement(b, p, Coords(1, 0))
+    add_free_road(b, p, {Coords(1, 0), Coords(1, -1)})
+    pairs = b.get_road_building_pairs(p)
+    assert isinstance(pairs, types.GeneratorType)
+    deltas = {frozenset((f, s)): d for f, s, d in pairs}
+    # Extending the road at one end twice
+    chain = frozenset(
+        (
+            frozenset({Coords(1, -1), Coords(0, -1)}),
+            frozenset({Coords(0, -1), Coords(-1, 0)}),
+        )
+    )
+    assert deltas[chain] == 2
+    # Extending the road at both ends
+    both_ends = frozenset(
+        (
+            frozenset({Coords(1, -1), Coords(0, -1)}),
+            frozenset({Coords(1, 0), Coords(0, 1)}),
+        )
+    )
+    assert deltas[both_ends] == 2
+    # Two branches from the same end
+    branches = frozenset(
+        (
+            frozenset({Coords(1, -1), Coords(0, -1)}),
+            frozenset({Coords(1, -1), Coords(2, -2)}),
+        )
+    )
+    assert deltas[branches] == 1
+    assert list(b.get_road_building_pairs(Player())) == []
+
+
+def test_longest_road_if_matches_building_the_road():
+    rng = random.Random(3)
+    for _ in range(4):
+        b = BeginnerBoard()
+        players = [Player() for _ in range(3)]
+        for p in players:
+            spots = b.get_valid_settlement_coords(p, False)
+            add_free_settlement(b, p, rng.choice(sorted(spots, key=_coords_key)))
+        for step in range(45):
+            p = rng.choice(players)
+            if step % 6 == 0:
+                spots = b.get_valid_settlement_coords(p, ensure_connected=False)
+                if spots:
+                    add_free_settlement(
+                        b, p, rng.choice(sorted(spots, key=_coords_key))
+                    )
+            else:
+                roads = sorted(b.get_valid_road_coords(p), key=_path_key)
+                if roads:
+                    add_free_road(b, p, set(rng.choice(roads)))
+            if step % 3 != 0:
+                continue
+            for player in players:
+                version = b.version
+                expected = {}
+                for key in b.get_valid_road_coords(player):
+                    copy = b.copy()
+                    add_free_road(copy, player, set(key))
+                    expected[key] = copy.calculate_player_longest_road(player)
+                    assert b.longest_road_if(player, key) == expected[key]
+                assert b.longest_roads_if(player) == expected
+                # The board is not changed
+                assert b.version == version
+                assert all(b.paths[k].building is None for k in expected)
+
+
+def test_longest_road_if_goes_through_the_new_road():
+    b = BeginnerBoard()
+    p1 = Player()
+    p2 = Player()
+    add_free_settlement(b, p1, Coords(1, 0))
+    add_free_road_from_path(b, p1, [Coords(2, -2), Coords(1, -1), Coords(0, -1)])
+    add_free_road_from_path(
+        b, p1, [Coords(1, 0), Coords(0, 1), Coords(-1, 1), Coords(-2, 2)]
+    )
+    assert b.calculate_player_longest_road(p1) == 3
+    # Joining both roads, with only one of the branches at (1, -1)
+    assert b.longest_road_if(p1, {Coords(1, 0), Coords(1, -1)}) == 5
+    add_free_settlement(b, p2, Coords(-1, 1))
+    # Another player's settlement cuts the road short
+    assert b.longest_road_if(p1, {Coords(1, 0), Coords(1, -1)}) == 4
+    with pytest.raises(CoordsBlockedError):
+        b.longest_road_if(p1, {Coords(1, 0), Coords(0, 1)})
@@ -0,0 +1,39 @@
+from pycatan.board import BeginnerBoard, RandomBoard, BoardIndex, Coords
+
+
+def test_board_index_numbers_everything():
+    index = BoardIndex(BeginnerBoard())
+    assert len(index.hex_coords) == 19
+    assert len(index.intersection_coords) == 54
+    assert len(index.path_coords) == 72
+
+
+def test_board_index_is_the_same_for_boards_with_the_same_layout():
+    one = BoardIndex(BeginnerBoard())
+    two = BoardIndex(RandomBoard())
+    assert one.hex_coords == two.hex_coords
+    assert one.intersection_coords == two.intersection_coords
+    assert one.path_coords == two.path_coords
+
+
+def test_board_index_adjacency():
+    b = BeginnerBoard()
+    index = BoardIndex(b)
+    for i, coords in enumerate(index.intersection_coords):
+        assert {
+            index.intersection_coords[n] for n in index.intersection_neighbors[i]
+        } == {
+            c.coords
+            for c in b.get_intersection_connected_intersections(b.intersections[coords])
+        }
+        assert {index.path_coords[p] for p in index.intersection_paths[i]} == {
+            frozenset(p.path_coords)
+            for p in b.get_paths_for_intersection_coords(coords)
+        }
+        assert {
+            index.hex_coords[h] for h in index.intersection_hexes[i]
+        } == b.get_hexes_connected_to_intersection(coords)
+    center = index.hex_indices[Coords(0, 0)]
+    assert {index.intersection_coords[i] for i in index.hex_intersections[center]} == {
+        i.coords for i in b.get_connected_hex_intersections(b.hexes[Coords(0, 0)])
+    }
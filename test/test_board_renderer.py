@@ -1,4 +1,13 @@
-from pycatan.board import BoardRenderer, BeginnerBoard, Coords
+import re
+import subprocess
+import sys
+import pytest
+
+import pycatan.board
+from pycatan import Player
+from pycatan.board import Board, BoardRenderer, BeginnerBoard, Coords, Hex, HexType
+
+from .helpers import add_free_settlement, add_free_city, add_free_road
 
 
 def test_renders_beginner_board(capsys, snapshot):
@@ -44,3 +53,190 @@ def test_can_render_using_path_labels(snapshot):
         ),
         "label_paths.txt",
     )
+
+
+def test_renderer_reuses_static_layer():
+    b = BeginnerBoard()
+    renderer = BoardRenderer(b)
+    empty = renderer.get_board_as_string()
+    layer = renderer._get_static_layer()
+    p = Player()
+    add_free_settlement(b, p, Coords(1, 0))
+    built = renderer.get_board_as_string()
+    assert renderer._get_static_layer() is layer
+    assert built != empty
+    assert (
+        built == BoardRenderer(b, player_color_map={p: "#00c40d"}).get_board_as_string()
+    )
+    b.intersections[Coords(1, 0)].building = None
+    assert renderer.get_board_as_string() == empty
+
+
+def test_renderer_draws_robber_where_it_is():
+    b = BeginnerBoard()
+    renderer = BoardRenderer(b)
+    before = renderer.get_board_as_string()
+    b.robber = Coords(1, 0)
+    after = renderer.get_board_as_string()
+    assert before != after
+    assert after.count("R") == before.count("R")
+
+
+def test_renderer_rebuilds_static_layer_when_colors_change():
+    b = BeginnerBoard()
+    renderer = BoardRenderer(b)
+    before = renderer.get_board_as_string()
+    renderer.hex_color_map = dict(renderer.hex_color_map)
+    renderer.hex_color_map[HexType.DESERT] = "#000000"
+    assert renderer.get_board_as_string() != before
+
+
+def test_renderers_do_not_share_player_colors():
+    # Each renderer can give out all the default colors
+    for _ in range(3):
+        b = BeginnerBoard()
+        for c in [Coords(1, 0), Coords(-1, 0), Coords(2, -2), Coords(-2, 2)]:
+            add_free_settlement(b, Player(), c)
+        renderer = BoardRenderer(b)
+        renderer.get_board_as_string()
+        assert sorted(renderer.player_color_map.values()) == sorted(
+            BoardRenderer.DEFAULT_PLAYER_COLORS
+        )
+
+
+class FakeTerminal:
+    """Keeps track of the visible characters written to a terminal, ignoring colors"""
+
+    def __init__(self):
+        self.lines = {}
+        self.row = 0
+        self.column = 0
+
+    def write(self, text):
+        for token in re.findall(r"\x1b\[[0-9;]*[A-Za-z]|\n|[^\x1b\n]", text):
+            if token == "\n":
+                self.row += 1
+                self.column = 0
+            elif token == "\x1b[2J":
+                self.lines = {}
+            elif token == "\x1b[K":
+                line = self.lines.get(self.row, [])
+                self.lines[self.row] = line[: self.column]
+            elif token.endswith("H"):
+                numbers = token[2:-1].split(";") if len(token) > 3 else ["1", "1"]
+                self.row, self.column = int(numbers[0]) - 1, int(numbers[1]) - 1
+            elif not token.startswith("\x1b"):
+                line = self.lines.setdefault(self.row, [])
+                line.extend([" "] * (self.column + 1 - len(line)))
+                line[self.column] = token
+                self.column += 1
+
+    def get_screen(self):
+        return "\n".join(
+            "".join(self.lines.get(r, [])) for r in range(max(self.lines) + 1)
+        )
+
+
+def get_visible(text):
+    return re.sub(r"\x1b\[[0-9;]*m", "", text)
+
+
+def test_live_render_only_writes_changes():
+    b = BeginnerBoard()
+    renderer = BoardRenderer(b)
+    terminal = FakeTerminal()
+    first = renderer.get_board_update_as_string()
+    assert first.startswith("\x1b[2J\x1b[H")
+    terminal.write(first)
+    assert terminal.get_screen() == get_visible(renderer.get_board_as_string())
+    assert renderer.get_board_update_as_string() == ""
+
+    p = Player()
+    add_free_settlement(b, p, Coords(1, 0))
+    update = renderer.get_board_update_as_string()
+    assert 0 < len(update) < len(first) / 20
+    terminal.write(update)
+    assert terminal.get_screen() == get_visible(renderer.get_board_as_string())
+
+    b.robber = Coords(1, 0)
+    terminal.write(renderer.get_board_update_as_string())
+    assert terminal.get_screen() == get_visible(renderer.get_board_as_string())
+
+
+def test_live_render_handles_wide_labels():
+    b = BeginnerBoard()
+    renderer = BoardRenderer(b)
+    terminal = FakeTerminal()
+    terminal.write(renderer.get_board_update_as_string())
+    labels = {h: "%d" % (10 + i) for i, h in enumerate(b.hexes.values())}
+    terminal.write(renderer.get_board_update_as_string(hex_labels=labels))
+    assert terminal.get_screen() == get_visible(
+        renderer.get_board_as_string(hex_labels=labels)
+    )
+    terminal.write(renderer.get_board_update_as_string())
+    assert terminal.get_screen() == get_visible(renderer.get_board_as_string())
+
+
+def test_reset_live_render(capsys):
+    renderer = BoardRenderer(BeginnerBoard())
+    renderer.render_board_update()
+    first = capsys.readouterr().out
+    renderer.render_board_update()
+    assert capsys.readouterr().out == ""
+    renderer.reset_live_render()
+    renderer.render_board_update()
+    assert capsys.readouterr().out == first
+
+
+def test_can_get_as_plain_string(snapshot):
+    b = BeginnerBoard()
+    assert BoardRenderer(b, use_color=False).get_board_as_string() == get_visible(
+        BoardRenderer(b).get_board_as_string()
+    )
+    p1 = Player()
+    p2 = Player()
+    add_free_settlement(b, p1, Coords(1, 0))
+    add_free_road(b, p1, {Coords(1, 0), Coords(0, 1)})
+    add_free_city(b, p2, Coords(-1, 0))
+    add_free_road(b, p2, {Coords(-1, 0), Coords(-2, 0)})
+    board = BoardRenderer(b, use_color=False).get_board_as_string()
+    assert "\x1b" not in board
+    # Players are lettered in the order they are drawn, and roads are not drawn with digits, so they cannot be
+    # read as part of a token
+    assert "b~~" in board
+    assert "--A--" in board and "3  =  4" in board
+    # The legend tells the players' buildings and roads apart
+    assert board.split("\n")[-2:] == [
+        "Player 1: a settlement, A city, = road",
+        "Player 2: b settlement, B city, ~ road",
+    ]
+    snapshot.assert_match(board, "board_plain.txt")
+
+
+def test_renders_larger_boards():
+    # A board with 4 rings of hexes around the middle, instead of 3
+    offsets = [Coords(1, 1), Coords(2, -1), Coords(1, -2)]
+    offsets += [Coords(0, 0) - c for c in offsets]
+    coords = {Coords(0, 0)}
+    for _ in range(3):
+        coords |= {c + o for c in coords for o in offsets}
+    hexes = {Hex(c, HexType.FOREST, 3) for c in coords}
+    board = BoardRenderer(Board(hexes, robber=Coords(0, 0)), use_color=False)
+    rows = board.get_board_as_string().split("\n")
+    assert len(hexes) == 37
+    assert len(rows) > 20
+    assert len(rows[0]) > 55
+    assert sum(row.count("3") for row in rows) == len(hexes)
+
+
+def test_renderer_is_imported_lazily():
+    code = (
+        "import sys, pycatan, pycatan.board\n"
+        "assert 'colored' not in sys.modules\n"
+        "assert 'pycatan.board._board_renderer' not in sys.modules\n"
+        "pycatan.board.BoardRenderer(pycatan.board.BeginnerBoard(), use_color=False).get_board_as_string()\n"
+        "assert 'colored' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    with pytest.raises(AttributeError):
+        pycatan.board.NotARenderer
@@ -0,0 +1,64 @@
+import random
+import pytest
+
+from pycatan import ActionType
+from pycatan.board import BeginnerBoard
+from pycatan.env import CatanEnv
+
+
+def get_legal(env):
+    return [i for i, legal in enumerate(env.action_mask) if legal]
+
+
+def test_catan_env_mask_matches_legal_actions():
+    env = CatanEnv(seed=0)
+    rng = random.Random(0)
+    for _ in range(200):
+        assert get_legal(env) == list(env.machine.legal_actions())
+        env.step(rng.choice(get_legal(env)))
+
+
+def test_catan_env_is_reproducible_with_seed():
+    def play(seed):
+        env = CatanEnv(seed=seed)
+        rng = random.Random(1)
+        for _ in range(300):
+            env.step(rng.choice(get_legal(env)))
+        return [dict(p.resources) for p in env.game.players]
+
+    assert play(3) == play(3)
+
+
+def test_catan_env_rewards_winner():
+    env = CatanEnv(seed=2)
+    rng = random.Random(2)
+    done = False
+    while not done:
+        assert list(env.rewards) == [0, 0, 0, 0]
+        done = env.step(rng.choice(get_legal(env)))
+    winner = env.game.players.index(env.machine.winner)
+    assert env.rewards[winner] == 1
+    assert sum(env.rewards) == 1
+    assert get_legal(env) == []
+    env.reset()
+    assert list(env.rewards) == [0, 0, 0, 0]
+    assert env.machine.turn_number == 0
+    assert len(get_legal(env)) == 54
+
+
+def test_catan_env_writes_into_given_buffers():
+    size = CatanEnv().action_space.size
+    batch = bytearray(2 * size)
+    env = CatanEnv(
+        board_factory=lambda rng: BeginnerBoard(),
+        action_mask=memoryview(batch)[size:],
+    )
+    assert batch[:size] == bytes(size)
+    assert sum(batch[size:]) == 54
+    env.step(env.action_space.encode(ActionType.BUILD_SETTLEMENT, 0))
+    assert sum(batch[size:]) == len(env.machine.legal_actions())
+
+
+def test_catan_env_rejects_wrong_mask_size():
+    with pytest.raises(ValueError):
+        CatanEnv(action_mask=bytearray(3))
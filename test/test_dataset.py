@@ -0,0 +1,129 @@
+from array import array
+import builtins
+import os
+import random
+import pytest
+
+from pycatan.env import CatanEnv, Dataset, DatasetWriter, export_games
+from pycatan.env import _dataset
+
+
+def write_rows(directory, num_rows: int, size: int = 3):
+    with DatasetWriter(directory, size, buffer_size=16) as writer:
+        for i in range(num_rows):
+            writer.add(bytes([i] * size), 1000 + i, i % 4)
+
+
+def test_export_games_writes_every_state(tmp_path):
+    num_rows = export_games(str(tmp_path), 2, seed=1, max_turns=10)
+    env = CatanEnv(seed=1, max_turns=10)
+    with Dataset(str(tmp_path)) as dataset:
+        assert len(dataset) == num_rows
+        assert dataset.observation_size == len(env.observation)
+        # Replay the first game from the dataset
+        for i in range(num_rows):
+            observation, action, player = dataset[i]
+            assert bytes(observation) == bytes(env.observation)
+            assert player == env.acting_player_index
+            if env.step(action):
+                break
+        del observation
+
+
+def test_dataset_reads_rows(tmp_path):
+    write_rows(tmp_path, 10)
+    with Dataset(str(tmp_path)) as dataset:
+        assert len(dataset) == 10
+        row, action, player = dataset[-1]
+        assert (bytes(row), action, player) == (b"\x09\x09\x09", 1009, 1)
+        with pytest.raises(IndexError):
+            dataset[10]
+        del row
+
+
+def test_dataset_files_are_npy_files(tmp_path):
+    write_rows(tmp_path, 5)
+    data = (tmp_path / "observations.npy").read_bytes()
+    assert data[:6] == b"\x93NUMPY"
+    header_end = 10 + int.from_bytes(data[8:10], "little")
+    assert header_end % 64 == 0
+    assert b"'shape': (5,3,)" in data[:header_end]
+    assert data[header_end:] == bytes([0] * 3 + [1] * 3 + [2] * 3 + [3] * 3 + [4] * 3)
+
+
+def test_dataset_can_be_read_with_numpy(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    write_rows(tmp_path, 5)
+    observations = numpy.load(str(tmp_path / "observations.npy"), mmap_mode="r")
+    actions = numpy.load(str(tmp_path / "actions.npy"), mmap_mode="r")
+    assert observations.shape == (5, 3)
+    assert list(observations[:, 0]) == [0, 1, 2, 3, 4]
+    assert list(actions) == [1000, 1001, 1002, 1003, 1004]
+
+
+def test_dataset_gets_batches(tmp_path):
+    write_rows(tmp_path, 20)
+    with Dataset(str(tmp_path)) as dataset:
+        observations, actions, players = dataset.get_batch([5, 2])
+        assert observations == b"\x05\x05\x05\x02\x02\x02"
+        assert list(actions) == [1005, 1002]
+        assert players == b"\x01\x02"
+        # Sample into the same buffers every time
+        out = (bytearray(8 * 3), array("i", [0] * 8), bytearray(8))
+        batch = dataset.sample_batch(8, random.Random(0), *out)
+        assert all(a is b for a, b in zip(batch, out))
+        rows = [out[0][i * 3] for i in range(8)]
+        assert rows == sorted(set(rows))
+        assert list(out[1]) == [1000 + r for r in rows]
+        with pytest.raises(ValueError):
+            dataset.sample_batch(21)
+
+
+def test_dataset_writer_updates_header_on_flush(tmp_path):
+    writer = DatasetWriter(str(tmp_path), 2)
+    writer.add(b"ab", 1, 0)
+    writer.flush()
+    with Dataset(str(tmp_path)) as dataset:
+        assert len(dataset) == 1
+    writer.add(b"cd", 2, 1)
+    writer.close()
+    with Dataset(str(tmp_path)) as dataset:
+        assert len(dataset) == 2
+
+
+def test_dataset_writer_checks_observation_size(tmp_path):
+    with DatasetWriter(str(tmp_path), 2) as writer:
+        with pytest.raises(ValueError):
+            writer.add(b"abc", 1, 0)
+
+
+def record_opened_files(monkeypatch):
+    opened = []
+
+    def record_open(*args, **kwargs):
+        f = builtins.open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(_dataset, "open", record_open, raising=False)
+    return opened
+
+
+def test_dataset_writer_closes_files_when_one_cannot_be_opened(tmp_path, monkeypatch):
+    os.mkdir(str(tmp_path / "players.npy"))
+    opened = record_opened_files(monkeypatch)
+    with pytest.raises(OSError):
+        DatasetWriter(str(tmp_path), 2)
+    assert len(opened) == 2
+    assert all(f.closed for f in opened)
+
+
+def test_dataset_closes_files_when_one_cannot_be_read(tmp_path, monkeypatch):
+    write_rows(str(tmp_path), 4)
+    with open(str(tmp_path / "players.npy"), "r+b") as f:
+        f.truncate(130)
+    opened = record_opened_files(monkeypatch)
+    with pytest.raises(ValueError):
+        Dataset(str(tmp_path))
+    assert len(opened) == 3
+    assert all(f.closed for f in opened)
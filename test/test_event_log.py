@@ -0,0 +1,206 @@
+from typing import Dict
+import io
+import random
+import pytest
+
+from pycatan import (
+    EventType,
+    Game,
+    GameEvent,
+    GameLogWriter,
+    SeekableGameLog,
+    TurnMachine,
+    read_game_log,
+    replay_game_log,
+)
+from pycatan.board import BeginnerBoard, Coords, RandomBoard
+
+
+class SlowStream:
+    """A stream that returns a few bytes at a time, like a socket"""
+
+    def __init__(self, data: bytes, size: int = 7):
+        self.data = data
+        self.pos = 0
+        self.size = size
+
+    def read(self, n=-1):
+        start, end = self.pos, self.pos + min(n, self.size)
+        self.pos = min(end, len(self.data))
+        return self.data[start:end]
+
+
+def play_logged_game(
+    writer: GameLogWriter, seed: int, turns: int = 30, snapshots: Dict = None
+) -> Game:
+    """Play a game with random actions, marking each turn. Saves the game at the start of every turn in snapshots"""
+    rng = random.Random(seed)
+    machine = TurnMachine(Game(RandomBoard(rng)), rng=rng)
+    writer.start_game(machine.game)
+    while machine.turn_number < turns and not machine.is_over:
+        turn = machine.turn_number
+        machine.step(rng.choice(machine.legal_actions()))
+        if machine.turn_number != turn:
+            writer.start_turn(machine.turn_number)
+            if snapshots is not None:
+                snapshots[machine.turn_number] = machine.game.to_bytes()
+    writer.end_game()
+    return machine.game
+
+
+def test_game_sends_events_to_listeners():
+    g = Game(BeginnerBoard())
+    events = []
+    g.add_event_listener(events.append)
+    g.build_settlement(
+        g.players[1], Coords(1, 0), cost_resources=False, ensure_connected=False
+    )
+    g.move_robber(Coords(0, 0))
+    g.remove_event_listener(events.append)
+    g.move_robber(Coords(3, -3))
+    assert events == [
+        GameEvent(EventType.BUILD_SETTLEMENT, (1, 1, 0, 0)),
+        GameEvent(EventType.MOVE_ROBBER, (0, 0)),
+    ]
+
+
+def test_game_copy_does_not_send_events():
+    g = Game(BeginnerBoard())
+    events = []
+    g.add_event_listener(events.append)
+    g.copy().move_robber(Coords(0, 0))
+    assert events == []
+
+
+def test_apply_event_checks_development_card_deck():
+    g = Game(BeginnerBoard())
+    card = g.development_card_deck[0]
+    other = [c for c in g.development_card_deck if c is not card][0]
+    with pytest.raises(ValueError):
+        g.apply_event(GameEvent(EventType.BUILD_DEVELOPMENT_CARD, (0, other.value)))
+
+
+def test_replay_game_log_gets_same_game():
+    stream = io.BytesIO()
+    # A small buffer so that the records are written in several blocks
+    with GameLogWriter(stream, buffer_size=256) as writer:
+        games = [play_logged_game(writer, seed) for seed in range(3)]
+    stream.seek(0)
+    replayed = list(replay_game_log(stream))
+    assert [g.to_bytes() for g in replayed] == [g.to_bytes() for g in games]
+
+
+def test_read_game_log_reads_events_in_order():
+    stream = io.BytesIO()
+    writer = GameLogWriter(stream)
+    rng = random.Random(1)
+    machine = TurnMachine(Game(BeginnerBoard()), rng=rng)
+    events = []
+    machine.game.add_event_listener(events.append)
+    start = machine.game.to_bytes()
+    writer.start_game(machine.game)
+    for _ in range(200):
+        machine.step(rng.choice(machine.legal_actions()))
+    writer.close()
+    logged = read_game_log(SlowStream(stream.getvalue()))
+    game = next(logged)
+    assert game.snapshot == start
+    assert list(game.events()) == events
+    with pytest.raises(ValueError):
+        game.events()
+    assert list(logged) == []
+
+
+def test_read_game_log_skips_unread_events():
+    stream = io.BytesIO()
+    with GameLogWriter(stream) as writer:
+        play_logged_game(writer, 0)
+        last = play_logged_game(writer, 1)
+    logged = read_game_log(io.BytesIO(stream.getvalue()))
+    first = next(logged)
+    # Only read some of the events of the first game
+    next(first.events())
+    second = next(logged)
+    for game, event in second.replay():
+        pass
+    assert game.to_bytes() == last.to_bytes()
+    assert list(logged) == []
+
+
+def test_read_game_log_reads_unfinished_games():
+    stream = io.BytesIO()
+    writer = GameLogWriter(stream)
+    g = Game(BeginnerBoard())
+    writer.start_game(g)
+    g.move_robber(Coords(0, 0))
+    writer.flush()
+    replayed = list(replay_game_log(io.BytesIO(stream.getvalue())))
+    assert len(replayed) == 1
+    assert replayed[0].board.robber == Coords(0, 0)
+
+
+def test_read_game_log_rejects_truncated_logs():
+    stream = io.BytesIO()
+    with GameLogWriter(stream) as writer:
+        play_logged_game(writer, 0, turns=5)
+    with pytest.raises(ValueError):
+        list(replay_game_log(io.BytesIO(stream.getvalue()[:-5])))
+
+
+def test_writer_logs_one_game_at_a_time():
+    writer = GameLogWriter(io.BytesIO())
+    with pytest.raises(ValueError):
+        writer.end_game()
+    writer.start_game(Game(BeginnerBoard()))
+    with pytest.raises(ValueError):
+        writer.start_game(Game(BeginnerBoard()))
+
+
+def test_seekable_game_log_gets_game_at_turn():
+    stream = io.BytesIO()
+    snapshots = [{}, {}]
+    with GameLogWriter(stream, keyframe_interval=4) as writer:
+        for seed in range(2):
+            play_logged_game(writer, seed, snapshots=snapshots[seed])
+    log = SeekableGameLog(stream)
+    assert len(log) == 2
+    assert log.get_keyframe_turns(0) == [4, 8, 12, 16, 20, 24, 28]
+    for seed in range(2):
+        for turn, snapshot in snapshots[seed].items():
+            assert log.get_game(seed, turn).to_bytes() == snapshot
+    # The log can still be read from start to end
+    stream.seek(0)
+    assert len(list(replay_game_log(stream))) == 2
+
+
+def test_seekable_game_log_gets_start_of_game():
+    stream = io.BytesIO()
+    g = Game(BeginnerBoard())
+    with GameLogWriter(stream) as writer:
+        writer.start_game(g)
+        g.move_robber(Coords(3, -3))
+    assert SeekableGameLog(stream).get_game(0).board.robber == Coords(0, 0)
+
+
+def test_seekable_game_log_scans_logs_without_index():
+    first, second = io.BytesIO(), io.BytesIO()
+    snapshots = {}
+    with GameLogWriter(first, keyframe_interval=5, write_index=False) as writer:
+        play_logged_game(writer, 0)
+    with GameLogWriter(second, keyframe_interval=5) as writer:
+        play_logged_game(writer, 1, snapshots=snapshots)
+    # Two logs joined together, where the index at the end only covers the second one
+    for data in [first.getvalue(), first.getvalue() + second.getvalue()]:
+        log = SeekableGameLog(io.BytesIO(data))
+        assert log.get_keyframe_turns(0) == [5, 10, 15, 20, 25, 30]
+    assert len(log) == 2
+    assert log.get_game(1, 12).to_bytes() == snapshots[12]
+
+
+def test_seekable_game_log_rejects_missing_turns():
+    stream = io.BytesIO()
+    with GameLogWriter(stream) as writer:
+        play_logged_game(writer, 0, turns=5)
+    log = SeekableGameLog(stream)
+    with pytest.raises(ValueError):
+        log.get_game(0, 6)
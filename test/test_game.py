@@ -1,9 +1,18 @@
 from typing import Dict
+import random
 import pytest
 
-from pycatan import Player, Game, RollYield, Resource, DevelopmentCard
+from pycatan import (
+    Player,
+    Game,
+    GameDelta,
+    RollYield,
+    Resource,
+    DevelopmentCard,
+    TurnMachine,
+)
 from pycatan.errors import NotEnoughResourcesError
-from pycatan.board import Coords, BeginnerBoard, BuildingType
+from pycatan.board import Coords, BeginnerBoard, BuildingType, RandomBoard
 
 from .helpers import get_resource_hand, build_road_along_path
 
@@ -406,3 +415,195 @@ def test_get_victory_points_complicated():
     assert g.get_victory_points(g.players[2]) == 4
     assert g.get_victory_points(g.players[1]) == 8
     assert g.get_victory_points(g.players[0]) == 3
+
+
+def test_game_copy_is_independent():
+    g = Game(BeginnerBoard())
+    g.build_settlement(
+        g.players[0], Coords(1, 0), cost_resources=False, ensure_connected=False
+    )
+    g.players[0].add_resources(get_resource_hand(ore=3, grain=2))
+    g.largest_army_owner = g.players[1]
+    copy = g.copy()
+    assert copy.board.intersections[Coords(1, 0)].building.owner is copy.players[0]
+    assert copy.largest_army_owner is copy.players[1]
+    assert copy.development_card_deck == g.development_card_deck
+    copy.upgrade_settlement_to_city(copy.players[0], Coords(1, 0))
+    copy.development_card_deck.pop()
+    assert (
+        g.board.intersections[Coords(1, 0)].building.building_type
+        is BuildingType.SETTLEMENT
+    )
+    assert g.players[0].resources == get_resource_hand(ore=3, grain=2)
+    assert len(g.development_card_deck) == len(copy.development_card_deck) + 1
+    assert g.get_victory_points(g.players[0]) == 1
+    assert copy.get_victory_points(copy.players[0]) == 2
+
+
+def get_game_state(g: Game):
+    """Describe the game with plain values, so that two games can be compared"""
+    players = {p: i for i, p in enumerate(g.players)}
+    players[None] = None
+    return {
+        "hexes": {
+            (c.q, c.r): (h.hex_type, h.token_number) for c, h in g.board.hexes.items()
+        },
+        "harbors": {
+            frozenset((c.q, c.r) for c in k): h.resource
+            for k, h in g.board.harbors.items()
+        },
+        "robber": (g.board.robber.q, g.board.robber.r),
+        "intersections": {
+            (c.q, c.r): (players[i.building.owner], i.building.building_type)
+            for c, i in g.board.intersections.items()
+            if i.building is not None
+        },
+        "paths": {
+            frozenset((c.q, c.r) for c in k): (
+                players[p.building.owner],
+                p.building.building_type,
+            )
+            for k, p in g.board.paths.items()
+            if p.building is not None
+        },
+        "players": [
+            (
+                p.resources,
+                p.development_cards,
+                p.number_played_knights,
+                {
+                    frozenset((c.q, c.r) for c in h.path_coords)
+                    for h in p.connected_harbors
+                },
+            )
+            for p in g.players
+        ],
+        "longest_road_owner": players[g.longest_road_owner],
+        "largest_army_owner": players[g.largest_army_owner],
+        "deck": g.development_card_deck,
+    }
+
+
+def test_game_to_bytes_round_trips():
+    rng = random.Random(3)
+    machine = TurnMachine(Game(RandomBoard(rng)), rng=rng)
+    while machine.turn_number < 40 and not machine.is_over:
+        machine.step(rng.choice(machine.legal_actions()))
+    g = machine.game
+    g.largest_army_owner = g.players[2]
+    data = g.to_bytes()
+    assert len(data) < 512
+    copy = Game.from_bytes(data)
+    assert get_game_state(copy) == get_game_state(g)
+    assert copy.to_bytes() == data
+    # The copy is a game that can be played
+    assert copy.get_victory_points(copy.players[0]) == g.get_victory_points(
+        g.players[0]
+    )
+    assert copy.board.get_valid_road_coords(
+        copy.players[0]
+    ) == g.board.get_valid_road_coords(g.players[0])
+
+
+def test_game_to_bytes_keeps_connected_harbors():
+    g = Game(BeginnerBoard(), 3)
+    g.build_settlement(
+        g.players[1], Coords(1, 3), cost_resources=False, ensure_connected=False
+    )
+    assert len(g.players[1].connected_harbors) == 1
+    copy = Game.from_bytes(g.to_bytes())
+    assert len(copy.players) == 3
+    assert copy.players[1].connected_harbors == set(
+        h for h in copy.board.harbors.values() if Coords(1, 3) in h.path_coords
+    )
+    assert get_game_state(copy) == get_game_state(g)
+
+
+def test_game_from_bytes_rejects_invalid_data():
+    data = Game(BeginnerBoard()).to_bytes()
+    with pytest.raises(ValueError):
+        Game.from_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        Game.from_bytes(data + b"\x00")
+    with pytest.raises(ValueError):
+        Game.from_bytes(b"not a game")
+    # Only the current format is read
+    with pytest.raises(ValueError):
+        Game.from_bytes(data[:3] + bytes([data[3] + 1]) + data[4:])
+
+
+def test_game_to_bytes_requires_owners_to_be_in_game():
+    g = Game(BeginnerBoard())
+    g.build_settlement(
+        Player(), Coords(1, 0), cost_resources=False, ensure_connected=False
+    )
+    with pytest.raises(ValueError):
+        g.to_bytes()
+
+
+def test_transfer_resources():
+    g = Game(BeginnerBoard())
+    g.add_resources(g.players[0], get_resource_hand(ore=2, wool=1))
+    g.transfer_resources(g.players[0], g.players[1], get_resource_hand(ore=2))
+    assert g.players[0].resources == get_resource_hand(wool=1)
+    assert g.players[1].resources == get_resource_hand(ore=2)
+    with pytest.raises(NotEnoughResourcesError):
+        g.transfer_resources(g.players[0], g.players[1], get_resource_hand(ore=1))
+    g.remove_resources(g.players[1], get_resource_hand(ore=1))
+    assert g.players[1].resources == get_resource_hand(ore=1)
+
+
+def test_game_delta_contains_only_changes():
+    g = Game(BeginnerBoard())
+    start = g.version
+    assert g.get_delta(start).is_empty
+    g.build_settlement(
+        g.players[1], Coords(1, 0), cost_resources=False, ensure_connected=False
+    )
+    g.add_resources(g.players[2], get_resource_hand(ore=1, grain=1, wool=1))
+    g.build_development_card(g.players[2])
+    middle = g.version
+    g.move_robber(Coords(3, -3))
+    delta = g.get_delta(start)
+    assert delta.since_version == start and delta.version == g.version
+    assert delta.intersections == {Coords(1, 0): (1, BuildingType.SETTLEMENT)}
+    assert delta.paths == {}
+    assert list(delta.players) == [2]
+    assert delta.players[2].resources == get_resource_hand()
+    assert delta.deck_size == len(g.development_card_deck)
+    assert delta.robber == Coords(3, -3)
+    assert delta.awards is None
+    delta = g.get_delta(middle)
+    assert (delta.intersections, delta.players, delta.deck_size) == ({}, {}, None)
+    assert GameDelta.from_bytes(delta.to_bytes()) == delta
+
+
+def test_game_apply_delta_keeps_copy_in_sync():
+    rng = random.Random(5)
+    m = TurnMachine(Game(RandomBoard(rng)), rng=rng)
+    spectator = Game.from_bytes(m.game.to_bytes())
+    for _ in range(40):
+        for _ in range(rng.randrange(1, 15)):
+            if not m.is_over:
+                m.step(rng.choice(m.legal_actions()))
+        data = m.game.get_delta(spectator.version).to_bytes()
+        spectator.apply_delta(GameDelta.from_bytes(data))
+        assert spectator.version == m.game.version
+        assert spectator.to_bytes() == m.game.to_bytes()
+    with pytest.raises(ValueError):
+        spectator.apply_delta(m.game.get_delta(spectator.version + 1))
+
+
+def test_game_from_bytes_keeps_version():
+    g = Game(BeginnerBoard())
+    g.build_settlement(
+        g.players[0], Coords(1, 0), cost_resources=False, ensure_connected=False
+    )
+    g.add_resources(g.players[0], get_resource_hand(ore=1))
+    restored = Game.from_bytes(g.to_bytes())
+    assert restored.version == g.version
+    # The history is unknown, so everything that could have changed is in the delta
+    delta = restored.get_delta(0)
+    assert delta.intersections == {Coords(1, 0): (0, BuildingType.SETTLEMENT)}
+    assert len(delta.players) == 4
+    assert restored.get_delta(g.version).is_empty
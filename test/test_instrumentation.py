@@ -0,0 +1,82 @@
+import pytest
+
+import pycatan
+from pycatan import Game, Player, Resource
+from pycatan.board import BeginnerBoard, Board, Coords
+from pycatan.errors import NotEnoughResourcesError
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    pycatan.disable_instrumentation()
+    pycatan.reset_stats()
+    yield
+    pycatan.disable_instrumentation()
+    pycatan.reset_stats()
+
+
+def test_instrumentation_is_disabled_by_default():
+    original = Board.get_yield_for_roll
+    BeginnerBoard().get_yield_for_roll(6)
+    assert not pycatan.is_instrumentation_enabled()
+    assert pycatan.stats() == {}
+    pycatan.enable_instrumentation()
+    assert Board.get_yield_for_roll is not original
+    pycatan.disable_instrumentation()
+    assert Board.get_yield_for_roll is original
+
+
+def test_instrumentation_counts_calls_and_time():
+    pycatan.enable_instrumentation()
+    board = BeginnerBoard()
+    for roll in range(2, 13):
+        board.get_yield_for_roll(roll)
+    stats = pycatan.stats()
+    assert stats["Board.get_yield_for_roll"]["calls"] == 11
+    assert stats["Board.get_yield_for_roll"]["time"] > 0
+    assert stats["Board.get_yield_for_roll"]["exceptions"] == 0
+    # Stats are a snapshot
+    board.get_yield_for_roll(2)
+    assert stats["Board.get_yield_for_roll"]["calls"] == 11
+    pycatan.reset_stats()
+    assert pycatan.stats() == {}
+
+
+def test_instrumentation_counts_exceptions():
+    pycatan.enable_instrumentation()
+    g = Game(BeginnerBoard())
+    with pytest.raises(NotEnoughResourcesError):
+        g.build_settlement(g.players[0], Coords(1, 0))
+    with pytest.raises(NotEnoughResourcesError):
+        g.players[0].remove_resources({Resource.ORE: 1})
+    stats = pycatan.stats()
+    assert stats["Game.build_settlement"] == {
+        "calls": 1,
+        "time": stats["Game.build_settlement"]["time"],
+        "exceptions": 1,
+    }
+    assert stats["Player.remove_resources"]["exceptions"] == 1
+    assert stats["Player.has_resources"]["exceptions"] == 0
+
+
+def test_instrumented_scopes_counters():
+    p = Player()
+    p.add_resources({Resource.ORE: 1})
+    with pycatan.instrumented() as outer:
+        p.add_resources({Resource.ORE: 1})
+        with pycatan.instrumented() as inner:
+            p.get_possible_trades()
+        assert pycatan.is_instrumentation_enabled()
+    assert not pycatan.is_instrumentation_enabled()
+    assert inner["Player.get_possible_trades"]["calls"] == 1
+    assert "Player.add_resources" not in inner
+    assert outer["Player.add_resources"]["calls"] == 1
+    assert outer["Player.get_possible_trades"]["calls"] == 1
+    assert pycatan.stats()["Player.add_resources"]["calls"] == 1
+
+
+def test_instrumented_keeps_instrumentation_enabled():
+    pycatan.enable_instrumentation()
+    with pycatan.instrumented():
+        pass
+    assert pycatan.is_instrumentation_enabled()
@@ -0,0 +1,82 @@
+import random
+import pytest
+
+from pycatan import Game, TurnMachine, TurnPhase, ActionType, DevelopmentCard
+from pycatan.agents import MCTSAgent
+from pycatan.board import BeginnerBoard, RandomBoard
+
+from .helpers import get_resource_hand
+
+
+def get_main_phase_machine():
+    rng = random.Random(3)
+    m = TurnMachine(Game(RandomBoard(rng)), rng=rng)
+    while m.phase is not TurnPhase.MAIN or len(m.legal_actions()) < 3:
+        m.step(rng.choice(m.legal_actions()))
+    return m
+
+
+def test_mcts_agent_needs_a_budget():
+    with pytest.raises(ValueError):
+        MCTSAgent(iterations=None, time_limit=None)
+
+
+def test_mcts_agent_chooses_legal_action_without_changing_machine():
+    m = get_main_phase_machine()
+    resources = [dict(p.resources) for p in m.game.players]
+    agent = MCTSAgent(iterations=50, max_rollout_steps=20, seed=0)
+    action = agent.choose_action(m)
+    assert m.is_legal(action)
+    assert agent.last_iterations == 50
+    assert agent.playouts_per_second > 0
+    assert [p.resources for p in m.game.players] == resources
+
+
+def test_mcts_agent_is_reproducible_with_seed():
+    m = get_main_phase_machine()
+    a = MCTSAgent(iterations=30, max_rollout_steps=20, seed=4).choose_action(m)
+    b = MCTSAgent(iterations=30, max_rollout_steps=20, seed=4).choose_action(m)
+    assert a == b
+
+
+def test_mcts_agent_skips_search_with_one_legal_action():
+    m = TurnMachine(Game(BeginnerBoard()))
+    while m.phase is not TurnPhase.ROLL:
+        m.step(m.legal_actions()[0])
+    agent = MCTSAgent(iterations=50)
+    assert agent.choose_action(m) == m.action_space.encode(ActionType.ROLL)
+    assert agent.last_iterations == 0
+
+
+def test_mcts_agent_takes_winning_action():
+    m = TurnMachine(
+        Game(BeginnerBoard()), victory_points_to_win=3, rng=random.Random(1)
+    )
+    while m.phase is not TurnPhase.ROLL:
+        m.step(m.legal_actions()[0])
+    m.step(m.action_space.encode(ActionType.ROLL))
+    assert m.phase is TurnPhase.MAIN
+    # Buying the only card in the deck wins the game
+    player = m.current_player
+    player.resources = get_resource_hand(wool=1, ore=1, grain=1)
+    m.game.development_card_deck = [DevelopmentCard.VICTORY_POINT]
+    m.invalidate()
+    agent = MCTSAgent(iterations=100, max_rollout_steps=10, determinize=False, seed=0)
+    assert agent.choose_action(m) == m.action_space.encode(
+        ActionType.BUILD_DEVELOPMENT_CARD
+    )
+
+
+def test_mcts_agent_time_limit():
+    m = get_main_phase_machine()
+    agent = MCTSAgent(iterations=None, time_limit=0.05, max_rollout_steps=10, seed=0)
+    assert m.is_legal(agent.choose_action(m))
+    assert agent.last_iterations > 0
+    assert agent.last_elapsed < 1
+
+
+def test_mcts_agent_root_parallelism():
+    m = get_main_phase_machine()
+    with MCTSAgent(iterations=20, max_rollout_steps=10, num_workers=2, seed=0) as agent:
+        assert m.is_legal(agent.choose_action(m))
+        assert agent.last_iterations == 20
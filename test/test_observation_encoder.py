@@ -0,0 +1,78 @@
+import random
+import pytest
+
+from pycatan import Game
+from pycatan.board import BeginnerBoard, BoardIndex, Coords, HexType
+from pycatan.env import CatanEnv, ObservationEncoder
+
+from .helpers import add_free_settlement, add_free_road, get_resource_hand
+
+
+def count_robbers(e):
+    return sum(e.observation[e.offsets["robber"] + i] for i in range(19))
+
+
+def test_observation_encoder_size():
+    g = Game(BeginnerBoard())
+    e = ObservationEncoder(g)
+    assert len(e.observation) == e.size
+    assert e.size == ObservationEncoder.get_size(BoardIndex(g.board), 4)
+    assert e.size == 19 * 6 + 19 + 54 * 6 + 19 + 4 * (54 + 54 + 72 + 5 + 5 + 3) + 1
+
+
+def test_observation_encoder_encodes_board():
+    g = Game(BeginnerBoard())
+    e = ObservationEncoder(g)
+    index = e.board_index
+    obs = e.observation
+    center = index.hex_indices[Coords(0, 0)]
+    assert obs[e.offsets["hex_types"] + center * 6 + HexType.DESERT.value] == 1
+    assert obs[e.offsets["hex_tokens"] + index.hex_indices[Coords(3, 0)]] == 2
+    assert obs[e.offsets["robber"] + center] == 1
+    assert count_robbers(e) == 1
+    assert obs[e.offsets["development_card_deck"]] == 25
+
+
+def test_observation_encoder_updates_pieces():
+    g = Game(BeginnerBoard())
+    e = ObservationEncoder(g)
+    index = e.board_index
+    add_free_settlement(g.board, g.players[1], Coords(1, 0))
+    add_free_road(g.board, g.players[1], {Coords(1, 0), Coords(0, 1)})
+    g.players[1].resources = get_resource_hand(ore=3)
+    g.move_robber(Coords(3, 0))
+    i = index.intersection_indices[Coords(1, 0)]
+    p = index.path_indices[frozenset({Coords(1, 0), Coords(0, 1)})]
+    e.update_intersection(i)
+    e.update_path(p)
+    e.update_robber()
+    e.update_players()
+    obs = e.observation
+    assert obs[e.offsets["settlements"] + 54 + i] == 1
+    assert obs[e.offsets["roads"] + 72 + p] == 1
+    assert obs[e.offsets["resources"] + 5 + 4] == 3
+    assert obs[e.offsets["robber"] + index.hex_indices[Coords(3, 0)]] == 1
+    assert count_robbers(e) == 1
+    assert obs == ObservationEncoder(g).observation
+
+
+def test_observation_encoder_writes_into_given_buffer():
+    g = Game(BeginnerBoard())
+    size = ObservationEncoder.get_size(BoardIndex(g.board), 4)
+    batch = bytearray(3 * size)
+    rows = [memoryview(batch)[slice(i * size, (i + 1) * size)] for i in range(3)]
+    e = ObservationEncoder(g, out=rows[1])
+    assert rows[0] == bytes(size)
+    assert rows[1] == e.observation
+    assert rows[2] == bytes(size)
+    with pytest.raises(ValueError):
+        ObservationEncoder(g, out=bytearray(size - 1))
+
+
+def test_env_observation_matches_full_encoding():
+    env = CatanEnv(seed=5)
+    rng = random.Random(5)
+    for _ in range(500):
+        if env.step(rng.choice(env.machine.legal_actions())):
+            break
+        assert env.observation == ObservationEncoder(env.game).observation
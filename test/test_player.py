@@ -1,7 +1,7 @@
 import pytest
 import random
 
-from pycatan import Player, Resource
+from pycatan import Player, PlayerEvent, Resource
 from pycatan.errors import NotEnoughResourcesError
 
 from .helpers import (
@@ -168,3 +168,22 @@ def test_player_get_random_resource():
     assert p.get_random_resource() == Resource.LUMBER
     p.remove_resources(get_resource_hand(lumber=4, brick=5))
     assert p.get_random_resource() is None
+
+
+def test_player_sends_resource_changes_to_listeners():
+    p = Player()
+    events = []
+    p.add_event_listener(events.append)
+    p.add_resources({Resource.GRAIN: 2, Resource.ORE: 1})
+    p.remove_resources({Resource.GRAIN: 1})
+    assert events == [
+        PlayerEvent(p, {Resource.GRAIN: 2, Resource.ORE: 1}),
+        PlayerEvent(p, {Resource.GRAIN: -1}),
+    ]
+    # Failed changes are not sent
+    with pytest.raises(NotEnoughResourcesError):
+        p.remove_resources({Resource.WOOL: 1})
+    assert p.copy()._listeners == ()
+    p.remove_event_listener(events.append)
+    p.add_resources({Resource.WOOL: 1})
+    assert len(events) == 2
@@ -1,3 +1,5 @@
+import random
+
 from pycatan.board import RandomBoard, HexType
 
 
@@ -20,3 +22,14 @@ def test_has_right_amount_numbered_tokens():
         assert nums.count(i) == 1
     for i in [3, 4, 5, 6, 8, 9, 10, 11]:
         assert nums.count(i) == 2
+
+
+def test_random_board_can_be_seeded():
+    def get_layout(b):
+        return {c: (h.hex_type, h.token_number) for c, h in b.hexes.items()}, {
+            c: h.resource for c, h in b.harbors.items()
+        }
+
+    assert get_layout(RandomBoard(random.Random(4))) == get_layout(
+        RandomBoard(random.Random(4))
+    )
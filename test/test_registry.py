@@ -0,0 +1,89 @@
+import random
+import pytest
+
+from pycatan import Game, TurnMachine
+from pycatan.board import BeginnerBoard
+from pycatan.server import GameRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def get_machine(seed: int, num_actions: int = 20) -> TurnMachine:
+    rng = random.Random(seed)
+    machine = TurnMachine(Game(BeginnerBoard()), rng=rng)
+    for _ in range(num_actions):
+        machine.step(rng.choice(machine.legal_actions()))
+    return machine
+
+
+def test_registry_evicts_least_recently_used_games(tmp_path):
+    registry = GameRegistry(str(tmp_path), max_games=2)
+    machines = {i: get_machine(i) for i in range(3)}
+    snapshots = {i: m.to_bytes() for i, m in machines.items()}
+    registry.add(0, machines[0])
+    registry.add(1, machines[1])
+    assert registry.get(0) is machines[0]
+    registry.add(2, machines[2])
+    # 1 was used least recently
+    assert not registry.is_in_memory(1)
+    assert (registry.num_in_memory, registry.num_on_disk, len(registry)) == (2, 1, 3)
+    assert (tmp_path / "1.pcm").read_bytes() == snapshots[1]
+    restored = registry.get(1)
+    assert restored.to_bytes() == snapshots[1]
+    assert not registry.is_in_memory(0)
+    assert not (tmp_path / "1.pcm").exists()
+    metrics = registry.metrics
+    assert (metrics.hits, metrics.evictions, metrics.rehydrations) == (1, 2, 1)
+    assert metrics.bytes_read == len(snapshots[1])
+    assert metrics.bytes_written == len(snapshots[1]) + len(snapshots[0])
+    assert registry.disk_bytes == len(snapshots[0])
+    assert set(registry) == {0, 1, 2}
+
+
+def test_registry_byte_budget():
+    registry = GameRegistry(max_bytes=250, size_of=lambda machine: 100)
+    for i in range(4):
+        registry.add(i, get_machine(i, 0))
+    assert [registry.is_in_memory(i) for i in range(4)] == [False, False, True, True]
+    assert registry.memory_bytes == 200
+    # A game larger than the budget is still kept while it is being used
+    registry.max_bytes = 50
+    assert registry.get(0).to_bytes() == get_machine(0, 0).to_bytes()
+    assert registry.num_in_memory == 1
+    registry.close()
+    assert len(registry) == 0
+
+
+def test_registry_evicts_idle_games():
+    clock = FakeClock()
+    registry = GameRegistry(clock=clock)
+    for i in range(3):
+        clock.time = i * 10
+        registry.add(i, get_machine(i, 0))
+    clock.time = 25
+    registry.get(0)
+    assert registry.evict_idle(12) == [1]
+    assert registry.evict_idle(0) == [2, 0]
+    assert registry.num_in_memory == 0
+    assert registry.metrics.as_dict()["evictions"] == 3
+    registry.close()
+
+
+def test_registry_remove():
+    registry = GameRegistry(max_games=1)
+    registry.add(0, get_machine(0, 0))
+    registry.add(1, get_machine(1, 0))
+    with pytest.raises(ValueError):
+        registry.add(1, get_machine(1, 0))
+    registry.remove(0)
+    registry.remove(1)
+    assert len(registry) == 0
+    with pytest.raises(KeyError):
+        registry.get(0)
+    registry.close()
@@ -0,0 +1,356 @@
+import asyncio
+import os
+import random
+import socket
+import tempfile
+import pytest
+
+from pycatan import DevelopmentCard, TurnPhase
+from pycatan.board import BeginnerBoard
+from pycatan.errors import ServerError
+from pycatan.server import (
+    Client,
+    GameRegistry,
+    GameServer,
+    LocalClient,
+    MessageType,
+    encode_message,
+    split_messages,
+)
+
+
+def get_server():
+    return GameServer(board_factory=lambda rng: BeginnerBoard())
+
+
+async def create_game(client, num_players: int = 4, seed=None) -> int:
+    # Create a game and take every seat
+    game_id = await client.create_game(num_players, seed)
+    for i in range(num_players):
+        await client.join(game_id, i)
+    return game_id
+
+
+def public_bytes(game) -> bytes:
+    # The game with only the number of development cards in each hand and the deck, to compare what clients can see
+    game = game.copy()
+    for player in game.players:
+        hand = {d: 0 for d in DevelopmentCard}
+        hand[DevelopmentCard.KNIGHT] = sum(player.development_cards.values())
+        player.development_cards = hand
+    game.development_card_deck = [DevelopmentCard.KNIGHT] * len(
+        game.development_card_deck
+    )
+    return game.to_bytes()
+
+
+async def play(client, game_id: int, num_actions: int, rng: random.Random):
+    for _ in range(num_actions):
+        actions = await client.get_legal_actions(game_id)
+        status = await client.step(game_id, rng.choice(actions))
+        if status.winner is not None:
+            break
+    return status
+
+
+def test_split_messages():
+    data = encode_message(MessageType.OK) + encode_message(MessageType.ERROR, b"abc")
+    messages, rest = split_messages(data + data[3:5])
+    assert messages == [(MessageType.OK, b""), (MessageType.ERROR, b"abc")]
+    assert rest == data[3:5]
+    with pytest.raises(ValueError):
+        encode_message(MessageType.STATE, bytes(0x10000))
+
+
+def test_local_client_plays_game():
+    async def main():
+        server = get_server()
+        client = LocalClient(server)
+        game_id = await create_game(client, 3, seed=1)
+        assert server.game_ids == [game_id]
+        game, status = await client.get_state(game_id)
+        assert len(game.players) == 3
+        assert status.phase is TurnPhase.SETUP_SETTLEMENT
+        assert (status.turn_number, status.winner, status.last_roll) == (0, None, None)
+        status = await play(client, game_id, 40, random.Random(0))
+        machine = server.get_machine(game_id)
+        assert status.turn_number == machine.turn_number
+        assert status.acting_player == machine.acting_player_index
+        assert status.phase is machine.phase
+        game, _ = await client.get_state(game_id)
+        assert public_bytes(game) == public_bytes(machine.game)
+        await client.close_game(game_id)
+        assert server.game_ids == []
+
+    asyncio.run(main())
+
+
+def test_watchers_receive_updates():
+    async def main():
+        server = get_server()
+        player = LocalClient(server)
+        watcher = LocalClient(server)
+        game_id = await create_game(player, seed=2)
+        game, _ = await watcher.watch(game_id)
+        status = await play(player, game_id, 30, random.Random(1))
+        # Applying every update keeps the watcher's game the same as the server's
+        while True:
+            update = await watcher.next_update()
+            game.apply_delta(update.delta)
+            if update.status == status:
+                break
+        assert public_bytes(game) == public_bytes(server.get_machine(game_id).game)
+        await watcher.unwatch(game_id)
+        await player.step(game_id, (await player.get_legal_actions(game_id))[0])
+        assert watcher._get_updates().empty()
+
+    asyncio.run(main())
+
+
+def test_client_gets_deltas():
+    async def main():
+        server = get_server()
+        client = LocalClient(server)
+        game_id = await create_game(client, seed=8)
+        game, status = await client.get_state(game_id)
+        assert status.version == game.version
+        for i in range(10):
+            await play(client, game_id, 5, random.Random(i))
+            delta, status = await client.get_delta(game_id, game.version)
+            game.apply_delta(delta)
+            assert game.version == status.version
+        assert public_bytes(game) == public_bytes(server.get_machine(game_id).game)
+
+    asyncio.run(main())
+
+
+def test_server_rejects_invalid_requests():
+    async def main():
+        server = get_server()
+        client = LocalClient(server)
+        with pytest.raises(ServerError):
+            await client.get_state(5)
+        game_id = await create_game(client, seed=3)
+        legal = await client.get_legal_actions(game_id)
+        illegal = next(a for a in range(1000) if a not in legal)
+        with pytest.raises(ServerError):
+            await client.step(game_id, illegal)
+        with pytest.raises(ServerError):
+            await client.create_game(0)
+        with pytest.raises(ServerError):
+            await client._request(MessageType.STEP, b"\x01")
+        with pytest.raises(ServerError):
+            await client._request(MessageType.OK)
+        # The client can still be used after an error
+        assert await client.get_legal_actions(game_id) == legal
+
+    asyncio.run(main())
+
+
+def test_clients_only_act_for_their_seats():
+    async def main():
+        server = get_server()
+        first = LocalClient(server)
+        second = LocalClient(server)
+        watcher = LocalClient(server)
+        game_id = await first.create_game(3, seed=9)
+        await first.join(game_id, 0)
+        await watcher.watch(game_id)
+        with pytest.raises(ServerError):
+            await second.join(game_id, 0)
+        with pytest.raises(ServerError):
+            await second.join(game_id, 3)
+        with pytest.raises(ServerError):
+            await watcher.join(game_id, 2)
+        await second.join(game_id, 1)
+        # Player 0 acts first
+        with pytest.raises(ServerError):
+            await second.get_legal_actions(game_id)
+        with pytest.raises(ServerError):
+            await second.step(game_id, 0)
+        await first.step(game_id, (await first.get_legal_actions(game_id))[0])
+        # Closing a client frees its seats
+        await first.close()
+        await second.join(game_id, 0)
+
+    asyncio.run(main())
+
+
+def test_clients_only_see_their_own_cards():
+    async def main():
+        server = get_server()
+        player = LocalClient(server)
+        spectator = LocalClient(server)
+        game_id = await player.create_game(2, seed=10)
+        await player.join(game_id, 0)
+        game = server.get_machine(game_id).game
+        game.players[0].development_cards[DevelopmentCard.MONOPOLY] = 1
+        game.players[1].development_cards[DevelopmentCard.VICTORY_POINT] = 2
+        hidden_hands = []
+        decks = []
+        for client in [player, spectator] * 10:
+            view, _ = await client.get_state(game_id)
+            assert public_bytes(view) == public_bytes(game)
+            if client is player:
+                assert (
+                    view.players[0].development_cards
+                    == game.players[0].development_cards
+                )
+            hidden_hands.append(view.players[1].development_cards)
+            decks.append(view.development_card_deck)
+        # The hidden cards and the order of the deck are guesses
+        assert any(h != game.players[1].development_cards for h in hidden_hands)
+        assert any(d != game.development_card_deck for d in decks)
+
+    asyncio.run(main())
+
+
+def test_same_seed_gives_same_game():
+    async def main():
+        server = get_server()
+        client = LocalClient(server)
+        first = await create_game(client, seed=4)
+        second = await create_game(client, seed=4)
+        await play(client, first, 50, random.Random(2))
+        await play(client, second, 50, random.Random(2))
+        games = [public_bytes((await client.get_state(i))[0]) for i in (first, second)]
+        assert games[0] == games[1]
+
+    asyncio.run(main())
+
+
+def test_server_rehydrates_evicted_games():
+    async def main():
+        server = GameServer(
+            board_factory=lambda rng: BeginnerBoard(),
+            registry=GameRegistry(max_games=1),
+        )
+        client = LocalClient(server)
+        watcher = LocalClient(server)
+        game_ids = [
+            await create_game(client, seed=7),
+            await create_game(client, seed=7),
+        ]
+        # Alternate between the games, so each one is read back from disk before every action
+        for i in range(20):
+            for game_id in game_ids:
+                await play(client, game_id, 1, random.Random(i))
+        assert server.registry.metrics.rehydrations >= 40
+        # Watched games stay in memory
+        game, _ = await watcher.watch(game_ids[0])
+        assert server.registry.is_pinned(game_ids[0])
+        for i in range(20, 30):
+            for game_id in game_ids:
+                await play(client, game_id, 1, random.Random(i))
+        assert server.registry.is_in_memory(game_ids[0])
+        final_version = server.get_machine(game_ids[0]).game.version
+        while game.version != final_version:
+            game.apply_delta((await watcher.next_update()).delta)
+        games = [public_bytes((await client.get_state(i))[0]) for i in game_ids]
+        assert games[0] == games[1] == public_bytes(game)
+        await watcher.unwatch(game_ids[0])
+        assert not server.registry.is_pinned(game_ids[0])
+        server.registry.close()
+
+    asyncio.run(main())
+
+
+def test_tcp_clients_play_concurrently():
+    async def main():
+        server = get_server()
+        tcp_server = await server.start_tcp()
+        port = tcp_server.sockets[0].getsockname()[1]
+        clients = [await Client.connect_tcp("127.0.0.1", port) for _ in range(3)]
+        game_ids = [await create_game(c, seed=i) for i, c in enumerate(clients)]
+        watcher = await Client.connect_tcp("127.0.0.1", port)
+        game, _ = await watcher.watch(game_ids[0])
+        statuses = await asyncio.gather(
+            *(play(c, i, 30, random.Random(i)) for c, i in zip(clients, game_ids))
+        )
+        for status, game_id in zip(statuses, game_ids):
+            assert status.game_id == game_id
+            assert status.turn_number == server.get_machine(game_id).turn_number
+        while True:
+            update = await watcher.next_update()
+            game.apply_delta(update.delta)
+            if update.status == statuses[0]:
+                break
+        assert public_bytes(game) == public_bytes(server.get_machine(game_ids[0]).game)
+        for c in clients + [watcher]:
+            await c.close()
+        await server.close()
+
+    asyncio.run(main())
+
+
+def test_server_handles_disconnects():
+    async def main():
+        server = get_server()
+        tcp_server = await server.start_tcp()
+        port = tcp_server.sockets[0].getsockname()[1]
+        client = await Client.connect_tcp("127.0.0.1", port)
+        game_id = await create_game(client, seed=5)
+        await client.watch(game_id)
+        await client.close()
+        # Wait for the server to notice
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not server._tables[game_id].watchers:
+                break
+        assert not server._tables[game_id].watchers
+        await server.close()
+        with pytest.raises(ConnectionError):
+            await client.get_state(game_id)
+
+    asyncio.run(main())
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not supported"
+)
+def test_unix_client():
+    async def main(path):
+        server = get_server()
+        await server.start_unix(path)
+        async with await Client.connect_unix(path) as client:
+            game_id = await create_game(client, 2, seed=6)
+            status = await play(client, game_id, 10, random.Random(3))
+            assert status.turn_number == server.get_machine(game_id).turn_number
+        await server.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(main(os.path.join(directory, "catan.sock")))
+
+
+def test_clients_only_close_games_they_sit_at():
+    async def main():
+        server = get_server()
+        owner = LocalClient(server)
+        other = LocalClient(server)
+        watcher = LocalClient(server)
+        game_id = await create_game(owner, seed=4)
+        _, status = await watcher.watch(game_id)
+        with pytest.raises(ServerError):
+            await other.close_game(game_id)
+        assert server.game_ids == [game_id]
+        await owner.close_game(game_id)
+        assert server.game_ids == []
+        # The watcher is told the game closed, and the client that closed it is only answered
+        update = await asyncio.wait_for(watcher.next_update(), 1)
+        assert update.delta is None
+        assert update.status == status
+        assert owner._get_updates().empty()
+
+        game_id = await other.create_game(seed=5)
+        await other.join(game_id, 0)
+        await owner.join(game_id, 1)
+        with pytest.raises(ServerError):
+            await other.close_game(game_id)
+        server.close_game(game_id)
+        for client in (owner, other):
+            update = await asyncio.wait_for(client.next_update(), 1)
+            assert (update.status.game_id, update.delta) == (game_id, None)
+        with pytest.raises(ServerError):
+            await owner.step(game_id, 0)
+
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+import asyncio
+
+from pycatan import Game, GameDelta, Resource
+from pycatan.board import BeginnerBoard, Coords
+from pycatan.server import SpectatorFeed
+
+
+def test_slow_spectators_get_one_combined_update():
+    async def main():
+        game = Game(BeginnerBoard())
+        copy = game.copy()
+        feed = SpectatorFeed(game)
+        spectator = feed.subscribe()
+        # Change the game many times without letting the spectator read
+        for i in range(10):
+            game.add_resources(game.players[i % 4], {Resource.GRAIN: 1})
+        game.build_settlement(
+            game.players[0], Coords(1, 0), cost_resources=False, ensure_connected=False
+        )
+        update = await spectator.next()
+        delta = GameDelta.from_bytes(update)
+        assert delta.since_version == 0
+        copy.apply_delta(delta)
+        assert copy.to_bytes() == game.to_bytes()
+        assert spectator.version == game.version
+        assert feed.num_encoded == 1
+
+    asyncio.run(main())
+
+
+def test_spectators_at_the_same_version_share_updates():
+    async def main():
+        game = Game(BeginnerBoard())
+        feed = SpectatorFeed(game)
+        spectators = [feed.subscribe() for _ in range(20)]
+        assert feed.num_spectators == 20
+        game.add_resources(game.players[0], {Resource.ORE: 2})
+        updates = await asyncio.gather(*(s.next() for s in spectators))
+        assert len(set(updates)) == 1
+        assert feed.num_encoded == 1
+        feed.unsubscribe(spectators[0])
+        assert feed.num_spectators == 19
+
+    asyncio.run(main())
+
+
+def test_notify_wakes_spectators_without_game_changes():
+    async def main():
+        game = Game(BeginnerBoard())
+        feed = SpectatorFeed(game)
+        spectator = feed.subscribe()
+        feed.notify()
+        delta = GameDelta.from_bytes(await spectator.next())
+        assert delta.is_empty
+        assert feed.num_encoded == 1
+
+    asyncio.run(main())
+
+
+def test_closing_the_feed_ends_the_updates():
+    async def main():
+        game = Game(BeginnerBoard())
+        feed = SpectatorFeed(game)
+        spectator = feed.subscribe()
+        received = []
+
+        async def read():
+            async for update in spectator:
+                received.append(update)
+
+        task = asyncio.get_running_loop().create_task(read())
+        game.add_resources(game.players[1], {Resource.WOOL: 1})
+        await asyncio.sleep(0)
+        feed.close()
+        await asyncio.wait_for(task, 1)
+        assert len(received) == 1
+        assert feed.is_closed
+        assert feed.num_spectators == 0
+        # The feed no longer listens to the game
+        game.add_resources(game.players[1], {Resource.WOOL: 1})
+        assert await spectator.next() is None
+
+    asyncio.run(main())
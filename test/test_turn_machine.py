@@ -0,0 +1,356 @@
+import random
+import pytest
+
+from pycatan import (
+    Game,
+    TurnMachine,
+    TurnPhase,
+    ActionType,
+    Resource,
+    DevelopmentCard,
+)
+from pycatan.board import BeginnerBoard, RandomBoard, Coords, BuildingType
+
+from .helpers import get_resource_hand
+
+
+class FixedDiceRandom(random.Random):
+    """A random generator whose dice always roll the numbers given"""
+
+    def __init__(self, rolls):
+        super().__init__(0)
+        self.rolls = list(rolls)
+
+    def randint(self, a, b):
+        return self.rolls.pop(0)
+
+
+def play_setup(machine):
+    while machine.phase in [TurnPhase.SETUP_SETTLEMENT, TurnPhase.SETUP_ROAD]:
+        machine.step(machine.legal_actions()[0])
+
+
+def get_types(machine):
+    return {machine.action_space.decode(a)[0] for a in machine.legal_actions()}
+
+
+def test_turn_machine_starts_in_setup():
+    m = TurnMachine(Game(BeginnerBoard()))
+    assert m.phase is TurnPhase.SETUP_SETTLEMENT
+    assert m.turn_number == 0
+    assert len(m.legal_actions()) == 54
+    assert get_types(m) == {ActionType.BUILD_SETTLEMENT}
+
+
+def test_turn_machine_setup_is_snake_ordered():
+    m = TurnMachine(Game(BeginnerBoard()))
+    order = []
+    while m.phase is not TurnPhase.ROLL:
+        if m.phase is TurnPhase.SETUP_SETTLEMENT:
+            order.append(m.current_player_index)
+        m.step(m.legal_actions()[0])
+    assert order == [0, 1, 2, 3, 3, 2, 1, 0]
+    assert m.turn_number == 1
+    assert m.current_player_index == 0
+
+
+def test_turn_machine_setup_road_must_touch_settlement():
+    m = TurnMachine(Game(BeginnerBoard()))
+    settlement = m.action_space.encode(
+        ActionType.BUILD_SETTLEMENT, m.board_index.intersection_indices[Coords(1, 0)]
+    )
+    m.step(settlement)
+    assert m.phase is TurnPhase.SETUP_ROAD
+    roads = [
+        m.board_index.path_coords[m.action_space.decode(a)[1]]
+        for a in m.legal_actions()
+    ]
+    assert len(roads) == 3
+    assert all(Coords(1, 0) in r for r in roads)
+
+
+def test_turn_machine_second_settlement_gives_resources():
+    g = Game(BeginnerBoard(), 2)
+    m = TurnMachine(g)
+    play_setup(m)
+    for p in g.players:
+        assert sum(p.resources.values()) > 0
+
+
+def test_turn_machine_rejects_illegal_actions():
+    m = TurnMachine(Game(BeginnerBoard()))
+    with pytest.raises(ValueError):
+        m.step(m.action_space.encode(ActionType.ROLL))
+    assert m.phase is TurnPhase.SETUP_SETTLEMENT
+
+
+def test_turn_machine_roll_gives_yield():
+    g = Game(BeginnerBoard())
+    m = TurnMachine(g, rng=FixedDiceRandom([3, 3]))
+    play_setup(m)
+    before = [dict(p.resources) for p in g.players]
+    m.step(m.action_space.encode(ActionType.ROLL))
+    assert m.last_roll == 6
+    assert m.phase is TurnPhase.MAIN
+    yields = g.board.get_yield_for_roll(6)
+    for p, b in zip(g.players, before):
+        expected = yields[p].total_yield if p in yields else {}
+        assert all(p.resources[r] == b[r] + expected.get(r, 0) for r in Resource)
+
+
+def test_turn_machine_seven_makes_players_discard():
+    g = Game(BeginnerBoard())
+    m = TurnMachine(g, rng=FixedDiceRandom([3, 4]))
+    play_setup(m)
+    for p in g.players:
+        p.resources = get_resource_hand()
+    g.players[2].resources = get_resource_hand(wool=9)
+    m.step(m.action_space.encode(ActionType.ROLL))
+    assert m.phase is TurnPhase.DISCARD
+    assert m.acting_player_index == 2
+    assert m.legal_actions() == (
+        m.action_space.encode(ActionType.DISCARD, Resource.WOOL.value),
+    )
+    for _ in range(4):
+        m.step(m.action_space.encode(ActionType.DISCARD, Resource.WOOL.value))
+    assert g.players[2].resources[Resource.WOOL] == 5
+    assert m.phase is TurnPhase.MOVE_ROBBER
+    assert m.acting_player_index == 0
+    assert len(m.legal_actions()) == 18
+
+
+def test_turn_machine_moving_robber_steals():
+    g = Game(BeginnerBoard())
+    m = TurnMachine(g, rng=FixedDiceRandom([3, 4]))
+    play_setup(m)
+    for p in g.players:
+        p.resources = get_resource_hand()
+    m.step(m.action_space.encode(ActionType.ROLL))
+    # Find a hex with one other player on it
+    victim = g.players[1]
+    victim.resources = get_resource_hand(ore=1)
+    hex_coords = [
+        h for h in g.board.hexes if g.board.get_players_on_hex(h) == {victim}
+    ][0]
+    m.step(
+        m.action_space.encode(
+            ActionType.MOVE_ROBBER, m.board_index.hex_indices[hex_coords]
+        )
+    )
+    assert g.board.robber == hex_coords
+    assert victim.resources[Resource.ORE] == 0
+    assert g.players[0].resources[Resource.ORE] == 1
+    assert m.phase is TurnPhase.MAIN
+
+
+def test_turn_machine_main_actions():
+    g = Game(BeginnerBoard())
+    m = TurnMachine(g, rng=FixedDiceRandom([1, 1]))
+    play_setup(m)
+    m.step(m.action_space.encode(ActionType.ROLL))
+    g.players[0].resources = get_resource_hand()
+    m.invalidate()
+    assert get_types(m) == {ActionType.END_TURN}
+    g.players[0].resources = get_resource_hand(
+        lumber=1, brick=1, wool=4, ore=1, grain=1
+    )
+    m.invalidate()
+    assert get_types(m) == {
+        ActionType.END_TURN,
+        ActionType.BUILD_ROAD,
+        ActionType.BUILD_DEVELOPMENT_CARD,
+        ActionType.TRADE,
+    }
+    m.step(m.action_space.encode_trade(Resource.WOOL, Resource.GRAIN))
+    assert g.players[0].resources[Resource.WOOL] == 0
+    assert g.players[0].resources[Resource.GRAIN] == 2
+
+
+def test_turn_machine_cannot_play_card_bought_this_turn():
+    g = Game(BeginnerBoard())
+    g.development_card_deck = [DevelopmentCard.KNIGHT] * 2
+    m = TurnMachine(g, rng=FixedDiceRandom([1, 1, 1, 1, 1, 1, 1, 1, 1, 1]))
+    play_setup(m)
+    m.step(m.action_space.encode(ActionType.ROLL))
+    g.players[0].add_resources(DevelopmentCard.get_required_resources())
+    m.invalidate()
+    m.step(m.action_space.encode(ActionType.BUILD_DEVELOPMENT_CARD))
+    assert ActionType.PLAY_KNIGHT not in get_types(m)
+    for _ in range(4):
+        m.step(m.action_space.encode(ActionType.END_TURN))
+        if m.current_player_index != 0:
+            m.step(m.action_space.encode(ActionType.ROLL))
+    assert m.phase is TurnPhase.ROLL
+    assert ActionType.PLAY_KNIGHT in get_types(m)
+    m.step(m.action_space.encode(ActionType.PLAY_KNIGHT))
+    assert m.phase is TurnPhase.MOVE_ROBBER
+    assert g.players[0].number_played_knights == 1
+
+
+def test_turn_machine_year_of_plenty_and_monopoly():
+    g = Game(BeginnerBoard())
+    m = TurnMachine(g, rng=FixedDiceRandom([1, 1]))
+    play_setup(m)
+    m.step(m.action_space.encode(ActionType.ROLL))
+    for p in g.players:
+        p.resources = get_resource_hand(ore=2)
+    g.players[0].development_cards[DevelopmentCard.YEAR_OF_PLENTY] = 1
+    g.players[0].development_cards[DevelopmentCard.MONOPOLY] = 1
+    m.invalidate()
+    m.step(m.action_space.encode(ActionType.PLAY_YEAR_OF_PLENTY))
+    assert m.phase is TurnPhase.YEAR_OF_PLENTY
+    m.step(m.action_space.encode(ActionType.CHOOSE_RESOURCE, Resource.ORE.value))
+    m.step(m.action_space.encode(ActionType.CHOOSE_RESOURCE, Resource.GRAIN.value))
+    assert g.players[0].resources == get_resource_hand(ore=3, grain=1)
+    assert m.phase is TurnPhase.MAIN
+    # Only one development card can be played per turn
+    assert ActionType.PLAY_MONOPOLY not in get_types(m)
+
+
+def test_turn_machine_road_building():
+    g = Game(BeginnerBoard())
+    m = TurnMachine(g, rng=FixedDiceRandom([1, 1]))
+    play_setup(m)
+    m.step(m.action_space.encode(ActionType.ROLL))
+    g.players[0].development_cards[DevelopmentCard.ROAD_BUILDING] = 1
+    m.invalidate()
+    m.step(m.action_space.encode(ActionType.PLAY_ROAD_BUILDING))
+    assert m.phase is TurnPhase.ROAD_BUILDING
+    m.step(m.legal_actions()[0])
+    m.step(m.legal_actions()[0])
+    assert m.phase is TurnPhase.MAIN
+    roads = [
+        p
+        for p in g.board.paths.values()
+        if p.building is not None and p.building.owner is g.players[0]
+    ]
+    assert len(roads) == 4
+
+
+def test_turn_machine_plays_random_game_to_the_end():
+    rng = random.Random(0)
+    g = Game(RandomBoard())
+    m = TurnMachine(g, rng=rng)
+    while not m.is_over:
+        m.step(rng.choice(m.legal_actions()))
+    assert m.legal_actions() == ()
+    assert m.winner is not None
+    for i, p in enumerate(g.players):
+        assert m.get_victory_points(i) == g.get_victory_points(p)
+    assert g.get_victory_points(m.winner) >= 10
+    for i, p in enumerate(g.players):
+        buildings = [
+            c.building
+            for c in g.board.intersections.values()
+            if c.building is not None and c.building.owner is p
+        ]
+        assert (
+            len([b for b in buildings if b.building_type is BuildingType.SETTLEMENT])
+            <= 5
+        )
+        assert len([b for b in buildings if b.building_type is BuildingType.CITY]) <= 4
+
+
+def test_turn_machine_max_turns():
+    rng = random.Random(0)
+    m = TurnMachine(Game(BeginnerBoard()), max_turns=3, rng=rng)
+    play_setup(m)
+    while not m.is_over:
+        m.step(
+            m.legal_actions()[0]
+            if m.phase is not TurnPhase.MAIN
+            else m.action_space.encode(ActionType.END_TURN)
+        )
+    assert m.turn_number == 4
+    assert m.winner is None
+
+
+def test_turn_machine_legal_action_mask():
+    m = TurnMachine(Game(BeginnerBoard()))
+    mask = m.get_legal_action_mask()
+    assert len(mask) == m.action_space.size
+    assert [i for i, legal in enumerate(mask) if legal] == list(m.legal_actions())
+    m.step(m.legal_actions()[0])
+    m.get_legal_action_mask(mask)
+    assert [i for i, legal in enumerate(mask) if legal] == list(m.legal_actions())
+    with pytest.raises(ValueError):
+        m.get_legal_action_mask(bytearray(1))
+
+
+def test_turn_machine_copy_plays_the_same_game():
+    rng = random.Random(1)
+    m = TurnMachine(Game(RandomBoard(rng)), rng=rng)
+    for _ in range(100):
+        m.step(rng.choice(m.legal_actions()))
+    copy = m.copy()
+    before = [dict(p.resources) for p in m.game.players]
+    actions = random.Random(2)
+    for _ in range(100):
+        if copy.is_over:
+            break
+        copy.step(actions.choice(copy.legal_actions()))
+    assert [p.resources for p in m.game.players] == before
+    # With the same random generator state, the original takes the same path as its copy
+    actions = random.Random(2)
+    for _ in range(100):
+        if m.is_over:
+            break
+        m.step(actions.choice(m.legal_actions()))
+    assert m.phase is copy.phase
+    assert m.turn_number == copy.turn_number
+    assert [p.resources for p in m.game.players] == [
+        p.resources for p in copy.game.players
+    ]
+
+
+def test_turn_machine_determinize_keeps_hand_sizes():
+    g = Game(BeginnerBoard())
+    m = TurnMachine(g, rng=random.Random(0))
+    play_setup(m)
+    g.players[0].development_cards[DevelopmentCard.MONOPOLY] = 1
+    g.players[1].development_cards[DevelopmentCard.KNIGHT] = 2
+    g.development_card_deck = [DevelopmentCard.VICTORY_POINT] * 3
+    copy = m.copy()
+    copy.determinize(0, random.Random(0))
+    players = copy.game.players
+    assert players[0].development_cards == g.players[0].development_cards
+    assert sum(players[1].development_cards.values()) == 2
+    assert sum(players[2].development_cards.values()) == 0
+    assert len(copy.game.development_card_deck) == 3
+    cards = copy.game.development_card_deck + [
+        c for c, n in players[1].development_cards.items() for _ in range(n)
+    ]
+    assert sorted(c.value for c in cards) == sorted(
+        [DevelopmentCard.KNIGHT.value] * 2 + [DevelopmentCard.VICTORY_POINT.value] * 3
+    )
+
+
+def test_turn_machine_to_bytes_plays_the_same_game():
+    rng = random.Random(3)
+    for num_actions in [0, 7, 60, 250]:
+        m = TurnMachine(Game(RandomBoard(rng)), max_turns=200, rng=random.Random(4))
+        for _ in range(num_actions):
+            if m.is_over:
+                break
+            m.step(rng.choice(m.legal_actions()))
+        data = m.to_bytes()
+        restored = TurnMachine.from_bytes(data)
+        assert restored.to_bytes() == data
+        assert restored.max_turns == 200
+        assert restored.legal_actions() == m.legal_actions()
+        # The restored machine rolls the same dice
+        for _ in range(100):
+            if m.is_over:
+                break
+            action = rng.choice(m.legal_actions())
+            m.step(action)
+            restored.step(action)
+        assert restored.to_bytes() == m.to_bytes()
+        assert restored.phase is m.phase
+
+
+def test_turn_machine_from_bytes_rejects_invalid_data():
+    data = TurnMachine(Game(BeginnerBoard()), rng=random.Random(0)).to_bytes()
+    for invalid in [b"", data[:-1], data[:50], b"PCG" + data[3:], data + b"\x00"]:
+        with pytest.raises(ValueError):
+            TurnMachine.from_bytes(invalid)
@@ -0,0 +1,77 @@
+import multiprocessing
+import random
+import os
+import pytest
+
+from pycatan.board import RandomBoard
+from pycatan.env import CatanEnv, VectorEnv
+
+
+def get_legal(mask):
+    return [i for i, legal in enumerate(mask) if legal]
+
+
+class FailInWorkers:
+    # Creates boards in the test's process, but not in the workers
+    def __init__(self):
+        self.pid = os.getpid()
+
+    def __call__(self, rng):
+        if os.getpid() != self.pid:
+            raise RuntimeError("Cannot create a board")
+        return RandomBoard(rng)
+
+
+def test_vector_env_matches_single_envs():
+    rng = random.Random(0)
+    with VectorEnv(num_envs=3, num_workers=2, seed=10) as vec:
+        envs = [CatanEnv(seed=10 + i) for i in range(3)]
+        for _ in range(100):
+            actions = []
+            for i, env in enumerate(envs):
+                assert vec.get_observation(i) == env.observation
+                assert vec.get_action_mask(i) == env.action_mask
+                assert vec.acting_players[i] == env.acting_player_index
+                actions.append(rng.choice(get_legal(env.action_mask)))
+            vec.step(actions)
+            for env, a in zip(envs, actions):
+                env.step(a)
+        assert list(vec.dones) == [0, 0, 0]
+
+
+def test_vector_env_resets_finished_games():
+    rng = random.Random(1)
+    with VectorEnv(num_envs=2, num_workers=1, seed=3, max_turns=2) as vec:
+        finished = False
+        while not finished:
+            vec.step(
+                [rng.choice(get_legal(vec.get_action_mask(i))) for i in range(2)]
+            )
+            finished = any(vec.dones)
+        # The new game has started
+        i = list(vec.dones).index(1)
+        assert len(get_legal(vec.get_action_mask(i))) == 54
+        vec.reset([5, 6])
+        assert list(vec.dones) == [0, 0]
+        assert vec.get_observation(0) == CatanEnv(seed=5).observation
+
+
+def test_vector_env_reports_illegal_actions():
+    with VectorEnv(num_envs=2, num_workers=2) as vec:
+        with pytest.raises(ValueError):
+            vec.step([0, 0])
+        with pytest.raises(ValueError):
+            vec.step([0])
+        # No environment takes a step when one of the actions is not legal
+        observations = bytes(vec.observations)
+        legal = get_legal(vec.get_action_mask(0))[0]
+        illegal = vec.get_action_mask(1).tolist().index(0)
+        with pytest.raises(ValueError):
+            vec.step([legal, illegal])
+        assert bytes(vec.observations) == observations
+
+
+def test_vector_env_stops_workers_when_they_cannot_start():
+    with pytest.raises(RuntimeError):
+        VectorEnv(num_envs=2, num_workers=2, board_factory=FailInWorkers())
+    assert multiprocessing.active_children() == []